@@ -6,7 +6,6 @@ Github: https://github.com/BeProduct
 Description: Automation API class
 """
 
-import json
 from typing import Dict
 import os
 import requests
@@ -15,6 +14,7 @@ import logging
 
 
 from ._exception import BeProductException
+from ._rate_limit import parse_retry_after
 from .sdk import BeProduct
 
 
@@ -23,6 +23,9 @@ class Automation:
 
     def __init__(self, client: BeProduct):
         self.client = client
+        # pooled session and retry policy are shared with the public api handler
+        self.session = client.raw_api.session
+        self.retry_policy = client.raw_api.retry_policy
 
     def __get_headers(self):
         return {
@@ -30,6 +33,41 @@ class Automation:
             "Content-type": "application/json",
         }
 
+    def __send(self, method: str, url: str, **kwargs):
+        """Sends request through the client's rate limiter
+        and retries it according to the retry policy
+        """
+        base_url = self.client.automation_api_url
+        retry = self.retry_policy.start(method, url)
+
+        while True:
+            self.client.rate_limiter.acquire(base_url)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = retry.next_delay(error=e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            retry_after = response.headers.get("Retry-After")
+            self.client.rate_limiter.feedback(
+                base_url, response.status_code, retry_after
+            )
+
+            delay = retry.next_delay(
+                status=response.status_code, retry_after=parse_retry_after(retry_after)
+            )
+            if delay is None:
+                return response
+
+            if response.status_code == 429:
+                # the whole client backs off, not only this call
+                self.client.rate_limiter.pause(base_url, delay)
+            else:
+                time.sleep(delay)
+
     def get(self, url):
         """GET Request to BeProduct Automation API
 
@@ -38,7 +76,7 @@ class Automation:
 
         """
         full_url = f"{self.client.automation_api_url}/{url.lstrip('/')}"
-        response = requests.get(url=full_url, headers=self.__get_headers())
+        response = self.__send("GET", full_url, headers=self.__get_headers())
 
         if response.status_code != 200:
             raise BeProductException(
@@ -48,7 +86,7 @@ class Automation:
                 + f"Response body: {response.text} \n"
             )
 
-        return response.json()
+        return self.client.json_loads(response.content)
 
     def delete(self, url):
         """DELETE Request to BeProduct Automation API
@@ -58,7 +96,7 @@ class Automation:
 
         """
         full_url = f"{self.client.automation_api_url}/{url.lstrip('/')}"
-        response = requests.delete(url=full_url, headers=self.__get_headers())
+        response = self.__send("DELETE", full_url, headers=self.__get_headers())
 
         if response.status_code != 200:
             raise BeProductException(
@@ -68,7 +106,7 @@ class Automation:
                 + f"Response body: {response.text} \n"
             )
 
-        return response.json()
+        return self.client.json_loads(response.content)
 
     def post(self, url, body):
         """POST Request to BeProduct Automation API
@@ -81,18 +119,23 @@ class Automation:
 
         full_url = f"{self.client.automation_api_url}/{url.lstrip('/')}"
 
-        response = requests.post(url=full_url, json=body, headers=self.__get_headers())
+        response = self.__send(
+            "POST",
+            full_url,
+            data=self.client.json_dumps(body),
+            headers=self.__get_headers(),
+        )
 
         if response.status_code != 200:
             raise BeProductException(
                 "Automation API POST call failed. Details:\n"
                 + f"URL: {full_url} \n"
-                + f"Body: {json.dumps(body)} \n"
+                + f"Body: {self.client.json_codec.dumps_str(body)} \n"
                 + f"Status code: {response.status_code} \n"
                 + f"Response body: {response.text} \n"
             )
 
-        return response.json()
+        return self.client.json_loads(response.content)
 
     def autonumber_generate(self, id: str):
         """Generates autonumber defined in Automation"""
@@ -17,6 +17,7 @@ from ._common_share import ShareMixin
 from ._common_tags import TagsMixin
 
 from ._exception import BeProductException
+from ._dedup_upload import DedupUpload
 
 
 class Block(
@@ -99,17 +100,24 @@ class Block(
             header_id: str,
             size_class_id_or_name: str,
             filepath: str = None,
-            fileurl: str = None):
+            fileurl: str = None,
+            dedup: DedupUpload | str = None):
         """ Uploads a 3D file into Block Size Class
 
         :header_id: Header ID,
         :size_class_id_or_name: Size Class ID
         :filepath: Local file path
         :fileurl: Remote file URL
+        :dedup: DedupUpload or path of its state file, skips uploaded content
         :returns: Upload ID
 
         """
 
+        if filepath and dedup:
+            return DedupUpload.of(self.client, dedup).upload(
+                filepath,
+                f"Block/SizeClass3DAssetUpload?headerId={header_id}" +
+                f"&sizeClass={size_class_id_or_name}")
         if filepath:
             return self.client.raw_api.upload_local_file(
                 filepath,
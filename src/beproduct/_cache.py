@@ -0,0 +1,332 @@
+"""
+File: _cache.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Read-through cache of slowly changing API responses
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from ._json import JsonCodec, DEFAULT_CODEC
+
+
+class MemoryCache:
+    """In-memory LRU storage with TTL and size limits"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        """Constructor
+
+        :max_entries: Maximum number of stored responses
+        :max_bytes: Maximum total size of stored responses
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """:returns: Stored bytes or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        """Stores value for ttl seconds, evicting least recently used entries"""
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str):
+        """Removes a stored value"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def keys(self):
+        """:returns: List of stored keys"""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        """Removes all stored values"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        _, value = self._entries.pop(key)
+        self._size -= len(value)
+
+
+class DiskCache:
+    """
+    On-disk storage with TTL and size limits. Survives restarts
+    and can be shared by processes using the same directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        """Constructor
+
+        :directory: Directory of cache files. Created if missing
+        :max_bytes: Maximum total size of cache files
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str):
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+    def _read(self, path: str):
+        try:
+            with open(path, "rb") as f:
+                return DEFAULT_CODEC.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key: str):
+        """:returns: Stored bytes or None if missing or expired"""
+        path = self._path(key)
+        entry = self._read(path)
+        if entry is None or entry.get("key") != key:
+            return None
+        if entry["expires_at"] <= time.time():
+            self.delete(key)
+            return None
+        return entry["value"].encode("utf-8")
+
+    def set(self, key: str, value: bytes, ttl: float):
+        """Stores value for ttl seconds, removing oldest files over the size limit"""
+        entry = {
+            "key": key,
+            "expires_at": time.time() + ttl,
+            "value": value.decode("utf-8"),
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(DEFAULT_CODEC.dumps(entry))
+        os.replace(tmp_path, self._path(key))
+        self._prune()
+
+    def delete(self, key: str):
+        """Removes a stored value"""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def keys(self):
+        """:returns: List of stored keys"""
+        keys = []
+        for path in self._files():
+            entry = self._read(path)
+            if entry is not None:
+                keys.append(entry["key"])
+        return keys
+
+    def clear(self):
+        """Removes all stored values"""
+        for path in self._files():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _files(self):
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".json")
+        ]
+
+    def _prune(self):
+        with self._lock:
+            files = []
+            for path in self._files():
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+            size = sum(f[1] for f in files)
+            for _, file_size, path in sorted(files):
+                if size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                size -= file_size
+
+
+class ResponseCache:
+    """
+    Read-through cache of API responses keyed by URL with parameters.
+    Responses are stored as JSON, so every caller gets its own copy.
+    """
+
+    def __init__(self, ttl: float = 300, backend=None, codec: JsonCodec = None):
+        """Constructor
+
+        :ttl: Seconds a response is served from the cache. 0 disables caching
+        :backend: MemoryCache (default), DiskCache or an object
+                  with the same get/set/delete/keys/clear methods
+        :codec: JSON codec of stored responses
+        """
+        self.ttl = ttl
+        self.codec = codec or DEFAULT_CODEC
+        self.backend = backend if backend is not None else MemoryCache()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: str):
+        value = self.backend.get(key) if self.ttl else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def _store(self, key: str, response, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        if ttl:
+            self.backend.set(key, self.codec.dumps(response), ttl)
+
+    def get_or_fetch(self, key: str, fetch, ttl: float = None):
+        """Returns cached response or calls fetch() and caches its result
+
+        :key: Full URL of the call
+        :fetch: Callable returning the response
+        :ttl: Seconds to cache the response, defaults to the cache's ttl
+        """
+        value = self._lookup(key)
+        if value is not None:
+            return self.codec.loads(value)
+        response = fetch()
+        self._store(key, response, ttl)
+        return response
+
+    async def get_or_fetch_async(self, key: str, fetch, ttl: float = None):
+        """Async version of get_or_fetch. fetch() returns an awaitable"""
+        value = self._lookup(key)
+        if value is not None:
+            return self.codec.loads(value)
+        response = await fetch()
+        self._store(key, response, ttl)
+        return response
+
+    def invalidate(self, url_part: str = None):
+        """Removes cached responses
+
+        :url_part: Only responses whose URL contains this string,
+                   e.g. 'FolderSchema?folderId=...'. All if omitted
+        """
+        if url_part is None:
+            self.backend.clear()
+            return
+        for key in self.backend.keys():
+            if url_part in key:
+                self.backend.delete(key)
+
+    def stats(self):
+        """:returns: Dictionary with hits, misses and stored entries"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.backend.keys()),
+            }
+
+
+class AppListCache:
+    """
+    App lists of master folder folders. All headers of a folder have the same
+    apps, so lists are keyed by (master_folder, folder_id) and come with
+    an index of lower-cased app titles.
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 256):
+        """Constructor
+
+        :ttl: Seconds an app list is kept
+        :max_entries: Maximum number of kept folders
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, apps, title index)
+        self._lock = threading.Lock()
+
+    def _entry(self, master_folder: str, folder_id: str):
+        key = (master_folder, folder_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def get(self, master_folder: str, folder_id: str):
+        """:returns: List of apps or None if not cached"""
+        entry = self._entry(master_folder, folder_id)
+        return list(entry[1]) if entry else None
+
+    def app_id(self, master_folder: str, folder_id: str, app_name: str):
+        """:returns: ID of the app with the title (case insensitive),
+        None if the title is unknown, or False if the list is not cached
+        """
+        entry = self._entry(master_folder, folder_id)
+        if entry is None:
+            return False
+        return entry[2].get(app_name.lower())
+
+    def set(self, master_folder: str, folder_id: str, apps):
+        """Keeps the app list of a folder"""
+        if not self.ttl:
+            return
+        index = {}
+        for app in apps or []:
+            index.setdefault(app["title"].lower(), app["id"])
+
+        key = (master_folder, folder_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, list(apps or []), index)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, master_folder: str = None, folder_id: str = None):
+        """Removes app lists of a folder, a master folder or all of them"""
+        with self._lock:
+            for key in list(self._entries):
+                if master_folder not in (None, key[0]):
+                    continue
+                if folder_id not in (None, key[1]):
+                    continue
+                del self._entries[key]
@@ -7,7 +7,7 @@ Description: Apps Mixin for every master folder
 """
 
 import logging
-from functools import lru_cache
+from .sdk import BeProductAsync
 
 
 class AppsMixin:
@@ -15,35 +15,15 @@ class AppsMixin:
     Apps mixin class for every master folder
     """
 
-    class __BlackBox:
-        """All BlackBoxes are the same."""
-
-        def __init__(self, **kwargs):
-            for key, value in kwargs.items():
-                setattr(self, key, value)
-
-        def __eq__(self, other):
-            return isinstance(other, type(self))
-
-        def __hash__(self):
-            return hash(type(self))
-
     def app_schema(self, app_id: str):
         """Returns an app schema
         :app_id: ID of the application / page
         :returns: Dictionary with app schema data
         """
-        return self.client.raw_api.get(
+        return self.client.raw_api.get_cached(
             f"{self.master_folder}/PageSchema?pageId={app_id}"
         )
 
-    @lru_cache(maxsize=128)
-    def __app_list(self, bb: __BlackBox, folder_id: str):
-        logging.debug("APP_LIST: Cache miss. Fetching fresh data.")
-        return self.client.raw_api.get(
-            f"{self.master_folder}/Pages?headerId={bb.header_id}"
-        )
-
     def app_list(self, header_id: str, folder_id: str = None):
         """Returns list of apps/pages for a specific style, material, etc
         :header_id: ID of the style, material, etc
@@ -51,17 +31,36 @@ class AppsMixin:
         :returns: List of apps
         Note: If folder_id is provided, result may be cached to speed up the response
         """
-        if folder_id:
-            logging.debug("APP_LIST: Folder_id provided. Fetching cached data.")
-            return self.__app_list(self.__BlackBox(header_id=header_id), folder_id)
-        else:
+        if not folder_id:
             logging.debug(
-                "APP_LIST: Cache is disable because folder_id is not provided. Fetching fresh data."
+                "APP_LIST: Cache is disabled because folder_id is not provided."
             )
             return self.client.raw_api.get(
                 f"{self.master_folder}/Pages?headerId={header_id}"
             )
 
+        if isinstance(self.client, BeProductAsync):
+            return self.__app_list_async(header_id, folder_id)
+
+        apps = self.client.app_list_cache.get(self.master_folder, folder_id)
+        if apps is None:
+            logging.debug("APP_LIST: Cache miss. Fetching fresh data.")
+            apps = self.client.raw_api.get(
+                f"{self.master_folder}/Pages?headerId={header_id}"
+            )
+            self.client.app_list_cache.set(self.master_folder, folder_id, apps)
+        return apps
+
+    async def __app_list_async(self, header_id: str, folder_id: str):
+        apps = self.client.app_list_cache.get(self.master_folder, folder_id)
+        if apps is None:
+            logging.debug("APP_LIST: Cache miss. Fetching fresh data.")
+            apps = await self.client.raw_api.get(
+                f"{self.master_folder}/Pages?headerId={header_id}"
+            )
+            self.client.app_list_cache.set(self.master_folder, folder_id, apps)
+        return apps
+
     def app_get(
         self,
         header_id: str,
@@ -83,12 +82,13 @@ class AppsMixin:
         if not app_id and not app_name:
             raise ValueError("Either app_id or app_name should be provided")
 
+        if isinstance(self.client, BeProductAsync):
+            return self.__app_get_async(header_id, app_id, app_name, folder_id)
+
         if not app_id:
-            apps = self.app_list(header_id, folder_id)
-            for app in apps:
-                if app["title"].lower() == app_name.lower():
-                    app_id = app["id"]
-                    break
+            app_id = self.client.resolver.app_id(
+                self.master_folder, header_id, app_name, folder_id
+            )
 
         if not app_id:
             raise ValueError(f"App with name {app_name} not found")
@@ -97,6 +97,21 @@ class AppsMixin:
             f"{self.master_folder}/Page?headerId={header_id}&pageId={app_id}"
         )
 
+    async def __app_get_async(
+        self, header_id: str, app_id: str, app_name: str, folder_id: str
+    ):
+        if not app_id:
+            app_id = await self.client.resolver.app_id(
+                self.master_folder, header_id, app_name, folder_id
+            )
+
+        if not app_id:
+            raise ValueError(f"App with name {app_name} not found")
+
+        return await self.client.raw_api.get(
+            f"{self.master_folder}/Page?headerId={header_id}&pageId={app_id}"
+        )
+
     def app_form_update(self, header_id: str, app_id: str, fields):
         """Updates form application
         :header_id: ID of the style, material, etc
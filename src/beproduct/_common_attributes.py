@@ -6,6 +6,12 @@ Github: https://github.com/BeProduct
 Description: Attributes Mixin for every master folder
 """
 
+from functools import partial
+from .sdk import BeProductAsync
+from ._schema import FolderCoercer
+from ._sync import IncrementalSync
+from ._table import ColumnTable
+
 
 class AttributesMixin:
     """
@@ -16,7 +22,7 @@ class AttributesMixin:
         """
         :returns: List of folders
         """
-        return self.client.raw_api.get(f"{self.master_folder}/Folders")
+        return self.client.raw_api.get_cached(f"{self.master_folder}/Folders")
 
     def folder_schema(self, folder_id: str):
         """Gets attributes schema (list of fields ) for a folder
@@ -25,7 +31,7 @@ class AttributesMixin:
         :returns: Attributes schema
 
         """
-        return self.client.raw_api.get(
+        return self.client.raw_api.get_cached(
             f"{self.master_folder}/FolderSchema?folderId={folder_id}"
         )
 
@@ -37,12 +43,17 @@ class AttributesMixin:
         filters=None,
         colorway_filters=None,
         page_size=30,
+        prefetch: int = 0,
+        stream: bool = False,
         **kwargs,
     ):
         """List of attributes
         :folder_id: Folder ID
         :filters: List of filter dictionaries
         :colorway_filters: List of colorway filter dictionaries
+        :page_size: Number of records per API call
+        :prefetch: Number of pages to fetch ahead concurrently. 0 is sequential
+        :stream: Decode records while a page is read instead of the whole page
         :**kwargs: Additional url parameters
         :returns: Enumerator of Attributes
         """
@@ -62,16 +73,108 @@ class AttributesMixin:
                     }
                 )
 
+        post = self.client.raw_api.post
+        if stream:
+            post = partial(self.client.raw_api.post_stream, key="result")
+
         return self.client.beproduct_paging_iterator(
             page_size,
-            lambda psize, pnum: self.client.raw_api.post(
+            lambda psize, pnum: post(
                 f"{self.master_folder}/Headers?folderId={folder_id}"
                 + f"&pageSize={psize}&pageNumber={pnum}",
                 body={"filters": _filters, "colorwayFilters": colorway_filters},
                 **kwargs,
             ),
+            prefetch=prefetch,
         )
 
+    def attributes_list_table(
+        self,
+        folder_id: str,
+        columns=None,
+        schema=None,
+        filters=None,
+        page_size=100,
+        prefetch: int = 0,
+        output: str = "auto",
+        **kwargs,
+    ):
+        """Attributes of a folder as a column-oriented table.
+        Records are streamed into one list per column and values are
+        converted by the compiled coercer of the folder schema.
+
+        :folder_id: Folder ID
+        :columns: Field IDs (or top level keys like 'createdAt') to export.
+                  Default is 'id' and every field of the folder schema
+        :schema: Processed folder schema. Default is the cached coercer of
+                 client.schema.get_folder_coercer
+        :filters: List of filter dictionaries
+        :page_size: Number of records per API call
+        :prefetch: Number of pages to fetch ahead concurrently. 0 is sequential
+        :output: 'pandas' DataFrame, 'arrow' Table, 'dict' of lists or
+                 'auto' for the first installed of pandas and pyarrow
+        :**kwargs: Additional url parameters
+        :returns: DataFrame, Table or dictionary {column: list of values}
+
+        Note: For BeProductAsync the result has to be awaited
+        """
+        args = (folder_id, columns, schema, filters, page_size, prefetch, output)
+        if isinstance(self.client, BeProductAsync):
+            return self.__attributes_list_table_async(*args, **kwargs)
+
+        if schema is None:
+            coercer = self.client.schema.get_folder_coercer(
+                self.master_folder, folder_id
+            )
+        else:
+            coercer = FolderCoercer(schema)
+        table = ColumnTable(columns, coercer, output)
+        table.extend(
+            self.attributes_list(
+                folder_id,
+                filters=filters,
+                page_size=page_size,
+                prefetch=prefetch,
+                stream=True,
+                **kwargs,
+            )
+        )
+        return table.build()
+
+    async def __attributes_list_table_async(
+        self, folder_id, columns, schema, filters, page_size, prefetch, output, **kwargs
+    ):
+        if schema is None:
+            coercer = await self.client.schema.get_folder_coercer(
+                self.master_folder, folder_id
+            )
+        else:
+            coercer = FolderCoercer(schema)
+        table = ColumnTable(columns, coercer, output)
+        async for record in self.attributes_list(
+            folder_id,
+            filters=filters,
+            page_size=page_size,
+            prefetch=prefetch,
+            stream=True,
+            **kwargs,
+        ):
+            table.add(record)
+        return table.build()
+
+    def incremental_sync(
+        self, folder_id: str, state=None, overlap: float = 300, **kwargs
+    ):
+        """Returns IncrementalSync of the folder's changed headers
+
+        :folder_id: Folder ID
+        :state: SyncState or path of its JSON file. Default is in memory
+        :overlap: Seconds re-read before the high-water mark for clock skew
+        :**kwargs: filters, page_size and prefetch of IncrementalSync
+        :returns: IncrementalSync
+        """
+        return IncrementalSync(self, folder_id, state, overlap, **kwargs)
+
     def attributes_get(self, header_id: str, **kwargs):
         """Returns style attibutes
 
@@ -84,6 +187,24 @@ class AttributesMixin:
             f"{self.master_folder}/Header/{header_id}", **kwargs
         )
 
+    def attributes_get_many(self, header_ids, concurrency: int = 8, **kwargs):
+        """Returns attributes of many styles, materials etc. concurrently
+
+        :header_ids: IDs of the style, material, image etc. Duplicates are
+                     fetched once
+        :concurrency: Number of requests running at the same time
+        :**kwargs: Additional url parameters
+        :returns: dictionary {header_id: attributes} in the order of header_ids.
+                  Failed IDs hold the raised exception instead of attributes
+
+        Note: For BeProductAsync the result has to be awaited
+        """
+        return self.client.beproduct_bulk_map(
+            lambda header_id: self.attributes_get(header_id, **kwargs),
+            header_ids,
+            concurrency,
+        )
+
     def attributes_delete(self, header_id: str, **kwargs):
         """Deletes Style/Material/Image by ID
 
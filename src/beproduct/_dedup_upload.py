@@ -0,0 +1,177 @@
+"""
+File: _dedup_upload.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Retried uploads of large local files, skipping uploaded content
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import aiohttp
+import requests
+from .sdk import BeProduct, BeProductAsync
+from ._sync import SyncState
+
+_READ_SIZE = 1024 * 1024
+
+
+def file_checksum(filepath: str) -> str:
+    """:returns: SHA-256 hex digest of the file"""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        while chunk := f.read(_READ_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _upload_id(result):
+    """Upload ID of an upload_local_file result"""
+    if isinstance(result, dict):
+        # the async client returns the response
+        return result.get("imageId")
+    return result
+
+
+class DedupUpload:
+    """
+    Uploads large local files (3D assets, turntables, working files),
+    skipping files whose content was already uploaded to the same URL.
+
+    The public API accepts a file only as one multipart request, so an
+    upload can't be resumed: a dropped connection sends the whole file
+    again, up to `attempts` times. The state file keeps per file and upload
+    URL the SHA-256 of the uploaded content and its upload ID. The checksum
+    is computed again only when the size or modification time of the file
+    changed.
+    """
+
+    def __init__(
+        self,
+        client: BeProduct | BeProductAsync,
+        state: SyncState | str = None,
+        attempts: int = 3,
+        retry_delay: float = 1.0,
+    ):
+        """Constructor
+
+        :client: BeProduct client
+        :state: SyncState or path of its JSON file. Default is in memory
+        :attempts: Number of attempts of an upload on connection errors
+        :retry_delay: Seconds before the first retry, doubled every retry
+        """
+        self.client = client
+        self.state = state if isinstance(state, SyncState) else SyncState(state)
+        self.attempts = attempts
+        self.retry_delay = retry_delay
+
+        if isinstance(client, BeProductAsync):
+            self.upload = self._upload_async
+        else:
+            self.upload = self._upload_sync
+
+    @classmethod
+    def of(cls, client, dedup):
+        """
+        :dedup: DedupUpload or path of its state file
+        :returns: DedupUpload of the client
+        """
+        if isinstance(dedup, cls):
+            return dedup
+        return cls(client, dedup)
+
+    def entry(self, filepath: str, url: str) -> dict:
+        """
+        Checksums the file unless it is unchanged since the saved upload
+
+        :returns: State of the file upload, upload_id is None if the
+                  content was not uploaded to the URL
+        """
+        stat = os.stat(filepath)
+        entry = self.state.get(self._key(filepath, url)) or {}
+        if (entry.get("size"), entry.get("mtime_ns")) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            return entry
+
+        checksum = file_checksum(filepath)
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": checksum,
+            "upload_id": (
+                entry.get("upload_id") if entry.get("sha256") == checksum else None
+            ),
+        }
+
+    def _key(self, filepath: str, url: str) -> str:
+        return f"{url}|{os.path.abspath(filepath)}"
+
+    def _upload_sync(
+        self, filepath: str, url: str, body=None, progress=None, **kwargs
+    ):
+        """
+        Uploads the file unless its content was already uploaded to the URL.
+        With BeProductAsync it has to be awaited.
+
+        :filepath: Path of the file
+        :url: API url
+        :body: Dict body
+        :progress: Function called with (bytes sent, file size)
+        :**kwargs: Additional url parameters
+        :returns: Upload ID
+        """
+        entry = self.entry(filepath, url)
+        if entry["upload_id"]:
+            return entry["upload_id"]
+
+        for attempt in range(self.attempts):
+            try:
+                result = self.client.raw_api.upload_local_file(
+                    filepath, url, body, progress=progress, **kwargs
+                )
+                break
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt + 1 >= self.attempts:
+                    raise
+                self._log_retry(filepath, e)
+                time.sleep(self.retry_delay * 2**attempt)
+
+        return self._finish(filepath, url, entry, result)
+
+    async def _upload_async(
+        self, filepath: str, url: str, body=None, progress=None, **kwargs
+    ):
+        entry = await asyncio.to_thread(self.entry, filepath, url)
+        if entry["upload_id"]:
+            return entry["upload_id"]
+
+        for attempt in range(self.attempts):
+            try:
+                result = await self.client.raw_api.upload_local_file(
+                    filepath, url, body, progress=progress, **kwargs
+                )
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt + 1 >= self.attempts:
+                    raise
+                self._log_retry(filepath, e)
+                await asyncio.sleep(self.retry_delay * 2**attempt)
+
+        return self._finish(filepath, url, entry, result)
+
+    def _log_retry(self, filepath: str, error: Exception):
+        logging.info(f"Upload of {filepath} failed ({type(error).__name__}). Retrying.")
+
+    def _finish(self, filepath: str, url: str, entry: dict, result):
+        entry["upload_id"] = _upload_id(result)
+        self.state.set(self._key(filepath, url), entry)
+        return entry["upload_id"]
+
+    def forget(self, filepath: str, url: str):
+        """Drops the state of the file upload"""
+        self.state.set(self._key(filepath, url), None)
@@ -10,6 +10,7 @@ This holds all of the implementation details of the MultipartEncoder
 import contextlib
 import io
 import os
+import tempfile
 from uuid import uuid4
 import requests
 
@@ -19,6 +20,10 @@ except:
    from urllib3 import fields
 
 
+#: Bytes of a URL source kept in a temporary file to replay retried uploads
+URL_SPOOL_SIZE = 64 * 1024 * 1024
+
+
 class FileNotSupportedError(Exception):
     """File not supported error."""
 
@@ -152,6 +157,20 @@ class MultipartEncoder(object):
     def __repr__(self):
         return '<MultipartEncoder: {!r}>'.format(self.fields)
 
+    def rewind(self):
+        """Rewind the encoder to send the whole body again, e.g. on a retry.
+
+        Local files are sought back to where they started, URL sources
+        replay their spooled bytes or are requested again.
+        """
+        for part in self.parts:
+            part.rewind()
+        self._iter_parts = iter(self.parts)
+        self._current_part = None
+        self.finished = False
+        self._buffer = CustomBytesIO(encoding=self.encoding)
+        self._write_boundary()
+
     def _calculate_length(self):
         """
         This uses the parts to calculate the length of the body.
@@ -496,6 +515,17 @@ class Part(object):
         body = coerce_data(field.data, encoding)
         return cls(headers, body)
 
+    def rewind(self):
+        """Rewind the part to write its headers and body again."""
+        self.headers_unread = True
+        if hasattr(self.body, 'rewind'):
+            self.body.rewind()
+        elif hasattr(self.body, 'seek'):
+            self.body.seek(0, 0)
+        else:
+            raise FileNotSupportedError(
+                "{!r} cannot be rewound".format(self.body))
+
     def bytes_left_to_write(self):
         """Determine if there are bytes left to write.
 
@@ -569,6 +599,7 @@ class CustomBytesIO(io.BytesIO):
 class FileWrapper(object):
     def __init__(self, file_object):
         self.fd = file_object
+        self.start = file_object.tell()
 
     @property
     def len(self):
@@ -577,6 +608,49 @@ class FileWrapper(object):
     def read(self, length=-1):
         return self.fd.read(length)
 
+    def rewind(self):
+        self.fd.seek(self.start, 0)
+
+
+class SourceSpool(object):
+    """Prefix of a streamed source kept in a temporary file.
+
+    Bytes are kept only while they follow the kept prefix and the prefix
+    stays within ``limit`` bytes, so a large source never fills the disk
+    or memory. A rewound source replays the prefix instead of downloading
+    it again.
+    """
+
+    def __init__(self, limit=URL_SPOOL_SIZE):
+        self.limit = limit
+        #: Number of kept bytes from the start of the source
+        self.size = 0
+        self.full = False
+        self._file = None
+
+    def keep(self, offset, chunk):
+        """Keep a chunk read from ``offset`` of the source."""
+        if self.full or offset != self.size or not chunk:
+            return
+        if self.size + len(chunk) > self.limit:
+            self.full = True
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile()
+        self._file.seek(self.size, 0)
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def read(self, offset, size):
+        """Read kept bytes from ``offset`` of the source."""
+        self._file.seek(offset, 0)
+        return self._file.read(min(size, self.size - offset))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
 
 class FileFromURLWrapper(object):
     """File from URL wrapper.
@@ -624,15 +698,25 @@ class FileFromURLWrapper(object):
 
     """
 
-    def __init__(self, file_url, session=None):
+    def __init__(self, file_url, session=None, spool_size=URL_SPOOL_SIZE):
         self.session = session or requests.Session()
+        self.file_url = file_url
         requested_file = self._request_for_file(file_url)
-        self.len = int(requested_file.headers['content-length'])
+        self.size = int(requested_file.headers['content-length'])
+        self.len = self.size
+        self.accept_ranges = (
+            requested_file.headers.get('accept-ranges', '').lower() == 'bytes')
         self.raw_data = requested_file.raw
+        self._response = requested_file
+        self._spool = SourceSpool(spool_size)
+        # read position and position of raw_data in the source
+        self._position = 0
+        self._offset = 0
 
-    def _request_for_file(self, file_url):
+    def _request_for_file(self, file_url, start=0):
         """Make call for file under provided URL."""
-        response = self.session.get(file_url, stream=True)
+        headers = {'Range': 'bytes={}-'.format(start)} if start else None
+        response = self.session.get(file_url, stream=True, headers=headers)
         content_length = response.headers.get('content-length', None)
         if content_length is None:
             error_msg = (
@@ -652,6 +736,41 @@ class FileFromURLWrapper(object):
     def read(self, chunk_size):
         """Read file in chunks."""
         chunk_size = chunk_size if chunk_size >= 0 else self.len
-        chunk = self.raw_data.read(chunk_size) or b''
+        if self._position < self._offset:
+            # replaying bytes read before the rewind
+            chunk = self._spool.read(
+                self._position, min(chunk_size, self._offset - self._position))
+        else:
+            chunk = self.raw_data.read(chunk_size) or b''
+            self._spool.keep(self._offset, chunk)
+            self._offset += len(chunk)
+        self._position += len(chunk)
         self.len -= len(chunk) if chunk else 0  # left to read
         return chunk
+
+    def rewind(self):
+        """Read the file from the start again.
+
+        Spooled bytes are replayed and the source continues where it
+        stopped. Bytes beyond the spool are requested again, from the end
+        of the spool if the server accepts ranges.
+        """
+        self._position = 0
+        self.len = self.size
+        if self._spool.size >= self._offset:
+            return
+
+        self._response.close()
+        start = self._spool.size if self.accept_ranges else 0
+        response = self._request_for_file(self.file_url, start)
+        if start and response.status_code != 206:
+            response.close()
+            start = 0
+            response = self._request_for_file(self.file_url)
+        self._response = response
+        self.raw_data = response.raw
+        self._offset = start
+
+    def close(self):
+        self._response.close()
+        self._spool.close()
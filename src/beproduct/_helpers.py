@@ -6,11 +6,62 @@ Github: https://github.com/BeProduct
 Description: Helper methods
 """
 
+import asyncio
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-def beproduct_paging_iterator_sync(page_size: int, page_func):
+
+def _page_records(page):
+    """Records of a page dictionary or of a streamed page"""
+    if isinstance(page, dict):
+        return page["result"]
+    return page
+
+
+async def _page_records_async(page):
+    if isinstance(page, dict):
+        for attr in page["result"]:
+            yield attr
+    else:
+        async for attr in page:
+            yield attr
+
+
+def _close_page(page):
+    """Releases the response of a streamed page"""
+    close = getattr(page, "close", None)
+    if close is not None:
+        close()
+
+
+def _close_fetched_page(future):
+    """Releases a prefetched page that will not be read"""
+    if not future.cancelled() and future.exception() is None:
+        _close_page(future.result())
+
+
+def _page_total(page):
+    """Total number of records. Known for streamed pages once they are read"""
+    if isinstance(page, dict):
+        return page["total"]
+    return page.fields["total"]
+
+
+def beproduct_paging_iterator_sync(page_size: int, page_func, prefetch: int = 0):
     """
     Yields iterator of BeProduct result pages
+
+    :page_size: Number of records per page
+    :page_func: Function (page_size, page_number) returning a page
+                dictionary or a JsonItemStream of the page's 'result'
+    :prefetch: Number of pages to fetch ahead in background threads.
+               0 fetches pages one by one
     """
+    if prefetch > 0:
+        yield from _paging_iterator_prefetch_sync(page_size, page_func, prefetch)
+        return
+
     total = 0
     processed = 0
     page_number = 0
@@ -18,11 +69,14 @@ def beproduct_paging_iterator_sync(page_size: int, page_func):
     while True:
         page = page_func(page_size, page_number)
 
-        total = page["total"]
+        try:
+            for attr in _page_records(page):
+                processed += 1
+                yield attr
+        finally:
+            _close_page(page)
 
-        for attr in page["result"]:
-            processed += 1
-            yield attr
+        total = _page_total(page)
 
         if processed >= total:
             break
@@ -30,10 +84,74 @@ def beproduct_paging_iterator_sync(page_size: int, page_func):
         page_number += 1
 
 
-async def beproduct_paging_iterator_async(page_size: int, page_func):
+def _paging_iterator_prefetch_sync(page_size: int, page_func, prefetch: int):
+    """
+    Yields records of all pages keeping up to `prefetch` pages in flight.
+    Number of pages is known from the `total` of the first page.
+    """
+    page = page_func(page_size, 0)
+    count = 0
+    for attr in _page_records(page):
+        count += 1
+        yield attr
+
+    # a streamed page knows its total once it is read
+    page_count = math.ceil(_page_total(page) / page_size)
+    if page_count <= 1 or not count:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=prefetch)
+    pending = deque()
+    next_page = 1
+
+    try:
+        while next_page < page_count and len(pending) < prefetch:
+            pending.append(executor.submit(page_func, page_size, next_page))
+            next_page += 1
+
+        while pending:
+            page = pending.popleft().result()
+
+            if next_page < page_count:
+                pending.append(executor.submit(page_func, page_size, next_page))
+                next_page += 1
+
+            count = 0
+            for attr in _page_records(page):
+                count += 1
+                yield attr
+
+            # records were removed since the first page was fetched
+            if not count:
+                break
+    finally:
+        _close_page(page)
+        for future in pending:
+            # pages being fetched are released once they arrive
+            if not future.cancel():
+                future.add_done_callback(_close_fetched_page)
+        executor.shutdown(wait=False)
+
+
+async def beproduct_paging_iterator_async(
+    page_size: int, page_func, prefetch: int = 0
+):
     """
     Yields iterator of BeProduct result pages
+
+    :page_size: Number of records per page
+    :page_func: Coroutine function (page_size, page_number) returning a page
+                dictionary or an AsyncJsonItemStream of the page's 'result'
+    :prefetch: Number of pages to fetch ahead concurrently.
+               0 fetches pages one by one
     """
+    if prefetch > 0:
+        async for attr in _paging_iterator_prefetch_async(
+            page_size, page_func, prefetch
+        ):
+            yield attr
+        return
+
     total = 0
     processed = 0
     page_number = 0
@@ -41,11 +159,110 @@ async def beproduct_paging_iterator_async(page_size: int, page_func):
     while True:
         page = await page_func(page_size, page_number)
 
-        total = page["total"]
+        try:
+            async for attr in _page_records_async(page):
+                processed += 1
+                yield attr
+        finally:
+            _close_page(page)
 
-        for attr in page["result"]:
-            processed += 1
-            yield attr
+        total = _page_total(page)
 
         if processed >= total:
             break
+
+        page_number += 1
+
+
+async def _paging_iterator_prefetch_async(page_size: int, page_func, prefetch: int):
+    """
+    Yields records of all pages keeping up to `prefetch` page requests
+    running concurrently. Records are yielded in page order.
+    """
+    page = await page_func(page_size, 0)
+    count = 0
+    async for attr in _page_records_async(page):
+        count += 1
+        yield attr
+
+    # a streamed page knows its total once it is read
+    page_count = math.ceil(_page_total(page) / page_size)
+    if page_count <= 1 or not count:
+        return
+
+    pending = deque()
+    next_page = 1
+
+    try:
+        while next_page < page_count and len(pending) < prefetch:
+            pending.append(asyncio.ensure_future(page_func(page_size, next_page)))
+            next_page += 1
+
+        while pending:
+            page = await pending.popleft()
+
+            if next_page < page_count:
+                pending.append(
+                    asyncio.ensure_future(page_func(page_size, next_page))
+                )
+                next_page += 1
+
+            count = 0
+            async for attr in _page_records_async(page):
+                count += 1
+                yield attr
+
+            # records were removed since the first page was fetched
+            if not count:
+                break
+    finally:
+        _close_page(page)
+        for task in pending:
+            if not task.cancel():
+                _close_fetched_page(task)
+
+
+def beproduct_bulk_map_sync(func, items, concurrency: int = 8):
+    """
+    Calls `func` for every unique item using a pool of worker threads
+
+    :func: Function of a single item
+    :items: Iterable of items. Repeated items are called only once
+    :concurrency: Number of calls running at the same time
+    :returns: Dictionary {item: result} in the order of the input.
+              Failed items hold the raised exception instead of the result
+    """
+    unique_items = list(dict.fromkeys(items))
+
+    def _call(item):
+        try:
+            return func(item)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        return dict(zip(unique_items, executor.map(_call, unique_items)))
+
+
+async def beproduct_bulk_map_async(func, items, concurrency: int = 8):
+    """
+    Awaits `func` for every unique item with bounded concurrency
+
+    :func: Coroutine function of a single item
+    :items: Iterable of items. Repeated items are awaited only once
+    :concurrency: Number of calls running at the same time
+    :returns: Dictionary {item: result} in the order of the input.
+              Failed items hold the raised exception instead of the result
+    """
+    unique_items = list(dict.fromkeys(items))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _call(item):
+        async with semaphore:
+            try:
+                return await func(item)
+            except Exception as e:
+                return e
+
+    results = await asyncio.gather(*(_call(item) for item in unique_items))
+    return dict(zip(unique_items, results))
@@ -0,0 +1,91 @@
+"""
+File: _json.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Pluggable JSON codec of request and response bodies
+"""
+
+import json
+
+
+class JsonCodec:
+    """
+    JSON encoder and decoder.
+    dumps returns UTF-8 bytes, loads accepts bytes or str.
+    """
+
+    def __init__(self, name: str, loads, dumps):
+        """Constructor
+
+        :name: Name of the JSON library
+        :loads: Function decoding bytes or str
+        :dumps: Function encoding an object to bytes
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def dumps_str(self, obj) -> str:
+        """Encodes an object to str, e.g. for error messages"""
+        try:
+            return self.dumps(obj).decode("utf-8")
+        except (TypeError, ValueError):
+            return repr(obj)
+
+    def __repr__(self):
+        return f"JsonCodec({self.name!r})"
+
+
+def stdlib_codec() -> JsonCodec:
+    """Codec of the standard json module"""
+    return JsonCodec(
+        "json",
+        json.loads,
+        lambda obj: json.dumps(obj, ensure_ascii=False).encode("utf-8"),
+    )
+
+
+def orjson_codec() -> JsonCodec:
+    """Codec of orjson. Raises ImportError if it is not installed"""
+    import orjson
+
+    return JsonCodec(
+        "orjson",
+        orjson.loads,
+        lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+    )
+
+
+def msgspec_codec() -> JsonCodec:
+    """Codec of msgspec. Raises ImportError if it is not installed"""
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    return JsonCodec("msgspec", decoder.decode, encoder.encode)
+
+
+def ujson_codec() -> JsonCodec:
+    """Codec of ujson. Raises ImportError if it is not installed"""
+    import ujson
+
+    return JsonCodec(
+        "ujson",
+        ujson.loads,
+        lambda obj: ujson.dumps(obj, ensure_ascii=False).encode("utf-8"),
+    )
+
+
+def default_codec() -> JsonCodec:
+    """Fastest installed codec: orjson, msgspec, ujson or the json module"""
+    for factory in (orjson_codec, msgspec_codec, ujson_codec):
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return stdlib_codec()
+
+
+#: Codec used where no client is at hand, e.g. by the response cache
+DEFAULT_CODEC = default_codec()
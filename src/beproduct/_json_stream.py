@@ -0,0 +1,282 @@
+"""
+File: _json_stream.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Incremental decoding of JSON arrays in response bodies
+"""
+
+import re
+from ._json import DEFAULT_CODEC
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+#: Size of response body chunks fed to the parser
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_SPECIAL = re.compile(rb'[\[\]{}",:]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_OPEN = b"[{"
+_CLOSE = b"]}"
+_SCALAR_EVENTS = ("null", "boolean", "integer", "double", "number", "string")
+
+
+class _PurePythonParser:
+    """
+    Push parser splitting the target array into raw items, each decoded
+    as soon as it is complete. Only the unfinished item
+    is kept in the buffer.
+    """
+
+    def __init__(self, key: str = None, loads=None):
+        self.key = key
+        self.item_depth = 2 if key else 1
+        self.fields = {}
+        self._loads = loads or DEFAULT_CODEC.loads
+
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._in_items = False
+        self._done = False
+        self._start = None  # start of the current item or object member
+        self._member_key = None
+        self._value_start = None
+
+    def feed(self, data: bytes):
+        """:returns: List of items completed by the data"""
+        items = []
+        buf = self._buf
+        buf += data
+        pos = self._pos
+
+        while not self._done:
+            if self._in_string:
+                m = _STRING_SPECIAL.search(buf, pos)
+                if not m:
+                    pos = len(buf)
+                    break
+                if m.group() == b"\\":
+                    if m.end() >= len(buf):  # escaped char is in the next chunk
+                        pos = m.start()
+                        break
+                    pos = m.end() + 1
+                    continue
+                self._in_string = False
+                pos = m.end()
+                continue
+
+            m = _SPECIAL.search(buf, pos)
+            if not m:
+                pos = len(buf)
+                break
+            i, pos = m.start(), m.end()
+            c = buf[i]
+
+            if c == 0x22:  # "
+                self._in_string = True
+            elif c in _OPEN:
+                self._open(buf, c, i, pos)
+            elif c in _CLOSE:
+                self._close(buf, i, items)
+            elif c == 0x2C:  # ,
+                self._separator(buf, i, pos, items)
+            elif c == 0x3A and self.key and self._depth == 1:  # :
+                self._member_key = self._loads(bytes(buf[self._start : i]))
+                self._start = None
+                self._value_start = pos
+
+        # drop everything before the unfinished item or member
+        keep = [p for p in (self._start, self._value_start) if p is not None]
+        keep_from = min(keep + [pos])
+        del buf[:keep_from]
+        self._pos = pos - keep_from
+        if self._start is not None:
+            self._start -= keep_from
+        if self._value_start is not None:
+            self._value_start -= keep_from
+        return items
+
+    def close(self):
+        """Checks the whole document was parsed"""
+        if not self._done:
+            raise ValueError("Incomplete JSON document")
+        return []
+
+    def _open(self, buf, c, i, pos):
+        self._depth += 1
+        if self._depth == 1:
+            if c == ord("[") and self.key:
+                # a plain list instead of an object, its items are the result
+                self.key = None
+                self.item_depth = 1
+            self._in_items = c == ord("[")
+            self._start = pos
+        elif (
+            self._depth == 2
+            and self.key
+            and c == ord("[")
+            and self._member_key == self.key
+            and not buf[self._value_start : i].strip()
+        ):
+            self._in_items = True
+            self._value_start = None
+            self._start = pos
+
+    def _close(self, buf, i, items):
+        if self._in_items and self._depth == self.item_depth:
+            self._append(buf, i, items)
+            self._in_items = False
+            self._start = None
+        elif self.key and self._depth == 1:
+            self._member_end(buf, i)
+        self._depth -= 1
+        if self._depth == 0:
+            self._done = True
+
+    def _separator(self, buf, i, pos, items):
+        if self._in_items and self._depth == self.item_depth:
+            self._append(buf, i, items)
+            self._start = pos
+        elif self.key and self._depth == 1:
+            self._member_end(buf, i)
+            self._start = pos
+
+    def _append(self, buf, end, items):
+        raw = bytes(buf[self._start : end]).strip()
+        if raw:
+            items.append(self._loads(raw))
+
+    def _member_end(self, buf, end):
+        if self._value_start is not None:
+            raw = bytes(buf[self._value_start : end]).strip()
+            if raw[:1] not in (b"[", b"{"):
+                self.fields[self._member_key] = self._loads(raw)
+        self._member_key = None
+        self._value_start = None
+
+
+class _IjsonParser:
+    """Push parser on top of ijson, used when ijson is installed"""
+
+    def __init__(self, key: str = None):
+        self.key = key
+        self.fields = {}
+        self._events = ijson.sendable_list()
+        self._coro = ijson.parse_coro(self._events, use_float=True)
+        self._builder = None
+        self._item_prefix = f"{key}.item" if key else "item"
+        self._first = True
+
+    def feed(self, data: bytes):
+        """:returns: List of items completed by the data"""
+        self._coro.send(data)
+        return self._process()
+
+    def close(self):
+        """Checks the whole document was parsed"""
+        self._coro.close()
+        return self._process()
+
+    def _process(self):
+        items = []
+        for prefix, event, value in self._events:
+            if self._first:
+                self._first = False
+                if event == "start_array" and self.key:
+                    # a plain list instead of an object, its items are the result
+                    self._item_prefix = "item"
+
+            if self._builder is not None:
+                self._builder.event(event, value)
+                if prefix == self._item_prefix and event in ("end_map", "end_array"):
+                    items.append(self._builder.value)
+                    self._builder = None
+            elif prefix == self._item_prefix:
+                if event in ("start_map", "start_array"):
+                    self._builder = ObjectBuilder()
+                    self._builder.event(event, value)
+                elif event in _SCALAR_EVENTS:
+                    items.append(value)
+            elif (
+                self.key
+                and event in _SCALAR_EVENTS
+                and prefix
+                and "." not in prefix
+            ):
+                self.fields[prefix] = value
+        del self._events[:]
+        return items
+
+
+def json_item_parser(key: str = None, loads=None):
+    """
+    Returns push parser of a JSON array. Uses ijson if installed.
+
+    :key: Key of the array in the top level object, e.g. 'result' of
+          paged responses. None if the document itself is an array
+    :loads: JSON decoder of items if ijson is not installed
+    """
+    if ijson is not None:
+        return _IjsonParser(key)
+    return _PurePythonParser(key, loads)
+
+
+class JsonItemStream:
+    """
+    Iterates over array items decoded while the response body is read.
+    Scalar top level fields next to the array (e.g. 'total' of a page)
+    are available in `fields` after iteration.
+    """
+
+    def __init__(self, chunks, key: str = None, close=None, loads=None):
+        """Constructor
+
+        :chunks: Iterable of body chunks (bytes)
+        :key: Key of the array in the top level object
+        :close: Callable releasing the response
+        :loads: JSON decoder of items, e.g. the client's json_loads
+        """
+        self._chunks = chunks
+        self._parser = json_item_parser(key, loads)
+        self._close = close
+
+    @property
+    def fields(self):
+        return self._parser.fields
+
+    def __iter__(self):
+        try:
+            for chunk in self._chunks:
+                yield from self._parser.feed(chunk)
+            yield from self._parser.close()
+        finally:
+            self.close()
+
+    def close(self):
+        """Releases the response"""
+        if self._close:
+            self._close()
+            self._close = None
+
+
+class AsyncJsonItemStream(JsonItemStream):
+    """Async version of JsonItemStream. chunks is an async iterable"""
+
+    def __iter__(self):
+        raise TypeError("Use 'async for' with AsyncJsonItemStream")
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self._chunks:
+                for item in self._parser.feed(chunk):
+                    yield item
+            for item in self._parser.close():
+                yield item
+        finally:
+            self.close()
@@ -15,6 +15,7 @@ from ._common_revisions import RevisionsMixin
 from ._common_share import ShareMixin
 from ._common_tags import TagsMixin
 from ._exception import BeProductException
+from ._dedup_upload import DedupUpload
 
 
 class Material(UploadMixin, AttributesMixin, AppsMixin, CommentsMixin,
@@ -223,7 +224,8 @@ class Material(UploadMixin, AttributesMixin, AppsMixin, CommentsMixin,
                                      app_id: str,
                                      colorway_id: str,
                                      filepath: str = None,
-                                     fileurl: str = None):
+                                     fileurl: str = None,
+                                     dedup: DedupUpload | str = None):
         """Uploads new file into 3D material app
 
         :header_id: Material ID
@@ -231,9 +233,15 @@ class Material(UploadMixin, AttributesMixin, AppsMixin, CommentsMixin,
         :colorway_id: Colorway ID,
         :filepath: Local file path
         :fileurl: Remote file URL
+        :dedup: DedupUpload or path of its state file, skips uploaded content
         :returns: Upload ID
 
         """
+        if filepath and dedup:
+            return DedupUpload.of(self.client, dedup).upload(
+                filepath,
+                f"Material/Material3DAppImageUpload?materialId={header_id}" +
+                f"&pageId={app_id}&colorwayId={colorway_id}")
         if filepath:
             return self.client.raw_api.upload_local_file(
                 filepath,
@@ -0,0 +1,106 @@
+"""
+File: _multipart.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Zero-copy multipart/form-data body of local file uploads
+"""
+
+import mmap
+import os
+from typing import Dict
+from uuid import uuid4
+from urllib3.fields import RequestField
+
+#: Size of the memoryview slices handed to the socket
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _part_headers(name: str, filename: str = None, content_type: str = None):
+    field = RequestField(name=name, data=b"", filename=filename)
+    field.make_multipart(content_type=content_type)
+    return field.render_headers().encode("utf-8")
+
+
+class MultipartFileBody:
+    """
+    multipart/form-data body of form fields and one local file.
+
+    The file is memory-mapped and sent as memoryview slices of the mapping,
+    so its content is not copied through Python buffers. The body is an
+    iterable with a length: requests sends it with Content-Length, and every
+    iteration maps the file again, so a retried request sends the whole body.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        fields: Dict = None,
+        file_field: str = "file",
+        content_type: str = "application/octet-stream",
+        boundary: str = None,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        progress=None,
+    ):
+        """Constructor
+
+        :filepath: Path of the uploaded file
+        :fields: Dictionary of form fields sent before the file
+        :file_field: Form field name of the file
+        :content_type: Content type of the file part
+        :boundary: Multipart boundary. Default is random
+        :chunk_size: Size of the slices handed to the socket
+        :progress: Function called with (bytes of the file sent, file size)
+        """
+        self.filepath = filepath
+        self.boundary_value = boundary or uuid4().hex
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.size = os.path.getsize(filepath)
+
+        boundary = f"--{self.boundary_value}\r\n".encode("utf-8")
+        head = bytearray()
+        for name, value in (fields or {}).items():
+            if not isinstance(value, bytes):
+                value = str(value).encode("utf-8")
+            head += boundary + _part_headers(name) + value + b"\r\n"
+        head += boundary + _part_headers(
+            file_field, os.path.basename(filepath), content_type
+        )
+        self._head = bytes(head)
+        self._tail = f"\r\n--{self.boundary_value}--\r\n".encode("utf-8")
+
+        #: Length of the body
+        self.len = len(self._head) + self.size + len(self._tail)
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary_value}"
+
+    def __len__(self):
+        return self.len
+
+    def __iter__(self):
+        yield self._head
+        if self.size:
+            with open(self.filepath, "rb") as f, mmap.mmap(
+                f.fileno(), self.size, access=mmap.ACCESS_READ
+            ) as mapped:
+                for start in range(0, self.size, self.chunk_size):
+                    chunk = memoryview(mapped)[start : start + self.chunk_size]
+                    try:
+                        yield chunk
+                    finally:
+                        # the socket is done with it, the mapping can be closed
+                        chunk.release()
+                    if self.progress:
+                        sent = min(start + self.chunk_size, self.size)
+                        self.progress(sent, self.size)
+        yield self._tail
+
+    def to_bytes(self) -> bytes:
+        """Whole body in memory, e.g. for tests"""
+        return b"".join(bytes(chunk) for chunk in self)
+
+    def __repr__(self):
+        return f"<MultipartFileBody: {self.filepath!r}>"
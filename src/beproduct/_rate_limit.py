@@ -0,0 +1,208 @@
+"""
+File: _rate_limit.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Adaptive client side rate limiter
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value):
+    """Parses Retry-After header value
+
+    :value: Number of seconds or HTTP date
+    :returns: Seconds to wait or None if header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    """Token bucket of a single API base URL with AIMD rate adaptation"""
+
+    def __init__(self, rate, burst, min_rate, increase, decrease):
+        self.rate = rate
+        self.max_rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.decreased_at = 0.0
+        self.increased_at = 0.0
+
+        # recent request rate, used to start limiting an unlimited bucket
+        self.window_start = self.updated_at
+        self.window_count = 0
+        self.observed_rate = None
+        # rate at the first 429 of an unlimited bucket, where it recovers to
+        self.ceiling = None
+
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Takes a token
+
+        :returns: Seconds the caller has to wait before sending the request
+        """
+        with self.lock:
+            now = time.monotonic()
+
+            self.window_count += 1
+            if now - self.window_start >= 1.0:
+                self.observed_rate = self.window_count / (now - self.window_start)
+                self.window_start = now
+                self.window_count = 0
+
+            wait = max(0.0, self.paused_until - now)
+            if self.rate is None:
+                return wait
+
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.rate)
+            return wait
+
+    def on_throttled(self, retry_after=None):
+        """Multiplicative decrease. Pauses the bucket if server asked to"""
+        with self.lock:
+            now = time.monotonic()
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+
+            # a burst of 429 responses for the same window counts once
+            if now - self.decreased_at < 1.0:
+                return
+            self.decreased_at = now
+
+            current = self.rate
+            if current is None:
+                current = self.observed_rate or self.window_count or 1.0
+                self.ceiling = current
+                self.tokens = 0.0
+                self.updated_at = now
+            self.rate = max(self.min_rate, current * self.decrease)
+
+    def pause(self, seconds: float):
+        """Holds all requests for the number of seconds"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def on_success(self):
+        """
+        Additive increase, up to the configured rate. An unlimited bucket
+        is unlimited again once it is back at the rate of its first 429
+        """
+        with self.lock:
+            if self.rate is None:
+                return
+            now = time.monotonic()
+            # one increase step per second of successful calls
+            if now - max(self.decreased_at, self.increased_at) < 1.0:
+                return
+            self.increased_at = now
+            self.rate += self.increase
+            if self.max_rate is not None:
+                self.rate = min(self.max_rate, self.rate)
+            elif self.rate >= self.ceiling:
+                self.rate = None
+                self.ceiling = None
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter shared by all threads and coroutines of a client.
+    Every API base URL has its own bucket. The rate goes down on HTTP 429
+    and back up on sustained success (AIMD).
+    """
+
+    def __init__(
+        self,
+        rate: float = None,
+        burst: int = None,
+        min_rate: float = 0.5,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+    ):
+        """Constructor
+
+        :rate: Maximum requests per second. None starts unlimited, only
+               limits after the server responds with 429 and is unlimited
+               again when the rate recovers to the one before the 429
+        :burst: Number of requests allowed at once. Defaults to rate
+        :min_rate: The rate never goes below this value
+        :increase: Requests per second added for each second of success
+        :decrease: Rate multiplier applied on 429
+        """
+        self.rate = rate
+        self.burst = burst or max(1, int(rate or 1))
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, base_url: str) -> _Bucket:
+        """Returns the bucket of the API base URL"""
+        bucket = self._buckets.get(base_url)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(
+                    base_url,
+                    _Bucket(
+                        self.rate,
+                        self.burst,
+                        self.min_rate,
+                        self.increase,
+                        self.decrease,
+                    ),
+                )
+        return bucket
+
+    def acquire(self, base_url: str):
+        """Blocks until a request to base_url is allowed"""
+        wait = self.bucket(base_url).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, base_url: str):
+        """Waits until a request to base_url is allowed"""
+        wait = self.bucket(base_url).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, base_url: str, seconds: float):
+        """Holds all requests to base_url, e.g. while backing off after 429"""
+        self.bucket(base_url).pause(seconds)
+
+    def feedback(self, base_url: str, status: int, retry_after: str = None):
+        """Adapts the rate to the response status
+
+        :base_url: API base URL
+        :status: HTTP status code of the response
+        :retry_after: Value of the Retry-After response header
+        """
+        if status == 429:
+            self.bucket(base_url).on_throttled(parse_retry_after(retry_after))
+        elif status < 500:
+            self.bucket(base_url).on_success()
@@ -6,48 +6,98 @@ Github: https://github.com/BeProduct
 Description: Raw API class
 """
 
-import json
 from typing import Dict
 import os
 import requests
 import time
-import logging
+from requests.adapters import HTTPAdapter
 
 from ._exception import BeProductException
+from ._rate_limit import parse_retry_after
+from ._retry import RetryPolicy
+from ._json_stream import JsonItemStream, STREAM_CHUNK_SIZE
 from ._encoder import MultipartEncoder, FileFromURLWrapper
+from ._multipart import MultipartFileBody
 from .sdk import BeProduct
 
 
-class _Throttle:
-    """Implements throttling policy"""
+class RawApi:
+    """Raw API class"""
 
-    def __init__(self, strategy=None):
-        """Constrictor"""
-        self.strategy = strategy or [1, 3, 5, 15, 30]  # seconds to wait
-        self.current = 0  # index in strategy
+    def __init__(
+        self,
+        client: BeProduct,
+        additional_headers: Dict = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 0,
+        retry_policy: RetryPolicy = None,
+    ):
+        """Constructor
+
+        :client: BeProduct client
+        :additional_headers: Headers added to every request
+        :pool_connections: Number of connection pools to cache (one per host)
+        :pool_maxsize: Maximum number of kept-alive connections per host
+        :max_retries: Number of retries on failed connections (not on HTTP errors)
+        :retry_policy: Policy of retrying failed and throttled calls
+        """
+        self.client = client
+        self.additional_headers = additional_headers or {}
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.session = requests.Session()
 
-    def wait_or_die(self):
-        """Used to retry api calls
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-        :returns: True if waited, False not going to wait anymore
+    def close(self):
+        """Closes pooled connections"""
+        self.session.close()
 
+    def __send(self, method: str, url: str, **kwargs):
+        """Sends request through the client's rate limiter
+        and retries it according to the retry policy
         """
-        if len(self.strategy) <= self.current:
-            return False
+        base_url = self.client.public_api_url
+        retry = self.retry_policy.start(method, url)
+        rewind = getattr(kwargs.get("data"), "rewind", None)
 
-        logging.info(f"Throttling. Waiting {self.strategy[self.current]} sec.")
-        time.sleep(self.strategy[self.current])
-
-        self.current += 1
-        return True
+        while True:
+            if retry.retries and rewind:
+                # streamed bodies were consumed by the previous attempt
+                rewind()
+            self.client.rate_limiter.acquire(base_url)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = retry.next_delay(error=e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
 
+            retry_after = response.headers.get("Retry-After")
+            self.client.rate_limiter.feedback(
+                base_url, response.status_code, retry_after
+            )
 
-class RawApi:
-    """Raw API class"""
+            delay = retry.next_delay(
+                status=response.status_code, retry_after=parse_retry_after(retry_after)
+            )
+            if delay is None:
+                return response
 
-    def __init__(self, client: BeProduct, additional_headers: Dict = None):
-        self.client = client
-        self.additional_headers = additional_headers or {}
+            response.close()
+            if response.status_code == 429:
+                # the whole client backs off, not only this call
+                self.client.rate_limiter.pause(base_url, delay)
+            else:
+                time.sleep(delay)
 
     def __append_url_parameters(self, url: str, param_dict: Dict):
         if param_dict:
@@ -78,16 +128,11 @@ class RawApi:
         :returns: response body as string or throws an error
 
         """
-        throttle = _Throttle()
         full_url = self.__append_url_parameters(
             f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
         )
 
-        while True:
-            response = requests.get(url=full_url, headers=self.__get_headers())
-            if response.status_code == 429 and throttle.wait_or_die():
-                continue
-            break
+        response = self.__send("GET", full_url, headers=self.__get_headers())
 
         if response.status_code != 200:
             raise BeProductException(
@@ -97,7 +142,23 @@ class RawApi:
                 + f"Response body: {response.text} \n"
             )
 
-        return response.json()
+        return self.client.json_loads(response.content)
+
+    def get_cached(self, url, ttl: float = None, **kwargs):
+        """GET Request served from the client's response cache if possible.
+        Used for slowly changing metadata, e.g. folders and schemas
+
+        :url: url to call
+        :ttl: Seconds to cache the response, defaults to the cache's ttl
+        :returns: response body
+
+        """
+        full_url = self.__append_url_parameters(
+            f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
+        )
+        return self.client.cache.get_or_fetch(
+            full_url, lambda: self.get(url, **kwargs), ttl
+        )
 
     def delete(self, url, **kwargs):
         """DELETE Request to BeProduct Public API
@@ -106,15 +167,10 @@ class RawApi:
         :returns: response body as string or throws an error
 
         """
-        throttle = _Throttle()
         full_url = self.__append_url_parameters(
             f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
         )
-        while True:
-            response = requests.delete(url=full_url, headers=self.__get_headers())
-            if response.status_code == 429 and throttle.wait_or_die():
-                continue
-            break
+        response = self.__send("DELETE", full_url, headers=self.__get_headers())
 
         if response.status_code != 200:
             raise BeProductException(
@@ -124,7 +180,7 @@ class RawApi:
                 + f"Response body: {response.text} \n"
             )
 
-        return response.json()
+        return self.client.json_loads(response.content)
 
     def post(self, url, body, **kwargs):
         """POST Request to BeProduct Public API
@@ -135,74 +191,129 @@ class RawApi:
 
         """
 
-        throttle = _Throttle()
         full_url = self.__append_url_parameters(
             f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
         )
 
-        while True:
-            response = requests.post(
-                url=full_url, json=body, headers=self.__get_headers()
+        response = self.__send(
+            "POST",
+            full_url,
+            data=self.client.json_dumps(body),
+            headers=self.__get_headers(),
+        )
+
+        if response.status_code != 200:
+            raise BeProductException(
+                "API POST call failed. Details:\n"
+                + f"URL: {full_url} \n"
+                + f"Body: {self.client.json_codec.dumps_str(body)} \n"
+                + f"Status code: {response.status_code} \n"
+                + f"Response body: {response.text} \n"
             )
-            if response.status_code == 429 and throttle.wait_or_die():
-                continue
-            break
+
+        return self.client.json_loads(response.content)
+
+    def get_stream(self, url, key: str = None, **kwargs):
+        """GET Request decoding the response body while it is read
+
+        :url: url to call
+        :key: Key of the array in the response object, e.g. 'result'.
+              None if the response is an array
+        :returns: JsonItemStream iterating over the array items
+
+        """
+        full_url = self.__append_url_parameters(
+            f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
+        )
+        response = self.__send(
+            "GET", full_url, headers=self.__get_headers(), stream=True
+        )
+
+        if response.status_code != 200:
+            raise BeProductException(
+                "API call failed. Details: \n"
+                + f"URL: {full_url} \n"
+                + f"Status code: {response.status_code} \n"
+                + f"Response body: {response.text} \n"
+            )
+
+        return JsonItemStream(
+            response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+            key,
+            response.close,
+            self.client.json_loads,
+        )
+
+    def post_stream(self, url, body, key: str = None, **kwargs):
+        """POST Request decoding the response body while it is read
+
+        :url: api url
+        :body: json body
+        :key: Key of the array in the response object, e.g. 'result'.
+              None if the response is an array
+        :returns: JsonItemStream iterating over the array items
+
+        """
+        full_url = self.__append_url_parameters(
+            f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
+        )
+        response = self.__send(
+            "POST",
+            full_url,
+            data=self.client.json_dumps(body),
+            headers=self.__get_headers(),
+            stream=True,
+        )
 
         if response.status_code != 200:
             raise BeProductException(
                 "API POST call failed. Details:\n"
                 + f"URL: {full_url} \n"
-                + f"Body: {json.dumps(body)} \n"
+                + f"Body: {self.client.json_codec.dumps_str(body)} \n"
                 + f"Status code: {response.status_code} \n"
                 + f"Response body: {response.text} \n"
             )
 
-        return response.json()
+        return JsonItemStream(
+            response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+            key,
+            response.close,
+            self.client.json_loads,
+        )
 
-    def upload_local_file(self, filepath: str, url: str, body: Dict = None, **kwargs):
+    def upload_local_file(
+        self, filepath: str, url: str, body: Dict = None, progress=None, **kwargs
+    ):
         """Uploads a file from the filesystem
         :filepath: path of the file
         :url: api url
         :body: Dict body
+        :progress: Function called with (bytes sent, file size)
         :returns: Upload ID. Check status using upload_completed
         """
 
-        throttle = _Throttle()
         full_url = self.__append_url_parameters(
             f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
         )
 
-        request_body = {} if body is None else body.copy()
-        f = open(filepath, "rb")
-        request_body["file"] = (
-            os.path.basename(filepath),
-            f,
-            "application/octet-stream",
-        )
-
-        stream_encoder = MultipartEncoder(fields=request_body)
+        # the file is memory-mapped and streamed without copies
+        multipart_body = MultipartFileBody(filepath, fields=body, progress=progress)
         headers = self.__get_auth_header()
-        headers["Content-Type"] = stream_encoder.content_type
+        headers["Content-Type"] = multipart_body.content_type
         headers.update(self.additional_headers)
 
-        while True:
-            response = requests.post(url=full_url, data=stream_encoder, headers=headers)
-            if response.status_code == 429 and throttle.wait_or_die():
-                continue
-            break
-
-        f.close()
+        response = self.__send("POST", full_url, data=multipart_body, headers=headers)
 
         if response.status_code != 200:
             raise BeProductException(
                 "API POST call failed. Details:\n"
                 + f"URL: {full_url} \n"
-                + f"Body: {json.dumps(body)} \n"
+                + f"Body: {self.client.json_codec.dumps_str(body)} \n"
                 + f"Status code: {response.status_code} \n"
                 + f"Response body: {response.text} \n"
             )
 
-        resp = response.json()
+        resp = self.client.json_loads(response.content)
         return resp["imageId"] if "imageId" in resp else None
 
     def upload_from_url(self, file_url: str, api_url: str, body: Dict = None, **kwargs):
@@ -213,15 +324,16 @@ class RawApi:
         :returns: Upload ID. Check status using upload_completed
         """
 
-        throttle = _Throttle()
         full_url = self.__append_url_parameters(
             f"{self.client.public_api_url}/{api_url.lstrip('/')}", kwargs
         )
 
+        # the source is spooled, so a retry does not send an exhausted stream
+        source = FileFromURLWrapper(file_url, session=self.session)
         request_body = {} if body is None else body.copy()
         request_body["file"] = (
             os.path.basename(file_url).split("?")[0],
-            FileFromURLWrapper(file_url),
+            source,
             "application/octet-stream",
         )
 
@@ -230,22 +342,23 @@ class RawApi:
         headers["Content-Type"] = stream_encoder.content_type
         headers.update(self.additional_headers)
 
-        while True:
-            response = requests.post(url=full_url, data=stream_encoder, headers=headers)
-            if response.status_code == 429 and throttle.wait_or_die():
-                continue
-            break
+        try:
+            response = self.__send(
+                "POST", full_url, data=stream_encoder, headers=headers
+            )
+        finally:
+            source.close()
 
         if response.status_code != 200:
             raise BeProductException(
                 "API POST call failed. Details:\n"
                 + f"URL: {full_url} \n"
-                + f"Body: {json.dumps(body)} \n"
+                + f"Body: {self.client.json_codec.dumps_str(body)} \n"
                 + f"Status code: {response.status_code} \n"
                 + f"Response body: {response.text} \n"
             )
 
-        resp = response.json()
+        resp = self.client.json_loads(response.content)
         return resp["imageId"] if "imageId" in resp else None
 
     def upload_status(self, file_id: str):
@@ -6,7 +6,6 @@ Github: https://github.com/BeProduct
 Description: Raw API class
 """
 
-import json
 from typing import Dict
 import os
 import aiohttp
@@ -15,41 +14,173 @@ import time
 import logging
 
 from ._exception import BeProductException
-from ._encoder import MultipartEncoder, FileFromURLWrapper
+from ._rate_limit import parse_retry_after
+from ._retry import RetryPolicy
+from ._json_stream import AsyncJsonItemStream, STREAM_CHUNK_SIZE
+from ._encoder import SourceSpool
+from ._upload_status import UploadStatusPoller
 from .sdk import BeProduct
 
 
-class _Throttle:
-    """Implements throttling policy"""
-
-    def __init__(self, strategy=None):
-        """Constrictor"""
-        self.strategy = strategy or [1, 3, 5, 15, 30]  # seconds to wait
-        self.current = 0  # index in strategy
-
-    async def wait_or_die(self):
-        """Used to retry api calls
-
-        :returns: True if waited, False not going to wait anymore
-
-        """
-        if len(self.strategy) <= self.current:
-            return False
-
-        logging.info(f"Throttling. Waiting {self.strategy[self.current]} sec.")
-        await asyncio.sleep(self.strategy[self.current])
-
-        self.current += 1
-        return True
+class _AsyncURLSource:
+    """
+    File streamed from a URL for upload_from_url. The source is downloaded
+    once: a retried upload replays the spooled bytes and continues the
+    download, bytes beyond the spool are requested again with Range.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, url: str):
+        self.session = session
+        self.url = url
+        self.accept_ranges = False
+        self._spool = SourceSpool()
+        self._response = None
+        self._offset = 0
+
+    async def _request(self, start: int = 0):
+        headers = {"Range": f"bytes={start}-"} if start else None
+        response = await self.session.get(self.url, headers=headers)
+        if response.status != (206 if start else 200):
+            response.release()
+            if start:
+                return await self._request()
+            raise BeProductException(
+                f"Failed to download file from URL. Status: {response.status}"
+            )
+        if self._response is not None:
+            self._response.release()
+        self._response = response
+        self._offset = start
+        return response
+
+    async def open(self):
+        response = await self._request()
+        self.accept_ranges = response.headers.get("accept-ranges") == "bytes"
+
+    async def stream(self, chunk_size: int = 8192):
+        """Async generator of the whole file, every call starts from zero"""
+        if self._spool.size < self._offset:
+            await self._request(self._spool.size if self.accept_ranges else 0)
+
+        position = 0
+        while position < self._offset:
+            chunk = self._spool.read(position, chunk_size)
+            position += len(chunk)
+            yield chunk
+
+        async for chunk in self._response.content.iter_chunked(chunk_size):
+            self._spool.keep(self._offset, chunk)
+            self._offset += len(chunk)
+            yield chunk
+
+    def close(self):
+        if self._response is not None:
+            self._response.release()
+        self._spool.close()
 
 
 class RawApiAsync:
     """Raw API class"""
 
-    def __init__(self, client: BeProduct, additional_headers: Dict = None):
+    def __init__(
+        self,
+        client: BeProduct,
+        additional_headers: Dict = None,
+        connector_limit: int = 100,
+        connector_limit_per_host: int = 0,
+        ttl_dns_cache: int = 10,
+        retry_policy: RetryPolicy = None,
+    ):
+        """Constructor
+
+        :client: BeProduct client
+        :additional_headers: Headers added to every request
+        :connector_limit: Total number of simultaneous connections
+        :connector_limit_per_host: Simultaneous connections to the same host.
+                                   0 means no limit
+        :ttl_dns_cache: Seconds to cache resolved DNS entries
+        :retry_policy: Policy of retrying failed and throttled calls
+        """
         self.client = client
+        self.retry_policy = retry_policy or RetryPolicy()
         self.logger = logging.getLogger("beproduct.sdk.RawApiAsync")
         self.additional_headers = additional_headers or {}
+        self.connector_limit = connector_limit
+        self.connector_limit_per_host = connector_limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self._session = None
+
+        #: Shared polling loop of wait_for_uploads
+        self.upload_poller = UploadStatusPoller(self.upload_status)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session. Created on first use inside the event loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.connector_limit,
+                    limit_per_host=self.connector_limit_per_host,
+                    ttl_dns_cache=self.ttl_dns_cache,
+                )
+            )
+        return self._session
+
+    async def __send(
+        self, method: str, url: str, data_factory=None, stream=False, **kwargs
+    ):
+        """Sends request through the client's rate limiter
+        and retries it according to the retry policy
+
+        :data_factory: Callable creating request data for every attempt
+        :stream: Return the response without reading the body.
+                 The caller releases it
+        :returns: Response with the body already read unless stream is set
+        """
+        base_url = self.client.public_api_url
+        retry = self.retry_policy.start(method, url)
+
+        while True:
+            self.logger.debug(f"{method} {url}")
+            if data_factory:
+                kwargs["data"] = data_factory()
+
+            await self.client.rate_limiter.acquire_async(base_url)
+            try:
+                response = await self.session.request(method, url, **kwargs)
+                if not stream:
+                    # the connection goes back to the pool once the body is read
+                    await response.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                delay = retry.next_delay(error=e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            retry_after = response.headers.get("Retry-After")
+            self.client.rate_limiter.feedback(base_url, response.status, retry_after)
+
+            delay = retry.next_delay(
+                status=response.status, retry_after=parse_retry_after(retry_after)
+            )
+            if delay is None:
+                return response
+
+            response.release()
+            self.logger.debug(f"{response.status} {url}")
+            if response.status == 429:
+                # the whole client backs off, not only this call
+                self.client.rate_limiter.pause(base_url, delay)
+            else:
+                await asyncio.sleep(delay)
+
+    async def aclose(self):
+        """Closes the shared session and its connections"""
+        self.upload_poller.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     def __append_url_parameters(self, url: str, param_dict: Dict):
         if param_dict:
@@ -61,16 +192,18 @@ class RawApiAsync:
             return result_url
         return url
 
-    def __get_headers(self):
+    async def __get_headers(self):
+        token = await self.client.oauth2_client.get_access_token_async()
         return {
-            "Authorization": f"Bearer {self.client.oauth2_client.get_access_token()}",
+            "Authorization": f"Bearer {token}",
             "Content-type": "application/json",
             **self.additional_headers,
         }
 
-    def __get_auth_header(self):
+    async def __get_auth_header(self):
+        token = await self.client.oauth2_client.get_access_token_async()
         return {
-            "Authorization": f"Bearer {self.client.oauth2_client.get_access_token()}",
+            "Authorization": f"Bearer {token}",
             **self.additional_headers,
         }
 
@@ -81,35 +214,38 @@ class RawApiAsync:
         :returns: response body as string or throws an error
 
         """
-        throttle = _Throttle()
         full_url = self.__append_url_parameters(
             f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
         )
 
-        while True:
-            self.logger.debug(f"GET {full_url}")
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url=full_url, headers=self.__get_headers()
-                ) as response:
-                    if response.status == 429:
-                        self.logger.debug(f"429 {full_url}")
-                        if throttle.wait_or_die():
-                            continue
-                        else:
-                            raise BeProductException(
-                                "API call failed due to throttling. "
-                                "Please try again later."
-                            )
-
-                    if response.status != 200:
-                        raise BeProductException(
-                            "API call failed. Details: \n"
-                            + f"URL: {full_url} \n"
-                            + f"Status code: {response.status} \n"
-                            + f"Response body: {await response.text()} \n"
-                        )
-                    return await response.json()
+        response = await self.__send(
+            "GET", full_url, headers=await self.__get_headers()
+        )
+
+        if response.status != 200:
+            raise BeProductException(
+                "API call failed. Details: \n"
+                + f"URL: {full_url} \n"
+                + f"Status code: {response.status} \n"
+                + f"Response body: {await response.text()} \n"
+            )
+        return self.client.json_loads(await response.read())
+
+    async def get_cached(self, url, ttl: float = None, **kwargs):
+        """GET Request served from the client's response cache if possible.
+        Used for slowly changing metadata, e.g. folders and schemas
+
+        :url: url to call
+        :ttl: Seconds to cache the response, defaults to the cache's ttl
+        :returns: response body
+
+        """
+        full_url = self.__append_url_parameters(
+            f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
+        )
+        return await self.client.cache.get_or_fetch_async(
+            full_url, lambda: self.get(url, **kwargs), ttl
+        )
 
     async def delete(self, url, **kwargs):
         """DELETE Request to BeProduct Public API
@@ -118,32 +254,22 @@ class RawApiAsync:
         :returns: response body as string or throws an error
 
         """
-        throttle = _Throttle()
         full_url = self.__append_url_parameters(
             f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
         )
-        while True:
-            self.logger.debug(f"DELETE {full_url}")
-            async with aiohttp.ClientSession() as session:
-                async with session.delete(
-                    url=full_url, headers=self.__get_headers()
-                ) as response:
-                    if response.status == 429:
-                        if throttle.wait_or_die():
-                            continue
-                        else:
-                            raise BeProductException(
-                                "API call failed due to throttling. "
-                                "Please try again later."
-                            )
-                    if response.status != 200:
-                        raise BeProductException(
-                            "API call failed. Details: \n"
-                            + f"URL: {full_url} \n"
-                            + f"Status code: {response.status} \n"
-                            + f"Response body: {await response.text()} \n"
-                        )
-                    return await response.json()
+
+        response = await self.__send(
+            "DELETE", full_url, headers=await self.__get_headers()
+        )
+
+        if response.status != 200:
+            raise BeProductException(
+                "API call failed. Details: \n"
+                + f"URL: {full_url} \n"
+                + f"Status code: {response.status} \n"
+                + f"Response body: {await response.text()} \n"
+            )
+        return self.client.json_loads(await response.read())
 
     async def post(self, url, body, **kwargs):
         """POST Request to BeProduct Public API
@@ -154,45 +280,105 @@ class RawApiAsync:
 
         """
 
-        throttle = _Throttle()
         full_url = self.__append_url_parameters(
             f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
         )
 
-        while True:
-            self.logger.debug(f"POST {full_url}")
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url=full_url, json=body, headers=self.__get_headers()
-                ) as response:
-                    if response.status == 429:
-                        self.logger.debug(f"429 {full_url}")
-                        if throttle.wait_or_die():
-                            continue
-                        else:
-                            raise BeProductException(
-                                "API call failed due to throttling. "
-                                "Please try again later."
-                            )
-                    if response.status != 200:
-                        raise BeProductException(
-                            "API call failed. Details: \n"
-                            + f"URL: {full_url} \n"
-                            + f"Status code: {response.status} \n"
-                            + f"Response body: {await response.text()} \n"
-                        )
-                    return await response.json()
+        response = await self.__send(
+            "POST",
+            full_url,
+            data=self.client.json_dumps(body),
+            headers=await self.__get_headers(),
+        )
+
+        if response.status != 200:
+            raise BeProductException(
+                "API call failed. Details: \n"
+                + f"URL: {full_url} \n"
+                + f"Status code: {response.status} \n"
+                + f"Response body: {await response.text()} \n"
+            )
+        return self.client.json_loads(await response.read())
+
+    async def get_stream(self, url, key: str = None, **kwargs):
+        """GET Request decoding the response body while it is read
+
+        :url: url to call
+        :key: Key of the array in the response object, e.g. 'result'.
+              None if the response is an array
+        :returns: AsyncJsonItemStream iterating over the array items
+
+        """
+        full_url = self.__append_url_parameters(
+            f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
+        )
+        response = await self.__send(
+            "GET", full_url, headers=await self.__get_headers(), stream=True
+        )
+
+        if response.status != 200:
+            async with response:
+                raise BeProductException(
+                    "API call failed. Details: \n"
+                    + f"URL: {full_url} \n"
+                    + f"Status code: {response.status} \n"
+                    + f"Response body: {await response.text()} \n"
+                )
+
+        return AsyncJsonItemStream(
+            response.content.iter_chunked(STREAM_CHUNK_SIZE),
+            key,
+            response.release,
+            self.client.json_loads,
+        )
+
+    async def post_stream(self, url, body, key: str = None, **kwargs):
+        """POST Request decoding the response body while it is read
+
+        :url: api url
+        :body: json body
+        :key: Key of the array in the response object, e.g. 'result'.
+              None if the response is an array
+        :returns: AsyncJsonItemStream iterating over the array items
+
+        """
+        full_url = self.__append_url_parameters(
+            f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
+        )
+        response = await self.__send(
+            "POST",
+            full_url,
+            data=self.client.json_dumps(body),
+            headers=await self.__get_headers(),
+            stream=True,
+        )
+
+        if response.status != 200:
+            async with response:
+                raise BeProductException(
+                    "API call failed. Details: \n"
+                    + f"URL: {full_url} \n"
+                    + f"Status code: {response.status} \n"
+                    + f"Response body: {await response.text()} \n"
+                )
+
+        return AsyncJsonItemStream(
+            response.content.iter_chunked(STREAM_CHUNK_SIZE),
+            key,
+            response.release,
+            self.client.json_loads,
+        )
 
     async def upload_local_file(
-        self, filepath: str, url: str, body: Dict = None, **kwargs
+        self, filepath: str, url: str, body: Dict = None, progress=None, **kwargs
     ):
         """Uploads a file from the filesystem using streaming
         :filepath: path of the file
         :url: api url
         :body: Dict body
+        :progress: Function called with (bytes sent, file size)
         :returns: Upload ID. Check status using upload_completed
         """
-        throttle = _Throttle()
         full_url = self.__append_url_parameters(
             f"{self.client.public_api_url}/{url.lstrip('/')}", kwargs
         )
@@ -204,51 +390,50 @@ class RawApiAsync:
         except OSError as e:
             raise BeProductException(f"Failed to access file: {str(e)}")
 
-        # Create multipart form data with streaming
-        data = aiohttp.FormData()
-        if body:
-            for key, value in body.items():
-                data.add_field(key, value)
-
         # Create a streaming reader for the file
         async def file_stream():
+            sent = 0
             with open(filepath, "rb") as f:
                 while chunk := f.read(8192):  # 8KB chunks
                     yield chunk
+                    sent += len(chunk)
+                    if progress:
+                        progress(sent, file_size)
+
+        # Multipart form data is created for every attempt,
+        # so a retry streams the file from the beginning
+        def form_data():
+            data = aiohttp.FormData()
+            if body:
+                for key, value in body.items():
+                    data.add_field(key, value)
+
+            # Add the streaming file to form data
+            data.add_field(
+                "file",
+                file_stream(),
+                filename=filename,
+                content_type="application/octet-stream",
+            )
+            return data
 
-        # Add the streaming file to form data
-        data.add_field(
-            "file",
-            file_stream(),
-            filename=filename,
-            content_type="application/octet-stream",
+        # Upload to destination while streaming
+        response = await self.__send(
+            "POST",
+            full_url,
+            data_factory=form_data,
+            headers=await self.__get_auth_header(),
         )
 
-        # Upload to destination while streaming
-        while True:
-            self.logger.debug(f"POST {full_url}")
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url=full_url, data=data, headers=self.__get_auth_header()
-                ) as response:
-                    if response.status == 429:
-                        self.logger.debug(f"429 {full_url}")
-                        if await throttle.wait_or_die():
-                            continue
-                        else:
-                            raise BeProductException(
-                                "API call failed due to throttling. "
-                                "Please try again later."
-                            )
-                    if response.status != 200:
-                        raise BeProductException(
-                            "API POST call failed. Details:\n"
-                            + f"URL: {full_url} \n"
-                            + f"Body: {json.dumps(body)} \n"
-                            + f"Status code: {response.status} \n"
-                            + f"Response body: {await response.text()} \n"
-                        )
-                    return await response.json()
+        if response.status != 200:
+            raise BeProductException(
+                "API POST call failed. Details:\n"
+                + f"URL: {full_url} \n"
+                + f"Body: {self.client.json_codec.dumps_str(body)} \n"
+                + f"Status code: {response.status} \n"
+                + f"Response body: {await response.text()} \n"
+            )
+        return self.client.json_loads(await response.read())
 
     async def upload_from_url(
         self, file_url: str, api_url: str, body: Dict = None, **kwargs
@@ -259,86 +444,87 @@ class RawApiAsync:
         :body: Dict body
         :returns: Upload ID. Check status using upload_completed
         """
-        throttle = _Throttle()
         full_url = self.__append_url_parameters(
             f"{self.client.public_api_url}/{api_url.lstrip('/')}", kwargs
         )
 
+        session = self.session
+
         # First get the file info from the source URL
-        async with aiohttp.ClientSession() as session:
-            async with session.head(file_url) as response:
-                if response.status != 200:
-                    raise BeProductException(
-                        f"Failed to get file info from URL. Status: {response.status}"
-                    )
-                content_length = response.headers.get("content-length")
-                if not content_length or not content_length.isdigit():
-                    raise BeProductException(
-                        "Source URL must provide a valid content-length header"
-                    )
-                content_type = response.headers.get(
-                    "content-type", "application/octet-stream"
+        async with session.head(file_url) as response:
+            if response.status != 200:
+                raise BeProductException(
+                    f"Failed to get file info from URL. Status: {response.status}"
                 )
-                filename = os.path.basename(file_url).split("?")[0]
-
-        # Create multipart form data with streaming
-        data = aiohttp.FormData()
-        if body:
-            for key, value in body.items():
-                data.add_field(key, value)
+            content_length = response.headers.get("content-length")
+            if not content_length or not content_length.isdigit():
+                raise BeProductException(
+                    "Source URL must provide a valid content-length header"
+                )
+            content_type = response.headers.get(
+                "content-type", "application/octet-stream"
+            )
+            filename = os.path.basename(file_url).split("?")[0]
+
+        # Multipart form data is created for every attempt, a retry
+        # replays the spooled source instead of an exhausted stream
+        def form_data():
+            data = aiohttp.FormData()
+            if body:
+                for key, value in body.items():
+                    data.add_field(key, value)
+            data.add_field(
+                "file", source.stream(), filename=filename, content_type=content_type
+            )
+            return data
 
         # Stream the file directly from source to destination
-        async with aiohttp.ClientSession() as session:
-            # Get the file stream from source URL
-            async with session.get(file_url) as source_response:
-                if source_response.status != 200:
-                    raise BeProductException(
-                        f"Failed to download file from URL. Status: {source_response.status}"
-                    )
-
-                # Create a streaming reader for the source file
-                async def file_stream():
-                    async for chunk in source_response.content.iter_chunked(
-                        8192
-                    ):  # 8KB chunks
-                        yield chunk
-
-                # Add the streaming file to form data
-                data.add_field(
-                    "file", file_stream(), filename=filename, content_type=content_type
-                )
+        source = _AsyncURLSource(session, file_url)
+        try:
+            await source.open()
+
+            # Upload to destination while streaming
+            response = await self.__send(
+                "POST",
+                full_url,
+                data_factory=form_data,
+                headers=await self.__get_auth_header(),
+            )
 
-                # Upload to destination while streaming
-                while True:
-                    self.logger.debug(f"POST {full_url}")
-                    async with session.post(
-                        url=full_url, data=data, headers=self.__get_auth_header()
-                    ) as response:
-                        if response.status == 429:
-                            self.logger.debug(f"429 {full_url}")
-                            if await throttle.wait_or_die():
-                                continue
-                            else:
-                                raise BeProductException(
-                                    "API call failed due to throttling. "
-                                    "Please try again later."
-                                )
-                        if response.status != 200:
-                            raise BeProductException(
-                                "API POST call failed. Details:\n"
-                                + f"URL: {full_url} \n"
-                                + f"Body: {json.dumps(body)} \n"
-                                + f"Status code: {response.status} \n"
-                                + f"Response body: {await response.text()} \n"
-                            )
-                        return await response.json()
+            if response.status != 200:
+                raise BeProductException(
+                    "API POST call failed. Details:\n"
+                    + f"URL: {full_url} \n"
+                    + f"Body: {self.client.json_codec.dumps_str(body)} \n"
+                    + f"Status code: {response.status} \n"
+                    + f"Response body: {await response.text()} \n"
+                )
+            return self.client.json_loads(await response.read())
+        finally:
+            source.close()
 
     async def upload_status(self, file_id: str):
         """
         Checks if file was successfully processed at BeProduct
         :returns: Tuple ( upload_is_completed, error_happened, error_msg )
         """
-        self.logger.debug(f"GET {f"Style/GetImageProcessingStatus/{file_id}"}")
+        self.logger.debug(f"GET Style/GetImageProcessingStatus/{file_id}")
         status = await self.get(f"Style/GetImageProcessingStatus/{file_id}")
         self.logger.debug(f"Status: {status}")
         return status["finished"], status["errorOccured"], status["message"]
+
+    async def wait_for_uploads(self, upload_ids, timeout: float = None):
+        """
+        Waits for processing of uploads without a polling loop per upload.
+        All uploads are polled by the shared upload_poller.
+
+        :upload_ids: Iterable of upload IDs
+        :timeout: Seconds after which a future raises asyncio.TimeoutError.
+                  None waits until the upload is processed
+        :returns: Dictionary {upload_id: future} of the status tuples
+                  ( upload_is_completed, error_happened, error_msg )
+        """
+        return {
+            upload_id: self.upload_poller.watch(upload_id, timeout)
+            for upload_id in upload_ids
+        }
@@ -0,0 +1,199 @@
+"""
+File: _resolver.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Name to ID resolution of folders, fields, apps and colorways
+"""
+
+import threading
+import time
+from .sdk import BeProduct, BeProductAsync
+from .helpers.parsers import dict_to_eq_filter_parser, resolve_field_names
+
+
+def _folder_index(folders):
+    return _name_index(folders, "name", "id")
+
+
+def _field_index(schema):
+    return _name_index(schema, "fieldName", "fieldId")
+
+
+def _colorway_index(header):
+    return _name_index((header or {}).get("colorways"), "colorNumber", "id")
+
+
+def _name_index(records, name_key: str, id_key: str):
+    """Lower-cased names to IDs. The first record wins on duplicate names"""
+    index = {}
+    for record in records or []:
+        name = record.get(name_key)
+        if isinstance(name, str):
+            index.setdefault(name.lower(), record.get(id_key))
+    return index
+
+
+class Resolver:
+    """
+    Resolves names to IDs with dictionaries built once per folder or header:
+
+    - folder name -> folder id
+    - field name -> field id of a folder
+    - app title -> app id of a folder
+    - colorway number -> colorway id of a header
+
+    Names are case insensitive. Methods return None for unknown names.
+    With BeProductAsync methods are awaitable.
+    """
+
+    def __init__(self, client: BeProduct | BeProductAsync, ttl: float = 300):
+        """Constructor
+
+        :client: BeProduct client
+        :ttl: Seconds an index is kept
+        """
+        self.client = client
+        self.ttl = ttl
+        self._indexes = {}  # key -> (expires_at, index)
+        self._lock = threading.Lock()
+
+        if isinstance(client, BeProductAsync):
+            self._index = self._index_async
+            self.app_id = self._app_id_async
+        else:
+            self._index = self._index_sync
+            self.app_id = self._app_id_sync
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._indexes[key]
+                return None
+            return entry[1]
+
+    def _set(self, key, index):
+        if self.ttl:
+            with self._lock:
+                self._indexes[key] = (time.monotonic() + self.ttl, index)
+
+    def _index_sync(self, key, url: str, build_index, cached: bool = True):
+        """:cached: False builds a fresh index and doesn't keep it"""
+        if not cached:
+            return build_index(self.client.raw_api.get(url))
+        index = self._get(key)
+        if index is None:
+            index = build_index(self.client.raw_api.get_cached(url))
+            self._set(key, index)
+        return index
+
+    async def _index_async(self, key, url: str, build_index, cached: bool = True):
+        if not cached:
+            return build_index(await self.client.raw_api.get(url))
+        index = self._get(key)
+        if index is None:
+            index = build_index(await self.client.raw_api.get_cached(url))
+            self._set(key, index)
+        return index
+
+    def _lookup(self, index, name: str):
+        if isinstance(self.client, BeProductAsync):
+            return self._lookup_async(index, name)
+        return index.get(name.lower())
+
+    async def _lookup_async(self, index, name: str):
+        return (await index).get(name.lower())
+
+    def folder_ids(self, master_folder: str):
+        """:returns: Dictionary of lower-cased folder names to folder IDs"""
+        return self._index(
+            ("folders", master_folder), f"{master_folder}/Folders", _folder_index
+        )
+
+    def folder_id(self, master_folder: str, folder_name: str):
+        """:returns: ID of the folder with the name"""
+        return self._lookup(self.folder_ids(master_folder), folder_name)
+
+    def field_ids(self, master_folder: str, folder_id: str):
+        """:returns: Dictionary of lower-cased field names to field IDs"""
+        return self._index(
+            ("fields", master_folder, folder_id),
+            f"{master_folder}/FolderSchema?folderId={folder_id}",
+            _field_index,
+        )
+
+    def field_id(self, master_folder: str, folder_id: str, field_name: str):
+        """:returns: ID of the folder's field with the name"""
+        return self._lookup(self.field_ids(master_folder, folder_id), field_name)
+
+    def colorway_ids(self, master_folder: str, header_id: str):
+        """:returns: Dictionary of lower-cased colorway numbers to colorway IDs.
+        Colorways change with the header, so the header is fetched every time
+        """
+        return self._index(
+            ("colorways", master_folder, header_id),
+            f"{master_folder}/Header/{header_id}",
+            _colorway_index,
+            cached=False,
+        )
+
+    def colorway_id(self, master_folder: str, header_id: str, color_number: str):
+        """:returns: ID of the header's colorway with the number"""
+        return self._lookup(self.colorway_ids(master_folder, header_id), color_number)
+
+    def _app_id_sync(
+        self, master_folder: str, header_id: str, app_name: str, folder_id: str = None
+    ):
+        """:returns: ID of the app with the title. Without folder_id
+        the app list of the header is fetched every time
+        """
+        if folder_id:
+            app_id = self.client.app_list_cache.app_id(
+                master_folder, folder_id, app_name
+            )
+            if app_id is not False:
+                return app_id
+
+        apps = self.client.raw_api.get(f"{master_folder}/Pages?headerId={header_id}")
+        if folder_id:
+            self.client.app_list_cache.set(master_folder, folder_id, apps)
+        return _name_index(apps, "title", "id").get(app_name.lower())
+
+    async def _app_id_async(
+        self, master_folder: str, header_id: str, app_name: str, folder_id: str = None
+    ):
+        if folder_id:
+            app_id = self.client.app_list_cache.app_id(
+                master_folder, folder_id, app_name
+            )
+            if app_id is not False:
+                return app_id
+
+        apps = await self.client.raw_api.get(
+            f"{master_folder}/Pages?headerId={header_id}"
+        )
+        if folder_id:
+            self.client.app_list_cache.set(master_folder, folder_id, apps)
+        return _name_index(apps, "title", "id").get(app_name.lower())
+
+    def eq_filters(self, master_folder: str, folder_id: str, filters):
+        """Builds Eq/Contains filters from a dictionary keyed
+        by field names or field IDs, see dict_to_eq_filter_parser
+
+        :returns: List of filters
+        """
+        field_ids = self.field_ids(master_folder, folder_id)
+        if isinstance(self.client, BeProductAsync):
+            return self._eq_filters_async(field_ids, filters)
+        return filters | resolve_field_names(field_ids) | dict_to_eq_filter_parser
+
+    async def _eq_filters_async(self, field_ids, filters):
+        return filters | resolve_field_names(await field_ids) | dict_to_eq_filter_parser
+
+    def invalidate(self):
+        """Forgets all indexes"""
+        with self._lock:
+            self._indexes.clear()
@@ -0,0 +1,140 @@
+"""
+File: _retry.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Retry policy for API calls
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+
+
+class RetryPolicy:
+    """
+    Retries throttled (429), transiently failing (502, 503, 504) and
+    disconnected calls with full-jitter exponential backoff.
+
+    GET and DELETE calls are retried on any of these failures. POST calls
+    are retried after a failure only if `retry_post` is set or the url is
+    a known idempotent endpoint. A 429 is retried for every method because
+    the server has not processed the call.
+
+    Grid and list app updates (PageGrid, PageList) are not retried by
+    default: rows and items without an ID are created on every call.
+    """
+
+    IDEMPOTENT_POST_PATTERNS = (
+        r"/Header/[^/?]+/Update(\?|$)",
+        r"/PageForm\?",
+        r"/Timelines/Edit(\?|$)",
+    )
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        total_timeout: float = 300.0,
+        retry_statuses=(429, 502, 503, 504),
+        retry_post: bool = False,
+        idempotent_post_patterns=None,
+    ):
+        """Constructor
+
+        :max_retries: Maximum number of retries of a single call
+        :base_delay: Backoff of the first retry in seconds
+        :max_delay: Backoff never exceeds this number of seconds
+        :total_timeout: Seconds after which a call is not retried anymore
+        :retry_statuses: HTTP statuses to retry
+        :retry_post: Retry all POST calls on failures, not only idempotent ones
+        :idempotent_post_patterns: Regular expressions of POST urls safe to retry
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.total_timeout = total_timeout
+        self.retry_statuses = set(retry_statuses)
+        self.retry_post = retry_post
+        self._idempotent_post = [
+            re.compile(p)
+            for p in (
+                self.IDEMPOTENT_POST_PATTERNS
+                if idempotent_post_patterns is None
+                else idempotent_post_patterns
+            )
+        ]
+
+        #: Number of retries by reason, e.g. {'429': 10, 'ConnectionError': 1}
+        self.metrics = Counter()
+        self._metrics_lock = threading.Lock()
+
+    def is_idempotent(self, method: str, url: str) -> bool:
+        """Checks if a call can be safely sent twice"""
+        if method.upper() != "POST":
+            return True
+        return self.retry_post or any(p.search(url) for p in self._idempotent_post)
+
+    def backoff(self, retry_number: int) -> float:
+        """Full-jitter exponential backoff of the retry"""
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2**retry_number)
+        )
+
+    def start(self, method: str, url: str):
+        """Starts retry tracking of a single call"""
+        return _RetryState(self, method, url)
+
+    def _count(self, reason: str):
+        with self._metrics_lock:
+            self.metrics[reason] += 1
+            self.metrics["total"] += 1
+
+
+class _RetryState:
+    """Retries of a single call"""
+
+    def __init__(self, policy: RetryPolicy, method: str, url: str):
+        self.policy = policy
+        self.method = method
+        self.url = url
+        self.retries = 0
+        self.started_at = time.monotonic()
+
+    def next_delay(
+        self, status: int = None, error: Exception = None, retry_after: float = None
+    ):
+        """Decides if the call should be retried
+
+        :status: HTTP status of the response
+        :error: Connection error raised instead of a response
+        :retry_after: Seconds the server asked to wait, the delay is never shorter
+        :returns: Seconds to wait before retry or None to give up
+        """
+        policy = self.policy
+
+        if error is None and status not in policy.retry_statuses:
+            return None
+        if status != 429 and not policy.is_idempotent(self.method, self.url):
+            return None
+        if self.retries >= policy.max_retries:
+            return None
+
+        delay = policy.backoff(self.retries)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if time.monotonic() - self.started_at + delay > policy.total_timeout:
+            return None
+
+        reason = str(status) if error is None else type(error).__name__
+        policy._count(reason)
+        self.retries += 1
+
+        logging.info(
+            f"Retrying {self.method} {self.url} ({reason}) in {delay:.1f} sec."
+        )
+        return delay
@@ -6,33 +6,221 @@ Github: https://github.com/BeProduct
 Description: User Public API
 """
 
+import re
+import threading
+import time
+from collections import OrderedDict
 from .sdk import BeProduct, BeProductAsync
 from datetime import datetime
 
+# .NET writes up to 7 fraction digits, fromisoformat of 3.10 takes 3 or 6
+_FRACTION = re.compile(r"(?<=:\d\d)\.(\d+)")
+
+
+def _to_bool(value):
+    if value is None or isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("yes", "true", "1")
+
+
+def _to_datetime(value):
+    if not value or isinstance(value, datetime):
+        return value or None
+    value = str(value)
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    value = _FRACTION.sub(lambda m: "." + m[1][:6].ljust(6, "0"), value, count=1)
+    return datetime.fromisoformat(value)
+
+
+def _to_float(value):
+    return None if value in (None, "") else float(value)
+
+
+def _to_int(value):
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _keep(value):
+    return value
+
+
+#: Converters of raw field values by data_type of the processed schema
+VALUE_COERCERS = {
+    bool: _to_bool,
+    datetime: _to_datetime,
+    float: _to_float,
+    int: _to_int,
+}
+
+
+def value_coercer(data_type):
+    """
+    Returns function converting raw field values to data_type.
+    Values which can't be converted become None.
+
+    :data_type: data_type of a processed schema field
+    """
+    coerce = VALUE_COERCERS.get(data_type, _keep)
+    if coerce is _keep:
+        return coerce
+
+    def _coerce(value):
+        try:
+            return coerce(value)
+        except (TypeError, ValueError):
+            return None
+
+    return _coerce
+
+
+def _choice_coercer(possible_values: list):
+    choices = {}
+    for choice in possible_values:
+        for key in (choice["id"], choice["code"]):
+            if key not in (None, ""):
+                choices.setdefault(key, choice["value"])
+
+    def _coerce(value):
+        if isinstance(value, list):
+            return [choices.get(v, v) if isinstance(v, str) else v for v in value]
+        if isinstance(value, str):
+            return choices.get(value, value)
+        return value
+
+    return _coerce
+
+
+class FolderCoercer:
+    """
+    Converts raw field values of a folder's headers. Compiled once from the
+    processed folder schema into a dispatch table of field ID to converter.
+    Choice fields (DropDown, MultiSelect, PartnerDropDown...) map choice IDs
+    and codes to choice values, other fields convert to their data_type.
+    """
+
+    def __init__(self, schema: list):
+        """Constructor
+
+        :schema: Processed folder schema, see Schema.get_folder_schema
+        """
+        self.fields = {
+            f["field_id"]: (
+                _choice_coercer(f["possible_values"])
+                if f["possible_values"]
+                else value_coercer(f["data_type"])
+            )
+            for f in schema
+        }
+
+    def coerce(self, field_id: str, value):
+        """Converts a value of the field. Unknown fields are kept as is"""
+        return self.fields.get(field_id, _keep)(value)
+
+    def header(self, record: dict) -> dict:
+        """
+        :record: Header API response, e.g. an item of attributes_list
+        :returns: Dictionary of field ID to converted value
+        """
+        fields = self.fields
+        return {
+            f["id"]: fields.get(f["id"], _keep)(f["value"])
+            for f in record["headerData"]["fields"]
+        }
+
+    def page(self, records) -> list:
+        """:returns: List of converted headers, see header()"""
+        return [self.header(record) for record in records]
+
 
 class Schema:
     """Implements User API"""
 
-    def __init__(self, client: BeProduct | BeProductAsync):
-        """Constructor"""
+    def __init__(
+        self,
+        client: BeProduct | BeProductAsync,
+        coercer_ttl: float = 300,
+        max_coercers: int = 256,
+    ):
+        """Constructor
+
+        :client: BeProduct client
+        :coercer_ttl: Seconds a compiled folder coercer is kept. Independent
+                      of the response cache, 0 compiles one on every call
+        :max_coercers: Maximum number of kept folder coercers
+        """
         self.client = client
+        self.ttl = coercer_ttl
+        self.max_coercers = max_coercers
+        # (master_folder, folder_id) -> (expires_at, coercer), oldest first
+        self._coercers = OrderedDict()
+        self._lock = threading.Lock()
+
         if isinstance(self.client, BeProductAsync):
             self.get_folder_schema = self._get_folder_schema_async
+            self.get_folder_coercer = self._get_folder_coercer_async
         else:
             self.get_folder_schema = self._get_folder_schema_sync
+            self.get_folder_coercer = self._get_folder_coercer_sync
 
     def _get_folder_schema_sync(self, master_folder: str, folder_id: str):
-        schema = self.client.raw_api.get(
+        schema = self.client.raw_api.get_cached(
             f"{master_folder}/FolderSchema?folderId={folder_id}"
         )
         return self._process_schema(schema, master_folder, folder_id)
 
     async def _get_folder_schema_async(self, master_folder: str, folder_id: str):
-        schema = await self.client.raw_api.get(
+        schema = await self.client.raw_api.get_cached(
             f"{master_folder}/FolderSchema?folderId={folder_id}"
         )
         return self._process_schema(schema, master_folder, folder_id)
 
+    def _get_folder_coercer_sync(self, master_folder: str, folder_id: str):
+        coercer = self._cached_coercer(master_folder, folder_id)
+        if coercer is None:
+            coercer = FolderCoercer(
+                self._get_folder_schema_sync(master_folder, folder_id)
+            )
+            self._cache_coercer(master_folder, folder_id, coercer)
+        return coercer
+
+    async def _get_folder_coercer_async(self, master_folder: str, folder_id: str):
+        coercer = self._cached_coercer(master_folder, folder_id)
+        if coercer is None:
+            coercer = FolderCoercer(
+                await self._get_folder_schema_async(master_folder, folder_id)
+            )
+            self._cache_coercer(master_folder, folder_id, coercer)
+        return coercer
+
+    def _cached_coercer(self, master_folder: str, folder_id: str):
+        with self._lock:
+            key = (master_folder, folder_id)
+            entry = self._coercers.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            self._coercers.move_to_end(key)
+            return entry[1]
+
+    def _cache_coercer(self, master_folder: str, folder_id: str, coercer):
+        if self.ttl:
+            key = (master_folder, folder_id)
+            with self._lock:
+                self._coercers[key] = (time.monotonic() + self.ttl, coercer)
+                self._coercers.move_to_end(key)
+                while len(self._coercers) > self.max_coercers:
+                    self._coercers.popitem(last=False)
+
+    def invalidate(self):
+        """Drops compiled folder coercers"""
+        with self._lock:
+            self._coercers.clear()
+
     def _process_schema(self, schema: list, master_folder: str, folder_id: str):
         """Get folder schema
 
@@ -164,7 +352,7 @@ class Schema:
         :returns: style folder schema
 
         """
-        return self._get_folder_schema("Style", folder_id)
+        return self.get_folder_schema("Style", folder_id)
 
     def get_material_folder_schema(self, folder_id: str):
         """Get material folder schema
@@ -173,7 +361,7 @@ class Schema:
         :returns: material folder schema
 
         """
-        return self._get_folder_schema("Material", folder_id)
+        return self.get_folder_schema("Material", folder_id)
 
     def get_color_folder_schema(self, folder_id: str):
         """Get color folder schema
@@ -182,4 +370,4 @@ class Schema:
         :returns: color folder schema
 
         """
-        return self._get_folder_schema("Color", folder_id)
+        return self.get_folder_schema("Color", folder_id)
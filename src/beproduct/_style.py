@@ -16,6 +16,7 @@ from ._common_share import ShareMixin
 from ._common_tags import TagsMixin
 
 from ._exception import BeProductException
+from ._dedup_upload import DedupUpload
 
 
 class Style(
@@ -42,7 +43,9 @@ class Style(
         :returns: Colorway schema
 
         """
-        return self.client.raw_api.get(f"Style/ColorwaySchema?folderId={folder_id}")
+        return self.client.raw_api.get_cached(
+            f"Style/ColorwaySchema?folderId={folder_id}"
+        )
 
     # ATTRIBUTES
 
@@ -305,6 +308,7 @@ class Style(
         replace_images: bool = False,
         filepath: str = None,
         fileurl: str = None,
+        dedup: DedupUpload | str = None,
     ):
         """Uploads a zipped turntable images into 3D style app version
 
@@ -313,6 +317,7 @@ class Style(
         :replace_images: Replace 3D style previews instead of adding
         :filepath: Local file path
         :fileurl: Remote file URL
+        :dedup: DedupUpload or path of its state file, skips uploaded content
         :returns: Upload ID
 
         """
@@ -323,6 +328,12 @@ class Style(
         if replace_images:
             query += "replaceImages=true&"
 
+        if filepath and dedup:
+            return DedupUpload.of(self.client, dedup).upload(
+                filepath,
+                f"Style/Header/{header_id}/Image/Upload/Turntable?"
+                + (query if query else ""),
+            )
         if filepath:
             return self.client.raw_api.upload_local_file(
                 filepath,
@@ -409,6 +420,7 @@ class Style(
         version_id: str,
         filepath: str = None,
         fileurl: str = None,
+        dedup: DedupUpload | str = None,
     ):
         """Upload a file into 3D Style version
 
@@ -417,9 +429,16 @@ class Style(
         :version_id: Version ID
         :filepath: Local file path
         :fileurl: Remote file URL
+        :dedup: DedupUpload or path of its state file, skips uploaded content
         :returns: Upload ID
 
         """
+        if filepath and dedup:
+            return DedupUpload.of(self.client, dedup).upload(
+                filepath,
+                f"Style/{header_id}/Page3DStyle/{app_id}/Version/"
+                + f"{version_id}/WorkingFile/Upload",
+            )
         if filepath:
             return self.client.raw_api.upload_local_file(
                 filepath,
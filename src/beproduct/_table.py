@@ -0,0 +1,99 @@
+"""
+File: _table.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Column-oriented tables of header lists
+"""
+
+from ._schema import FolderCoercer
+
+TABLE_OUTPUTS = ("auto", "pandas", "arrow", "dict")
+
+
+class ColumnTable:
+    """
+    Accumulates header API records into one list per column.
+    Field values are appended straight from the response, no dictionary
+    is created per row.
+    """
+
+    def __init__(
+        self, columns=None, coercer: FolderCoercer = None, output: str = "auto"
+    ):
+        """Constructor
+
+        :columns: Field IDs or top level keys (e.g. 'id', 'createdAt').
+                  Default is 'id' and every field of the coercer
+        :coercer: Compiled folder coercer converting raw values,
+                  see client.schema.get_folder_coercer
+        :output: 'pandas' DataFrame, 'arrow' Table, 'dict' of lists or
+                 'auto' for the first installed of pandas and pyarrow
+        """
+        if output not in TABLE_OUTPUTS:
+            raise ValueError(f"output must be one of {TABLE_OUTPUTS}")
+
+        coercers = coercer.fields if coercer else {}
+        if columns is None:
+            columns = ["id"] + list(coercers)
+        self.output = output
+        self.columns = list(dict.fromkeys(columns))
+        self.data = {c: [] for c in self.columns}
+        self.rows = 0
+        self._fields = {
+            c: (self.data[c], coercers.get(c, _keep)) for c in self.columns
+        }
+
+    def add(self, record: dict):
+        """Appends a header record of the API response"""
+        rows = self.rows
+        header_data = record.get("headerData") or {}
+        fields = self._fields
+
+        for field in header_data.get("fields") or ():
+            column = fields.get(field["id"])
+            if column is not None and len(column[0]) == rows:
+                column[0].append(column[1](field["value"]))
+
+        self.rows = rows = rows + 1
+        for c, (values, coerce) in fields.items():
+            if len(values) < rows:
+                # not a field of the folder: header data or top level key,
+                # e.g. 'ModifiedAt' of the schema is 'modifiedAt' of records
+                value = header_data.get(c, record.get(c))
+                if value is None and c[:1].isupper():
+                    value = record.get(c[0].lower() + c[1:])
+                values.append(None if value is None else coerce(value))
+
+    def extend(self, records):
+        """Appends header records"""
+        for record in records:
+            self.add(record)
+        return self
+
+    def build(self):
+        """:returns: Table of the collected columns"""
+        output = self.output
+        if output in ("auto", "pandas"):
+            try:
+                import pandas
+            except ImportError:
+                if output == "pandas":
+                    raise
+            else:
+                return pandas.DataFrame(self.data, columns=self.columns)
+
+        if output in ("auto", "arrow"):
+            try:
+                import pyarrow
+            except ImportError:
+                if output == "arrow":
+                    raise
+            else:
+                return pyarrow.table(self.data)
+
+        return self.data
+
+
+def _keep(value):
+    return value
@@ -6,6 +6,7 @@ Github: https://github.com/BeProduct
 Description: BeProduct Public API Traking methods
 """
 
+from functools import partial
 from .sdk import BeProduct
 
 
@@ -22,24 +23,37 @@ class Tracking:
         :returns: List of tracking folder objects
 
         """
-        return self.client.raw_api.get("Tracking/Folders")
-
-    def plan_list(self, filters=None, folder_id: str = None):
+        return self.client.raw_api.get_cached("Tracking/Folders")
+
+    def plan_list(
+        self,
+        filters=None,
+        folder_id: str = None,
+        prefetch: int = 0,
+        stream: bool = False,
+    ):
         """Returns plan list and performs filtering
             if necessary
 
         :filters: List of plan filters to apply search
         :folder_id: Folder ID if search needs to be within a forler
+        :prefetch: Number of pages to fetch ahead concurrently
+        :stream: Decode records while a page is read instead of the whole page
         :returns: List of plans
 
         """
+        post = self.client.raw_api.post
+        if stream:
+            post = partial(self.client.raw_api.post_stream, key="result")
+
         return self.client.beproduct_paging_iterator(
             30,
-            lambda psize, pnum: self.client.raw_api.post(
+            lambda psize, pnum: post(
                 f"Tracking/Plans?folderId={folder_id}"
                 + f"&pageSize={psize}&pageNumber={pnum}",
                 body={"filters": filters, "colorwayFilters": []},
             ),
+            prefetch=prefetch,
         )
 
     def plan_get(self, plan_id: str):
@@ -51,45 +65,68 @@ class Tracking:
         """
         return self.client.raw_api.post(f"Tracking/Plan/{plan_id}", body={})
 
-    def plan_style_timeline_list(self, plan_id: str, filters=None):
+    def plan_style_timeline_list(
+        self, plan_id: str, filters=None, prefetch: int = 0, stream: bool = False
+    ):
         """Returns a list of style timeline records from specific plan
            Filtering is applied if specified
 
         :plan_id: Plan ID
         :filters: Filters
+        :prefetch: Number of pages to fetch ahead concurrently
+        :stream: Decode records while a page is read instead of the whole page
         :returns: List of Style Timeline records
 
         """
+        post = self.client.raw_api.post
+        if stream:
+            post = partial(self.client.raw_api.post_stream, key="result")
+
         return self.client.beproduct_paging_iterator(
             20,
-            lambda psize, pnum: self.client.raw_api.post(
+            lambda psize, pnum: post(
                 f"Tracking/Plan/{plan_id}/Style/Timeline"
                 + f"?pageSize={psize}&pageNumber={pnum}",
                 body={
                     "filters": filters,
                 },
             ),
+            prefetch=prefetch,
         )
 
-    def plan_style_tracking_view(self, plan_id: str, view_id: str, filters=None):
+    def plan_style_tracking_view(
+        self,
+        plan_id: str,
+        view_id: str,
+        filters=None,
+        prefetch: int = 0,
+        stream: bool = False,
+    ):
         """Returns a list of style timeline records from specific plan
            Filtering is applied if specified
 
         :plan_id: Plan ID
         :view_id: Tracking view ID
         :filters: Filters
+        :prefetch: Number of pages to fetch ahead concurrently
+        :stream: Decode records while a page is read instead of the whole page
         :returns: List of Style Timeline records
 
         """
+        post = self.client.raw_api.post
+        if stream:
+            post = partial(self.client.raw_api.post_stream, key="result")
+
         return self.client.beproduct_paging_iterator(
             20,
-            lambda psize, pnum: self.client.raw_api.post(
+            lambda psize, pnum: post(
                 f"Tracking/Plan/{plan_id}/Style/View/{view_id}"
                 + f"?pageSize={psize}&pageNumber={pnum}",
                 body={
                     "filters": filters,
                 },
             ),
+            prefetch=prefetch,
         )
 
     def plan_style_timeline_update(self, plan_id: str, timelines):
@@ -104,45 +141,68 @@ class Tracking:
             f"Tracking/Plan/{plan_id}/Style/Timelines/Edit", body=timelines
         )
 
-    def plan_material_timeline_list(self, plan_id: str, filters=None):
+    def plan_material_timeline_list(
+        self, plan_id: str, filters=None, prefetch: int = 0, stream: bool = False
+    ):
         """Returns a list of material plan timeline records from specific plan
            Filtering is applied if specified
 
         :plan_id: Plan ID
         :filters: Filters
+        :prefetch: Number of pages to fetch ahead concurrently
+        :stream: Decode records while a page is read instead of the whole page
         :returns: List of Material Timeline records
 
         """
+        post = self.client.raw_api.post
+        if stream:
+            post = partial(self.client.raw_api.post_stream, key="result")
+
         return self.client.beproduct_paging_iterator(
             20,
-            lambda psize, pnum: self.client.raw_api.post(
+            lambda psize, pnum: post(
                 f"Tracking/Plan/{plan_id}/Material/Timeline"
                 + f"?pageSize={psize}&pageNumber={pnum}",
                 body={
                     "filters": filters,
                 },
             ),
+            prefetch=prefetch,
         )
 
-    def plan_material_tracking_view(self, plan_id: str, view_id: str, filters=None):
+    def plan_material_tracking_view(
+        self,
+        plan_id: str,
+        view_id: str,
+        filters=None,
+        prefetch: int = 0,
+        stream: bool = False,
+    ):
         """Returns a list of material timeline records from specific plan
            Filtering is applied if specified
 
         :plan_id: Plan ID
         :view_id: Tracking view ID
         :filters: Filters
+        :prefetch: Number of pages to fetch ahead concurrently
+        :stream: Decode records while a page is read instead of the whole page
         :returns: List of Style Timeline records
 
         """
+        post = self.client.raw_api.post
+        if stream:
+            post = partial(self.client.raw_api.post_stream, key="result")
+
         return self.client.beproduct_paging_iterator(
             20,
-            lambda psize, pnum: self.client.raw_api.post(
+            lambda psize, pnum: post(
                 f"Tracking/Plan/{plan_id}/Material/View/{view_id}"
                 + f"?pageSize={psize}&pageNumber={pnum}",
                 body={
                     "filters": filters,
                 },
             ),
+            prefetch=prefetch,
         )
 
     def plan_material_timeline_update(self, plan_id: str, timelines):
@@ -0,0 +1,201 @@
+"""
+File: _upload_status.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Shared polling of upload processing status
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class _Polls:
+    """
+    Upload IDs waiting for processing, ordered by the time of the next
+    status request. Intervals of every ID grow exponentially.
+    """
+
+    def __init__(self, interval: float, max_interval: float, timeout: float = None):
+        """Constructor
+
+        :interval: Seconds before the first status request of an upload
+        :max_interval: Status requests of an upload are never less frequent
+        :timeout: Default seconds of processing after which polling stops.
+                  None polls until the upload is processed
+        """
+        self.interval = interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self._heap = []
+        self._order = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add(self, key, upload_id: str, timeout: float = None):
+        """Schedules the first status request of the upload"""
+        now = time.monotonic()
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None if timeout is None else now + timeout
+        self._push(now + self.interval, (key, upload_id, self.interval, deadline))
+
+    def again(self, poll) -> bool:
+        """Schedules the next status request, False after the timeout"""
+        key, upload_id, interval, deadline = poll
+        now = time.monotonic()
+        if deadline is not None and now >= deadline:
+            return False
+        interval = min(interval * 2, self.max_interval)
+        self._push(now + interval, (key, upload_id, interval, deadline))
+        return True
+
+    def _push(self, due: float, poll):
+        heapq.heappush(self._heap, (due, next(self._order), poll))
+
+    def due(self, limit: int):
+        """Pops up to `limit` polls whose time has come"""
+        now = time.monotonic()
+        polls = []
+        while self._heap and len(polls) < limit and self._heap[0][0] <= now:
+            polls.append(heapq.heappop(self._heap)[2])
+        return polls
+
+    def wait_time(self):
+        """Seconds until the next poll is due, None if nothing is polled"""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+
+class UploadStatusPoller:
+    """
+    One polling loop for any number of uploads waiting for processing.
+
+    Every upload ID gets a future resolved with the status tuple
+    (finished, error_occurred, message) once it is processed. Status
+    requests start after `interval` seconds, back off up to
+    `max_interval`, and at most `concurrency` of them are in flight.
+    An upload that is processed or whose future was cancelled is not
+    polled anymore.
+    """
+
+    def __init__(
+        self,
+        upload_status,
+        interval: float = 0.5,
+        max_interval: float = 10.0,
+        concurrency: int = 8,
+    ):
+        """Constructor
+
+        :upload_status: Coroutine function of an upload ID returning the
+                        status tuple, e.g. RawApiAsync.upload_status
+        :interval: Seconds before the first status request of an upload
+        :max_interval: Status requests of an upload are never less frequent
+        :concurrency: Number of status requests in flight
+        """
+        self.upload_status = upload_status
+        self.concurrency = max(1, concurrency)
+        self._polls = _Polls(interval, max_interval)
+        self._futures = {}
+        self._wakeup = None
+        self._task = None
+
+    def __len__(self):
+        """Number of uploads being waited for"""
+        return len(self._futures)
+
+    def watch(self, upload_id: str, timeout: float = None) -> asyncio.Future:
+        """
+        Starts waiting for the upload, must be called inside the event loop.
+        An upload already waited for returns the same future.
+
+        :upload_id: Upload ID
+        :timeout: Seconds after which the future raises asyncio.TimeoutError.
+                  None waits until the upload is processed
+        :returns: Future of the status tuple
+        """
+        future = self._futures.get(upload_id)
+        if future is not None and not future.done():
+            return future
+
+        future = asyncio.get_running_loop().create_future()
+        self._futures[upload_id] = future
+        self._polls.add(future, upload_id, timeout)
+
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+        else:
+            self._wakeup.set()
+        return future
+
+    def close(self):
+        """Stops polling, futures still waited for are cancelled"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._polls = _Polls(self._polls.interval, self._polls.max_interval)
+
+    def _watched(self, poll):
+        """:returns: Future of the poll, None if it was cancelled or replaced"""
+        future, upload_id = poll[0], poll[1]
+        if future.done() or self._futures.get(upload_id) is not future:
+            if self._futures.get(upload_id) is future:
+                del self._futures[upload_id]
+            return None
+        return future
+
+    async def _run(self):
+        requests = {}
+        try:
+            while self._polls or requests:
+                limit = self.concurrency - len(requests)
+                for poll in self._polls.due(limit):
+                    if self._watched(poll) is not None:
+                        task = asyncio.ensure_future(self.upload_status(poll[1]))
+                        requests[task] = poll
+
+                # at capacity the next due poll waits for a request to finish
+                full = len(requests) >= self.concurrency
+                self._wakeup.clear()
+                waiting = set(requests)
+                wakeup = asyncio.ensure_future(self._wakeup.wait())
+                waiting.add(wakeup)
+                done, _ = await asyncio.wait(
+                    waiting,
+                    timeout=None if full else self._polls.wait_time(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                wakeup.cancel()
+
+                for task in done:
+                    if task is not wakeup:
+                        self._resolve(requests.pop(task), task)
+        finally:
+            for task in requests:
+                task.cancel()
+
+    def _resolve(self, poll, task: asyncio.Future):
+        future = self._watched(poll)
+        if future is None:
+            return
+
+        upload_id = poll[1]
+        if task.exception() is not None:
+            future.set_exception(task.exception())
+        elif task.result()[0]:
+            future.set_result(task.result())
+        elif self._polls.again(poll):
+            return
+        else:
+            future.set_exception(
+                asyncio.TimeoutError(f"Upload {upload_id} is still processing")
+            )
+        del self._futures[upload_id]
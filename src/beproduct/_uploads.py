@@ -0,0 +1,270 @@
+"""
+File: _uploads.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Bulk uploads with shared processing status polling
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from .sdk import BeProduct, BeProductAsync
+from ._upload_status import _Polls
+
+
+class UploadJob:
+    """Upload of a file by an upload method, e.g. client.style.attributes_upload"""
+
+    __slots__ = ("method", "header_id", "source", "kwargs")
+
+    def __init__(self, method, header_id: str, source: str, **kwargs):
+        """Constructor
+
+        :method: Upload method taking header_id, filepath and fileurl
+        :header_id: ID of the Style, Material etc
+        :source: Local file path or remote file URL
+        :**kwargs: Additional arguments of the method, e.g. colorway_id
+        """
+        self.method = method
+        self.header_id = header_id
+        self.source = source
+        self.kwargs = kwargs
+
+    @classmethod
+    def of(cls, job):
+        """:job: UploadJob or tuple (method, header_id, source[, kwargs])"""
+        if isinstance(job, cls):
+            return job
+        method, header_id, source, *kwargs = job
+        return cls(method, header_id, source, **(kwargs[0] if kwargs else {}))
+
+    def __call__(self):
+        """Starts the upload"""
+        if self.source.startswith(("http://", "https://")):
+            return self.method(self.header_id, fileurl=self.source, **self.kwargs)
+        return self.method(self.header_id, filepath=self.source, **self.kwargs)
+
+    def __repr__(self):
+        name = getattr(self.method, "__name__", self.method)
+        return f"<UploadJob: {name} {self.header_id} {self.source!r}>"
+
+
+class UploadEvent:
+    """Outcome of an upload job"""
+
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    __slots__ = ("job", "status", "upload_id", "message", "error")
+
+    def __init__(
+        self,
+        job: UploadJob,
+        status: str,
+        upload_id: str = None,
+        message: str = None,
+        error: Exception = None,
+    ):
+        self.job = job
+        self.status = status
+        self.upload_id = upload_id
+        self.message = message
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.status == self.COMPLETED
+
+    def __repr__(self):
+        return f"<UploadEvent: {self.status} {self.upload_id} {self.job!r}>"
+
+
+def _upload_id(result):
+    """Upload ID of an upload method result"""
+    if isinstance(result, Exception):
+        # upload methods return the exception when no file is provided
+        raise result
+    if isinstance(result, dict):
+        return result.get("imageId")
+    return result
+
+
+class UploadManager:
+    """
+    Uploads many files with bounded concurrency and waits for their
+    processing at BeProduct.
+
+    Uploaded IDs are checked with Style/GetImageProcessingStatus by one
+    scheduler loop: every ID is polled with an interval doubling from
+    `poll_interval` to `max_poll_interval`, and the number of status
+    requests in flight is bounded. Events are yielded as uploads finish,
+    not in the order of the jobs.
+    """
+
+    def __init__(
+        self,
+        client: BeProduct | BeProductAsync,
+        concurrency: int = 8,
+        status_concurrency: int = 8,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+        timeout: float = 600.0,
+    ):
+        """Constructor
+
+        :client: BeProduct client
+        :concurrency: Number of uploads running at the same time
+        :status_concurrency: Number of status requests running at the same time
+        :poll_interval: Seconds before the first status request of an upload
+        :max_poll_interval: Status requests of an upload are never less frequent
+        :timeout: Seconds of processing after which an upload fails
+        """
+        self.client = client
+        self.concurrency = max(1, concurrency)
+        self.status_concurrency = max(1, status_concurrency)
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+        self.queue = deque()
+
+        if isinstance(client, BeProductAsync):
+            self.run = self._run_async
+        else:
+            self.run = self._run_sync
+
+    def submit(self, method, header_id: str, source: str, **kwargs) -> UploadJob:
+        """
+        Adds an upload job to the queue
+
+        :method: Upload method, e.g. client.style.attributes_upload
+        :header_id: ID of the Style, Material etc
+        :source: Local file path or remote file URL
+        :**kwargs: Additional arguments of the method, e.g. colorway_id
+        :returns: UploadJob
+        """
+        job = UploadJob(method, header_id, source, **kwargs)
+        self.queue.append(job)
+        return job
+
+    def _polls(self) -> _Polls:
+        return _Polls(self.poll_interval, self.max_poll_interval, self.timeout)
+
+    def _jobs(self, jobs):
+        queue = self.queue
+        if jobs is not None:
+            queue.extend(UploadJob.of(job) for job in jobs)
+        return queue
+
+    def _run_sync(self, jobs=None):
+        """
+        Generator of UploadEvent of the queued jobs and `jobs`.
+        With BeProductAsync it is an async generator.
+
+        :jobs: Iterable of UploadJob or tuples (method, header_id, source[, kwargs])
+        """
+        queue = self._jobs(jobs)
+        polls = self._polls()
+        uploads = {}
+        statuses = {}
+        executor = ThreadPoolExecutor(
+            max_workers=self.concurrency + self.status_concurrency
+        )
+        raw_api = self.client.raw_api
+
+        try:
+            while queue or uploads or statuses or polls:
+                while queue and len(uploads) < self.concurrency:
+                    job = queue.popleft()
+                    uploads[executor.submit(job)] = job
+                limit = self.status_concurrency - len(statuses)
+                for poll in polls.due(limit):
+                    statuses[executor.submit(raw_api.upload_status, poll[1])] = poll
+
+                futures = list(uploads) + list(statuses)
+                if not futures:
+                    time.sleep(polls.wait_time())
+                    continue
+                timeout = self._wait_time(polls, statuses)
+                done, _ = wait(futures, timeout, FIRST_COMPLETED)
+
+                for future in done:
+                    if future in uploads:
+                        event = self._uploaded(uploads.pop(future), future, polls)
+                    else:
+                        event = self._polled(statuses.pop(future), future, polls)
+                    if event:
+                        yield event
+        finally:
+            for future in list(uploads) + list(statuses):
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    async def _run_async(self, jobs=None):
+        queue = self._jobs(jobs)
+        polls = self._polls()
+        uploads = {}
+        statuses = {}
+        raw_api = self.client.raw_api
+
+        try:
+            while queue or uploads or statuses or polls:
+                while queue and len(uploads) < self.concurrency:
+                    job = queue.popleft()
+                    uploads[asyncio.ensure_future(job())] = job
+                limit = self.status_concurrency - len(statuses)
+                for poll in polls.due(limit):
+                    task = asyncio.ensure_future(raw_api.upload_status(poll[1]))
+                    statuses[task] = poll
+
+                tasks = list(uploads) + list(statuses)
+                if not tasks:
+                    await asyncio.sleep(polls.wait_time())
+                    continue
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=self._wait_time(polls, statuses),
+                    return_when=FIRST_COMPLETED,
+                )
+
+                for task in done:
+                    if task in uploads:
+                        event = self._uploaded(uploads.pop(task), task, polls)
+                    else:
+                        event = self._polled(statuses.pop(task), task, polls)
+                    if event:
+                        yield event
+        finally:
+            for task in list(uploads) + list(statuses):
+                task.cancel()
+
+    def _wait_time(self, polls: _Polls, statuses: dict):
+        # at capacity the next due poll waits for a status request to finish
+        if len(statuses) >= self.status_concurrency:
+            return None
+        return polls.wait_time()
+
+    def _uploaded(self, job: UploadJob, future, polls: _Polls):
+        try:
+            upload_id = _upload_id(future.result())
+        except Exception as e:
+            return UploadEvent(job, UploadEvent.FAILED, message=str(e), error=e)
+        if not upload_id:
+            # e.g. attachments are effective once the upload call is finished
+            return UploadEvent(job, UploadEvent.COMPLETED)
+        polls.add(job, upload_id)
+        return None
+
+    def _polled(self, poll, future, polls: _Polls):
+        job, upload_id = poll[0], poll[1]
+        try:
+            finished, error_occurred, message = future.result()
+        except Exception as e:
+            return UploadEvent(job, UploadEvent.FAILED, upload_id, str(e), e)
+        if finished:
+            status = UploadEvent.FAILED if error_occurred else UploadEvent.COMPLETED
+            return UploadEvent(job, status, upload_id, message)
+        if polls.again(poll):
+            return None
+        return UploadEvent(job, UploadEvent.FAILED, upload_id, "Processing timed out")
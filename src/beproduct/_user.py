@@ -61,7 +61,7 @@ class User:
         :returns: List of exising user roles
 
         """
-        return self.client.raw_api.get('Users/Roles')
+        return self.client.raw_api.get_cached('Users/Roles')
 
     def role_get(self, user_id: str):
         """ Returns user's role
@@ -1,12 +1,16 @@
+import asyncio
+import logging
+import threading
+import aiohttp
 from functools import wraps
 from json import loads
-from datetime import datetime, timedelta
-import datetime as dt
-from time import mktime, time
+from time import monotonic, time
 
 from urllib.parse import urlencode, parse_qsl
 from urllib.request import urlopen
 
+from ._exception import BeProductException
+
 
 class OAuth2Client(object):
     """OAuth 2.0 client object"""
@@ -17,6 +21,7 @@ class OAuth2Client(object):
         token_endpoint=None,
         client_id=None,
         client_secret=None,
+        proactive_refresh=60,
     ):
         """Instantiates a `OAuth2Client` to authorize and authenticate a user
         :param auth_endpoint: The authorization endpoint as issued by the
@@ -28,16 +33,40 @@ class OAuth2Client(object):
         :param client_id: The client ID as issued by the provider.
         :param client_secret: The client secret as issued by the provider. This
                               must not be shared.
+        :param proactive_refresh: Seconds before expiry when the token is
+                                  refreshed in background while the current
+                                  one is still handed out.
         """
 
         self.auth_endpoint = auth_endpoint
         self.token_endpoint = token_endpoint
         self.client_id = client_id
         self.client_secret = client_secret
+        self.proactive_refresh = proactive_refresh
         self.access_token = None
-        self.token_expires = -1
         self.refresh_token = None
 
+        # expiry is tracked on the monotonic clock, so wall clock changes
+        # don't affect it and checking it is a single float comparison
+        self._expires_at = float("-inf")
+
+        # single-flight refresh: one refresh in flight, others wait on it
+        self._refresh_lock = threading.Lock()
+        self._refresh_task = None
+
+    @property
+    def token_expires(self):
+        """Token expiration time as a unix timestamp"""
+        return time() + (self._expires_at - monotonic())
+
+    @token_expires.setter
+    def token_expires(self, value):
+        self._expires_at = monotonic() + (value - time())
+
+    def set_expires_in(self, seconds):
+        """Sets token expiration `seconds` from now (minus 5 min safety gap)"""
+        self._expires_at = monotonic() + int(seconds) - 300.0
+
     def auth_uri(
         self, redirect_uri=None, scope=None, scope_delim=None, state=None, **kwargs
     ):
@@ -90,9 +119,18 @@ class OAuth2Client(object):
         :param parser: Callback to deal with returned data. Not all providers
                        use JSON.
         """
+        parser = parser or _default_parser
+        kwargs = self._token_request_params(redirect_uri, **kwargs)
+
+        # TODO: maybe raise an exception here if status code isn't 200?
+        msg = urlopen(self.token_endpoint, urlencode(kwargs).encode("utf-8"))
+        data = parser(msg.read().decode(msg.info().get_content_charset() or "utf-8"))
+
+        self._apply_token_data(data)
+
+    def _token_request_params(self, redirect_uri=None, **kwargs):
         kwargs = kwargs and kwargs or {}
 
-        parser = parser or _default_parser
         kwargs.update(
             {
                 "client_id": self.client_id,
@@ -104,26 +142,48 @@ class OAuth2Client(object):
         )
         if redirect_uri is not None:
             kwargs.update({"redirect_uri": redirect_uri})
+        return kwargs
 
-        # TODO: maybe raise an exception here if status code isn't 200?
-        msg = urlopen(self.token_endpoint, urlencode(kwargs).encode("utf-8"))
-        data = parser(msg.read().decode(msg.info().get_content_charset() or "utf-8"))
-
+    def _apply_token_data(self, data):
         for key in data:
             setattr(self, key, data[key])
 
         # expires_in is RFC-compliant. if anything else is used by the
         # provider, token_expires must be set manually
         if hasattr(self, "expires_in"):
-            seconds = int(self.expires_in)
-            self.token_expires = (
-                mktime((datetime.now(dt.UTC) + timedelta(seconds=seconds)).timetuple())
-                - 300.0
-            )  # 5 min before
+            self.set_expires_in(self.expires_in)
 
     def refresh(self):
         self.request_token(refresh_token=self.refresh_token, grant_type="refresh_token")
 
+    def _is_valid(self):
+        return self.access_token and monotonic() < self._expires_at
+
+    def _refresh_if_expired(self):
+        """Refreshes the token unless another thread has just done it"""
+        with self._refresh_lock:
+            if not self._is_valid():
+                self.refresh()
+
+    def _refresh_in_background(self):
+        """Starts a background refresh unless one is already in flight"""
+        if not self.refresh_token or not self._refresh_lock.acquire(blocking=False):
+            return
+
+        def _refresh():
+            try:
+                self.refresh()
+            except Exception as e:
+                # the token is still valid, the next call will try again
+                logging.warning(f"Background token refresh failed: {e}")
+            finally:
+                self._refresh_lock.release()
+
+        threading.Thread(target=_refresh, daemon=True).start()
+
+    def _is_close_to_expiry(self):
+        return monotonic() >= self._expires_at - self.proactive_refresh
+
     def get_access_token(self):
         """Returns access token
         Autorefresh is performed if necessary
@@ -131,16 +191,129 @@ class OAuth2Client(object):
         :returns: Access token
 
         """
-        if not self.access_token or self.token_expires < mktime(
-            datetime.now(dt.UTC).timetuple()
+        if self._is_valid():
+            if self._is_close_to_expiry():
+                self._refresh_in_background()
+            return self.access_token
+
+        self._refresh_if_expired()
+        return self.access_token
+
+    async def get_access_token_async(self):
+        """Returns access token without blocking the event loop
+        Concurrent coroutines share a single refresh
+
+        :returns: Access token
+
+        """
+        if self._is_valid():
+            if self._is_close_to_expiry():
+                self._refresh_in_background()
+            return self.access_token
+
+        loop = asyncio.get_running_loop()
+        if (
+            self._refresh_task is None
+            or self._refresh_task.done()
+            or self._refresh_task.get_loop() is not loop
+        ):
+            self._refresh_task = loop.create_task(self._refresh_async())
+
+        # shielded, so a cancelled caller doesn't cancel others' refresh
+        await asyncio.shield(self._refresh_task)
+        return self.access_token
+
+    async def _refresh_async(self):
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._refresh_if_expired
+        )
+
+
+class AsyncOAuth2Client(OAuth2Client):
+    """OAuth 2.0 client refreshing tokens without blocking the event loop"""
+
+    def __init__(self, *args, session_provider=None, **kwargs):
+        """Instantiates a `AsyncOAuth2Client`
+        Accepts the same parameters as `OAuth2Client` and
+        :param session_provider: Callable returning the aiohttp session used
+                                 to call the token endpoint. A temporary
+                                 session is used if not provided.
+        """
+        super().__init__(*args, **kwargs)
+        self.session_provider = session_provider
+
+    async def _post_token_endpoint(self, params):
+        """Posts form params to the token endpoint
+        Raises BeProductException if the endpoint does not answer 2xx,
+        as urlopen of the sync client raises HTTPError
+
+        :returns: Response body as text
+        """
+        session = self.session_provider() if self.session_provider else None
+        if session is None:
+            async with aiohttp.ClientSession() as session:
+                return await self._post_token_request(session, params)
+        return await self._post_token_request(session, params)
+
+    async def _post_token_request(self, session, params):
+        async with session.post(self.token_endpoint, data=params) as msg:
+            body = await msg.text()
+            if not 200 <= msg.status < 300:
+                raise BeProductException(
+                    "Token request failed. Details: \n"
+                    + f"URL: {self.token_endpoint} \n"
+                    + f"Status code: {msg.status} \n"
+                    + f"Response body: {body} \n"
+                )
+            return body
+
+    async def request_token_async(self, parser=None, redirect_uri=None, **kwargs):
+        """Request an access token from the token endpoint.
+        Async version of `request_token`
+        """
+        parser = parser or _default_parser
+        params = self._token_request_params(redirect_uri, **kwargs)
+        self._apply_token_data(parser(await self._post_token_endpoint(params)))
+
+    async def refresh_async(self):
+        await self.request_token_async(
+            refresh_token=self.refresh_token, grant_type="refresh_token"
+        )
+
+    def _start_refresh(self):
+        """Returns the refresh task in flight or starts a new one"""
+        loop = asyncio.get_running_loop()
+        if (
+            self._refresh_task is None
+            or self._refresh_task.done()
+            or self._refresh_task.get_loop() is not loop
         ):
-            self.request_token(
-                grant_type="refresh_token", refresh_token=self.refresh_token
-            )
+            self._refresh_task = loop.create_task(self.refresh_async())
+            self._refresh_task.add_done_callback(_log_refresh_error)
+        return self._refresh_task
 
+    async def get_access_token_async(self):
+        """Returns access token
+        Concurrent coroutines are coalesced into a single refresh
+
+        :returns: Access token
+
+        """
+        if self._is_valid():
+            if self._is_close_to_expiry() and self.refresh_token:
+                self._start_refresh()
+            return self.access_token
+
+        # shielded, so a cancelled caller doesn't cancel others' refresh
+        await asyncio.shield(self._start_refresh())
         return self.access_token
 
 
+def _log_refresh_error(task):
+    if not task.cancelled() and task.exception():
+        logging.warning(f"Token refresh failed: {task.exception()}")
+
+
 def _default_parser(data):
     try:
         return loads(data)
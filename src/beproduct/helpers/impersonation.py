@@ -7,75 +7,101 @@ Description: BeProduct Helpers for Impersonation
 """
 
 import os
-import datetime
-import time
 import json
-from beproduct.sdk import BeProduct
-from beproduct.auth import OAuth2Client
+from beproduct.sdk import BeProduct, BeProductAsync
+from beproduct.auth import OAuth2Client, AsyncOAuth2Client
 
 
 def impersonated(
-    client: BeProduct,
+    client: BeProduct | BeProductAsync,
     *,
     user_id,
     impersonation_client_id=None,
     impersonation_client_secret=None
-) -> BeProduct:
+) -> BeProduct | BeProductAsync:
 
     """
     Returns new client that impersonates a different user.
     Impersonating user must be an admin in the company where
     impersonated user registered as a PRIVATE user.
+    The new client is async if the provided client is async.
     """
 
-    def _get_access_token(self):
-        if not self.access_token or self.token_expires < time.time():
-            self.request_token(
+    def _actas_request(self, admin_access_token):
+        return {
+            "client_id": impersonation_client_id
+            or os.environ["BEPRODUCT_IMPERSONATION_CLIENT_ID"],
+            "client_secret": impersonation_client_secret
+            or os.environ["BEPRODUCT_IMPERSONATION_SECRET"],
+            "grant_type": "actas",
+            "token": admin_access_token,
+            "actas": self.impersonate_userid,
+            "scope": "openid profile email roles offline_access BeProductPublicApi",
+        }
+
+    def _apply_actas_response(self, data):
+        self.access_token = data["access_token"]
+        self.expires_in = data["expires_in"]
+
+        if "expires_in" in data:
+            self.set_expires_in(self.expires_in)  # 5 min before
+
+    def _admin_client(self):
+        # the admin token is requested on a separate client, so the current
+        # impersonated token keeps being handed out until it is replaced
+        admin_client = type(self)(
+            token_endpoint=self.token_endpoint,
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+        )
+        admin_client.refresh_token = self.refresh_token
+        if isinstance(self, AsyncOAuth2Client):
+            admin_client.session_provider = self.session_provider
+        return admin_client
+
+    def _refresh(self):
+        if not (hasattr(self, "impersonate_userid") and self.impersonate_userid):
+            return self.request_token(
+                grant_type="refresh_token", refresh_token=self.refresh_token,
+            )
+
+        admin_client = _admin_client(self)
+        admin_client.refresh()
+        self.refresh_token = admin_client.refresh_token
+
+        request = _actas_request(self, admin_client.access_token)
+
+        import urllib
+
+        msg = urllib.request.urlopen(
+            self.token_endpoint,
+            urllib.parse.urlencode(request).encode("utf-8"),
+        )
+        data = json.loads(
+            msg.read().decode(msg.info().get_content_charset() or "utf-8")
+        )
+
+        _apply_actas_response(self, data)
+
+    async def _refresh_async(self):
+        if not (hasattr(self, "impersonate_userid") and self.impersonate_userid):
+            return await self.request_token_async(
                 grant_type="refresh_token", refresh_token=self.refresh_token,
             )
-            if hasattr(self, "impersonate_userid") and self.impersonate_userid:
-                request = {
-                    "client_id": impersonation_client_id
-                    or os.environ["BEPRODUCT_IMPERSONATION_CLIENT_ID"],
-                    "client_secret": impersonation_client_secret
-                    or os.environ["BEPRODUCT_IMPERSONATION_SECRET"],
-                    "grant_type": "actas",
-                    "token": self.access_token,
-                    "actas": self.impersonate_userid,
-                    "scope": "openid profile email roles offline_access BeProductPublicApi",
-                }
-
-                import urllib
-
-                msg = urllib.request.urlopen(
-                    self.token_endpoint,
-                    urllib.parse.urlencode(request).encode("utf-8"),
-                )
-                data = json.loads(
-                    msg.read().decode(msg.info().get_content_charset() or "utf-8")
-                )
-
-                self.access_token = data["access_token"]
-                self.expires_in = data["expires_in"]
-
-                if "expires_in" in data:
-                    seconds = int(self.expires_in)
-                    self.token_expires = (
-                        time.mktime(
-                            (
-                                datetime.datetime.utcnow()
-                                + datetime.timedelta(seconds=seconds)
-                            ).timetuple()
-                        )
-                        - 300.0
-                    )  # 5 min before
-
-        return self.access_token
+
+        admin_client = _admin_client(self)
+        await admin_client.refresh_async()
+        self.refresh_token = admin_client.refresh_token
+
+        request = _actas_request(self, admin_client.access_token)
+        data = json.loads(await self._post_token_endpoint(request))
+
+        _apply_actas_response(self, data)
 
     if not user_id:
         raise ValueError("user_id must be provided")
 
-    impersonated_client = BeProduct(
+    impersonated_client = type(client)(
         client_id=client.oauth2_client.client_id,
         client_secret=client.oauth2_client.client_secret,
         refresh_token=client.oauth2_client.refresh_token,
@@ -85,9 +111,15 @@ def impersonated(
 
     impersonated_client.public_api_url = client.public_api_url
     impersonated_client.automation_api_url = client.automation_api_url
+    # both clients share the same API quota
+    impersonated_client.rate_limiter = client.rate_limiter
 
-    impersonated_client.oauth2_client.get_access_token = _get_access_token.__get__(
-        impersonated_client.oauth2_client, OAuth2Client
-    )
-    impersonated_client.oauth2_client.impersonate_userid = user_id
+    # refresh is called under the client's single-flight lock / task
+    oauth2_client = impersonated_client.oauth2_client
+    oauth2_client.refresh = _refresh.__get__(oauth2_client, OAuth2Client)
+    if isinstance(oauth2_client, AsyncOAuth2Client):
+        oauth2_client.refresh_async = _refresh_async.__get__(
+            oauth2_client, AsyncOAuth2Client
+        )
+    oauth2_client.impersonate_userid = user_id
     return impersonated_client
@@ -0,0 +1,299 @@
+"""
+File: mirror.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Local SQLite mirror of headers answering list filters offline
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import timezone
+from functools import partial
+from beproduct.sdk import BeProductAsync
+from beproduct._json import DEFAULT_CODEC
+from beproduct._sync import IncrementalSync, SyncState, _utc
+from beproduct.helpers.parsers import dict_to_eq_filter_parser
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS headers (
+    id TEXT PRIMARY KEY,
+    master_folder TEXT NOT NULL,
+    folder_id TEXT,
+    modified_at TEXT,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS headers_folder ON headers (master_folder, folder_id);
+CREATE TABLE IF NOT EXISTS field_values (
+    header_id TEXT NOT NULL,
+    field_id TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS field_values_lookup ON field_values (field_id, value);
+CREATE INDEX IF NOT EXISTS field_values_header ON field_values (header_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+#: Separator of list values in filters, see dict_to_eq_filter_parser
+LIST_SEPARATOR = "■"
+
+
+def _timestamp(value):
+    """
+    modifiedAt as UTC ISO string, comparable as text.
+    Raises ValueError if a value is set but is not a date.
+    """
+    modified = _utc(value)
+    return modified.astimezone(timezone.utc).isoformat() if modified else None
+
+
+def _like(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class _MirrorSyncState(SyncState):
+    """Sync marks saved in the mirror database with the headers"""
+
+    def __init__(self, mirror):
+        self.path = None
+        self._mirror = mirror
+        self._lock = mirror._lock
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._mirror._conn.execute(
+                "SELECT value FROM sync_state WHERE key = ?", (key,)
+            ).fetchone()
+        return self._mirror.codec.loads(row[0]) if row else None
+
+    def set(self, key: str, value):
+        conn = self._mirror._conn
+        with self._lock:
+            if value is None:
+                conn.execute("DELETE FROM sync_state WHERE key = ?", (key,))
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                    (key, self._mirror.codec.dumps_str(value)),
+                )
+            # the mark is committed together with the mirrored headers
+            conn.commit()
+
+
+class LocalMirror:
+    """
+    Headers of Style, Material, Color and Image folders kept in a local
+    SQLite database. Refreshed incrementally by ModifiedAt and queried with
+    the filters of attributes_list without calling the API.
+
+    Supported filter operators are Eq and Contains, values joined with '■'
+    match any of them (see dict_to_eq_filter_parser). 'ModifiedAt' also
+    supports Gt and Lt.
+    """
+
+    def __init__(self, path: str = ":memory:", fields=None, codec=None):
+        """Constructor
+
+        :path: SQLite database file. Default keeps the mirror in memory
+        :fields: Field IDs which can be filtered. Default is every field
+        :codec: JSON codec of stored headers. Default is the fastest installed
+        """
+        self.path = path
+        self.fields = set(fields) if fields is not None else None
+        self.codec = codec or DEFAULT_CODEC
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._state = _MirrorSyncState(self)
+
+    def close(self):
+        """Closes the database"""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # REFRESH
+
+    def refresh(self, attributes, folder_id: str, overlap: float = 300, **kwargs):
+        """Mirrors headers of the folder changed since the last refresh
+
+        :attributes: Master folder API, e.g. client.style
+        :folder_id: Folder ID
+        :overlap: Seconds re-read before the high-water mark for clock skew
+        :**kwargs: filters, page_size and prefetch of IncrementalSync
+        :returns: Number of updated headers
+
+        Note: For BeProductAsync the result has to be awaited
+        """
+        sync = IncrementalSync(attributes, folder_id, self._state, overlap, **kwargs)
+        upsert = partial(self._upsert, attributes.master_folder, folder_id)
+        if isinstance(attributes.client, BeProductAsync):
+            return self._refresh_async(sync, upsert)
+        try:
+            return sync.run(upsert)
+        finally:
+            self._conn.commit()
+
+    async def _refresh_async(self, sync, upsert):
+        try:
+            return await sync.run(upsert)
+        finally:
+            self._conn.commit()
+
+    def upsert(self, master_folder: str, records, folder_id: str = None):
+        """Stores header records, e.g. results of attributes_list
+
+        :master_folder: Master folder of the records
+        :records: Iterable of header API records
+        :folder_id: Folder ID of records without 'folder'
+        :returns: Number of stored records
+        """
+        count = 0
+        for record in records:
+            self._upsert(master_folder, folder_id, record)
+            count += 1
+        self._conn.commit()
+        return count
+
+    def _upsert(self, master_folder: str, folder_id: str, record: dict):
+        header_id = record["id"]
+        with self._lock:
+            conn = self._conn
+            conn.execute("DELETE FROM field_values WHERE header_id = ?", (header_id,))
+            if record.get("isDeleted"):
+                conn.execute("DELETE FROM headers WHERE id = ?", (header_id,))
+                return
+
+            try:
+                modified_at = _timestamp(record.get("modifiedAt"))
+            except ValueError as e:
+                logging.warning(f"Header {header_id} is stored without modifiedAt: {e}")
+                modified_at = None
+            conn.execute(
+                "INSERT OR REPLACE INTO headers "
+                "(id, master_folder, folder_id, modified_at, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    header_id,
+                    master_folder,
+                    (record.get("folder") or {}).get("id", folder_id),
+                    modified_at,
+                    self.codec.dumps(record),
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO field_values (header_id, field_id, value) "
+                "VALUES (?, ?, ?)",
+                self._field_values(header_id, record),
+            )
+
+    def _field_values(self, header_id: str, record: dict):
+        fields = self.fields
+        for field in (record.get("headerData") or {}).get("fields") or ():
+            field_id = field["id"]
+            if fields is not None and field_id not in fields:
+                continue
+            value = field["value"]
+            for v in value if isinstance(value, list) else (value,):
+                if v is None or v == "":
+                    continue
+                yield header_id, field_id, self._text(v)
+
+    def _text(self, value) -> str:
+        """Field value as stored in field_values and compared by filters"""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, dict):
+            return self.codec.dumps_str(value)
+        return str(value)
+
+    def delete(self, header_id: str):
+        """Removes a header from the mirror"""
+        self._upsert("", None, {"id": header_id, "isDeleted": True})
+        self._conn.commit()
+
+    # QUERY
+
+    def attributes_list(self, master_folder: str, folder_id: str = None, filters=None):
+        """Mirrored headers matching all filters
+
+        :master_folder: Style, Material, Color, Image...
+        :folder_id: Folder ID. Default is every folder
+        :filters: List of filter dictionaries of attributes_list or
+                  dictionary of dict_to_eq_filter_parser
+        :returns: Generator of header records
+        """
+        sql, params = self._query("h.data", master_folder, folder_id, filters)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY h.rowid", params).fetchall()
+        return (self.codec.loads(data) for (data,) in rows)
+
+    def count(self, master_folder: str, folder_id: str = None, filters=None) -> int:
+        """:returns: Number of mirrored headers matching all filters"""
+        sql, params = self._query("COUNT(*)", master_folder, folder_id, filters)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def _query(self, columns: str, master_folder: str, folder_id: str, filters):
+        if isinstance(filters, dict):
+            filters = dict_to_eq_filter_parser(filters)
+
+        where = ["h.master_folder = ?"]
+        params = [master_folder]
+        if folder_id:
+            where.append("h.folder_id = ?")
+            params.append(folder_id)
+
+        for f in filters or []:
+            condition, values = self._condition(f)
+            where.append(condition)
+            params.extend(values)
+
+        return f"SELECT {columns} FROM headers h WHERE " + " AND ".join(where), params
+
+    def _condition(self, f: dict):
+        field_id, operator, value = f["field"], f.get("operator", "Eq"), f["value"]
+        values = []
+        for v in value if isinstance(value, list) else (value,):
+            if isinstance(v, str):
+                values.extend(v.split(LIST_SEPARATOR))
+            else:
+                values.append(self._text(v))
+
+        if field_id == "ModifiedAt":
+            ops = {"Eq": "=", "Gt": ">", "Lt": "<"}
+            if operator not in ops:
+                raise ValueError(f"Unsupported ModifiedAt operator: {operator}")
+            modified = _timestamp(values[0])
+            if modified is None:
+                raise ValueError(f"Invalid ModifiedAt value: {value!r}")
+            return f"h.modified_at {ops[operator]} ?", [modified]
+
+        if self.fields is not None and field_id not in self.fields:
+            raise ValueError(f"Field '{field_id}' is not mirrored")
+
+        if operator == "Eq":
+            # case insensitive (ASCII) like LIKE of Contains
+            match = "v.value COLLATE NOCASE IN ({})".format(
+                ", ".join("?" * len(values))
+            )
+        elif operator == "Contains":
+            match = " OR ".join("v.value LIKE ? ESCAPE '\\'" for _ in values)
+            values = [_like(v) for v in values]
+        else:
+            raise ValueError(f"Unsupported operator: {operator}")
+
+        return (
+            "h.id IN (SELECT v.header_id FROM field_values v "
+            f"WHERE v.field_id = ? AND ({match}))",
+            [field_id, *values],
+        )
@@ -0,0 +1,358 @@
+"""
+File: models.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+Description: Slotted read-only views of header API responses
+"""
+
+from collections.abc import Mapping
+from .composable import composable
+
+
+def _plain(value):
+    """Dictionaries of models as dictionaries of response dictionaries"""
+    if isinstance(value, _RawModel):
+        return value.raw
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+
+class _RawModel(Mapping):
+    """Read-only view of a response dictionary. Nothing is copied"""
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, raw: dict):
+        """Constructor
+
+        :raw: Dictionary of the API response, kept as is
+        """
+        self._raw = raw
+
+    @property
+    def raw(self) -> dict:
+        """Wrapped API response"""
+        return self._raw
+
+    def __getitem__(self, key):
+        return self._raw[key]
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._raw!r})"
+
+
+class ColorwayModel(_RawModel):
+    """Colorway of a style or material"""
+
+    __slots__ = ()
+
+    @property
+    def id(self):
+        return self._raw.get("id")
+
+    @property
+    def color_number(self):
+        return self._raw.get("colorNumber")
+
+    @property
+    def color_name(self):
+        return self._raw.get("colorName")
+
+    @property
+    def primary_color(self):
+        return self._raw.get("primaryColor")
+
+    @property
+    def secondary_color(self):
+        return self._raw.get("secondaryColor")
+
+    @property
+    def hidden(self) -> bool:
+        return bool(self._raw.get("hideColorway"))
+
+    @property
+    def image(self):
+        return self._raw.get("image")
+
+    @property
+    def fields(self) -> dict:
+        return self._raw.get("fields") or {}
+
+
+class SizeModel(_RawModel):
+    """Size of a size range"""
+
+    __slots__ = ()
+
+    @property
+    def name(self):
+        return self._raw.get("name")
+
+    @property
+    def price(self):
+        return self._raw.get("price")
+
+    @property
+    def currency(self):
+        return self._raw.get("currency")
+
+    @property
+    def unit_of_measure(self):
+        return self._raw.get("unitOfMeasure")
+
+    @property
+    def is_sample_size(self) -> bool:
+        return bool(self._raw.get("isSampleSize"))
+
+    @property
+    def fields(self) -> dict:
+        return self._raw.get("fields") or {}
+
+
+class HeaderModel(Mapping):
+    """
+    Read-only view of a header API response with the keys of header_parser.
+    Field values, colorways and sizes are looked up in the wrapped response
+    on first access, values are neither copied nor sorted.
+    Fields are also available as attributes, e.g. style.season_year
+    """
+
+    __slots__ = ("_raw", "_values", "_colorways", "_size_range")
+
+    #: Response keys not exposed as top level values
+    _special = ("headerData", "colorways", "sizeRange", "sizeClasses", "tags")
+    #: Parsed keys computed by properties
+    _computed = {"colorways": "colorways"}
+
+    def __init__(self, raw: dict):
+        """Constructor
+
+        :raw: Dictionary of the header API response, kept as is
+        """
+        self._raw = raw
+        self._values = None
+        self._colorways = None
+        self._size_range = None
+
+    @property
+    def raw(self) -> dict:
+        """Wrapped API response"""
+        return self._raw
+
+    @property
+    def id(self):
+        return self._raw["id"]
+
+    @property
+    def header_number(self):
+        return self.get("headerNumber")
+
+    @property
+    def header_name(self):
+        return self.get("headerName")
+
+    @property
+    def folder(self):
+        return self._raw.get("folder")
+
+    @property
+    def created_at(self):
+        return self._raw.get("createdAt")
+
+    @property
+    def modified_at(self):
+        return self._raw.get("modifiedAt")
+
+    @property
+    def colorways(self) -> dict:
+        """Dictionary of colorway number to ColorwayModel"""
+        if self._colorways is None:
+            self._colorways = {
+                c["colorNumber"]: ColorwayModel(c)
+                for c in self._raw.get("colorways") or []
+            }
+        return self._colorways
+
+    @property
+    def size_range(self) -> dict:
+        """Dictionary of size name to SizeModel"""
+        if self._size_range is None:
+            self._size_range = {
+                s["name"]: SizeModel(s) for s in self._raw.get("sizeRange") or []
+            }
+        return self._size_range
+
+    def field(self, field_id: str):
+        """
+        Full attribute field (name, type, value...) of the header data
+
+        :field_id: ID of the field
+        :returns: Field dictionary or None
+        """
+        for f in (self._raw.get("headerData") or {}).get("fields") or []:
+            if f["id"] == field_id:
+                return f
+        return None
+
+    def to_dict(self, sort: bool = True) -> dict:
+        """
+        Materializes the view as a dictionary shaped like the output of
+        the matching parser. Values are shared with the API response.
+
+        :sort: Sort keys like the parsers do
+        """
+        result = dict(self._index())
+        result.update(
+            (key, _plain(getattr(self, attr))) for key, attr in self._computed.items()
+        )
+        return dict(sorted(result.items())) if sort else result
+
+    def _index(self) -> dict:
+        if self._values is None:
+            header_data = self._raw.get("headerData") or {}
+            values = {f["id"]: f["value"] for f in header_data.get("fields") or []}
+            values.update((k, v) for k, v in header_data.items() if k != "fields")
+            values.update(
+                (k, v) for k, v in self._raw.items() if k not in self._special
+            )
+            self._values = values
+        return self._values
+
+    def __getitem__(self, key):
+        if key in self._computed:
+            return getattr(self, self._computed[key])
+        return self._index()[key]
+
+    def __getattr__(self, name):
+        # only reached for names which are not slots or properties
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{type(self).__name__}' has no field '{name}'"
+            ) from None
+
+    def __iter__(self):
+        yield from self._index()
+        yield from self._computed
+
+    def __len__(self):
+        return len(self._index()) + len(self._computed)
+
+    def __contains__(self, key):
+        return key in self._computed or key in self._index()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={self._raw.get('id')!r})"
+
+
+class StyleModel(HeaderModel):
+    """View of a style with the keys of style_parser"""
+
+    __slots__ = ("_size_classes",)
+
+    _special = ("headerData", "sizeRange", "colorways", "sizeClasses")
+    _computed = {
+        "colorways": "colorways",
+        "default_size_range": "size_range",
+        "size_classes": "size_classes",
+    }
+
+    def __init__(self, raw: dict):
+        super().__init__(raw)
+        self._size_classes = None
+
+    @property
+    def size_classes(self) -> dict:
+        """Dictionary of size class name to size class with 'size_range'"""
+        if self._size_classes is None:
+            self._size_classes = {
+                sc["name"]: {
+                    **sc,
+                    "size_range": {
+                        s["name"]: SizeModel(s) for s in sc.get("sizeRange") or []
+                    },
+                }
+                for sc in self._raw.get("sizeClasses") or []
+            }
+        return self._size_classes
+
+
+class MaterialModel(HeaderModel):
+    """View of a material with the keys of material_parser"""
+
+    __slots__ = ()
+
+    _special = ("headerData", "sizeRange", "colorways", "suppliers")
+    _computed = {
+        "colorways": "colorways",
+        "default_size_range": "size_range",
+        "suppliers": "suppliers",
+    }
+
+    @property
+    def suppliers(self) -> dict:
+        """Dictionary of supplier ID to supplier"""
+        return {s["Id"]: s for s in self._raw.get("suppliers") or []}
+
+
+class ColorModel(HeaderModel):
+    """View of a color palette header"""
+
+    __slots__ = ()
+
+
+class ImageModel(HeaderModel):
+    """View of an image header"""
+
+    __slots__ = ()
+
+
+@composable
+def header_model_parser(header_data):
+    """
+    Wrap the header API response in a HeaderModel without copying it
+    """
+    return HeaderModel(header_data) if header_data else None
+
+
+@composable
+def style_model_parser(style_data):
+    """
+    Wrap the style API response in a StyleModel without copying it
+    """
+    return StyleModel(style_data) if style_data else None
+
+
+@composable
+def material_model_parser(material_data):
+    """
+    Wrap the material API response in a MaterialModel without copying it
+    """
+    return MaterialModel(material_data) if material_data else None
+
+
+@composable
+def color_model_parser(color_data):
+    """
+    Wrap the color API response in a ColorModel without copying it
+    """
+    return ColorModel(color_data) if color_data else None
+
+
+@composable
+def image_model_parser(image_data):
+    """
+    Wrap the image API response in an ImageModel without copying it
+    """
+    return ImageModel(image_data) if image_data else None
@@ -1,12 +1,30 @@
 from copy import deepcopy
+from types import MappingProxyType
 from .composable import composable
 
 
-@composable
-def header_parser(header_data):
-    """
-    Parse header data as a dictionary from the header API response
-    """
+def _no_copy(value):
+    return value
+
+
+def _flatten(data, special_fields, copy):
+    """Field values, header data and top level keys of a header response"""
+    result = {f["id"]: copy(f["value"]) for f in data["headerData"]["fields"]}
+    result.update((k, v) for k, v in data["headerData"].items() if k != "fields")
+    result.update((k, v) for k, v in data.items() if k not in special_fields)
+    return result
+
+
+def _finish(result, sort, read_only, nested=()):
+    if read_only:
+        for key in nested:
+            result[key] = MappingProxyType(result[key])
+    if sort:
+        result = dict(sorted(result.items()))
+    return MappingProxyType(result) if read_only else result
+
+
+def _parse_header(header_data, copy=deepcopy, sort=True, read_only=False):
     special_fields = (
         "headerData",
         "colorways",
@@ -23,26 +41,12 @@ def header_parser(header_data):
         "id": header_data["id"],
         "colorways": {},
     }
+    result.update(_flatten(header_data, special_fields, copy))
 
-    result.update(
-        {f["id"]: deepcopy(f["value"]) for f in header_data["headerData"]["fields"]}
-    )
-
-    result.update(
-        {k: v for k, v in header_data["headerData"].items() if k not in ["fields"]}
-    )
-
-    result.update({k: v for k, v in header_data.items() if k not in special_fields})
-
-    return dict(sorted(result.items()))
-
+    return _finish(result, sort, read_only, ("colorways",))
 
-@composable
-def style_parser(style_data):
-    """
-    Parse style data as a dictionary from the style API response
-    """
 
+def _parse_style(style_data, copy=deepcopy, sort=True, read_only=False):
     if not style_data:
         return None
 
@@ -60,39 +64,28 @@ def style_parser(style_data):
         "sizeClasses",
     )
 
-    result.update(
-        {f["id"]: deepcopy(f["value"]) for f in style_data["headerData"]["fields"]}
-    )
-
-    result.update(
-        {k: v for k, v in style_data["headerData"].items() if k not in ["fields"]}
-    )
-
-    result.update({k: v for k, v in style_data.items() if k not in special_fields})
+    result.update(_flatten(style_data, special_fields, copy))
 
     for size in style_data["sizeRange"] or []:
-        result["default_size_range"][size["name"]] = deepcopy(size)
+        result["default_size_range"][size["name"]] = copy(size)
 
     for colorway in style_data["colorways"] or []:
-        result["colorways"][colorway["colorNumber"]] = deepcopy(colorway)
+        result["colorways"][colorway["colorNumber"]] = copy(colorway)
 
     for size_class in style_data["sizeClasses"] or []:
         result["size_classes"][size_class["name"]] = {
             **size_class,
             "size_range": {
-                size["name"]: deepcopy(size) for size in (size_class["sizeRange"] or [])
+                size["name"]: copy(size) for size in (size_class["sizeRange"] or [])
             },
         }
 
-    return dict(sorted(result.items()))
-
+    return _finish(
+        result, sort, read_only, ("colorways", "default_size_range", "size_classes")
+    )
 
-@composable
-def material_parser(material_data):
-    """
-    Parse material data as a dictionary from the style API response
-    """
 
+def _parse_material(material_data, copy=deepcopy, sort=True, read_only=False):
     if not material_data:
         return None
 
@@ -105,26 +98,119 @@ def material_parser(material_data):
 
     special_fields = ("headerData", "sizeRange", "colorways", "suppliers")
 
-    result.update(
-        {f["id"]: deepcopy(f["value"]) for f in material_data["headerData"]["fields"]}
-    )
-
-    result.update(
-        {k: v for k, v in material_data["headerData"].items() if k not in ["fields"]}
-    )
-
-    result.update({k: v for k, v in material_data.items() if k not in special_fields})
+    result.update(_flatten(material_data, special_fields, copy))
 
     for size in material_data["sizeRange"] or []:
-        result["default_size_range"][size["name"]] = deepcopy(size)
+        result["default_size_range"][size["name"]] = copy(size)
 
     for colorway in material_data["colorways"] or []:
-        result["colorways"][colorway["colorNumber"]] = deepcopy(colorway)
+        result["colorways"][colorway["colorNumber"]] = copy(colorway)
 
     for supplier in material_data["suppliers"] or []:
-        result["suppliers"][supplier["Id"]] = deepcopy(supplier)
+        result["suppliers"][supplier["Id"]] = copy(supplier)
+
+    return _finish(
+        result, sort, read_only, ("colorways", "default_size_range", "suppliers")
+    )
+
 
-    return dict(sorted(result.items()))
+@composable
+def header_parser(header_data):
+    """
+    Parse header data as a dictionary from the header API response
+    """
+    return _parse_header(header_data)
+
+
+@composable
+def style_parser(style_data):
+    """
+    Parse style data as a dictionary from the style API response
+    """
+    return _parse_style(style_data)
+
+
+@composable
+def material_parser(material_data):
+    """
+    Parse material data as a dictionary from the style API response
+    """
+    return _parse_material(material_data)
+
+
+def _view_parser(parse, copy, sort, read_only):
+    copy = deepcopy if copy else _no_copy
+
+    @composable
+    def _parser(data):
+        return parse(data, copy, sort, read_only)
+
+    return _parser
+
+
+def header_view_parser(
+    copy: bool = False, sort: bool = False, read_only: bool = False
+):
+    """
+    Returns header_parser which shares values with the API response.
+    Values must not be modified unless copy is set.
+
+    :copy: Deep copy field values like header_parser
+    :sort: Sort keys like header_parser
+    :read_only: Return read-only mapping proxies
+    """
+    return _view_parser(_parse_header, copy, sort, read_only)
+
+
+def style_view_parser(
+    copy: bool = False, sort: bool = False, read_only: bool = False
+):
+    """
+    Returns style_parser which shares values, colorways and sizes with
+    the API response. Values must not be modified unless copy is set.
+
+    :copy: Deep copy values like style_parser
+    :sort: Sort keys like style_parser
+    :read_only: Return read-only mapping proxies
+    """
+    return _view_parser(_parse_style, copy, sort, read_only)
+
+
+def material_view_parser(
+    copy: bool = False, sort: bool = False, read_only: bool = False
+):
+    """
+    Returns material_parser which shares values, colorways, sizes and
+    suppliers with the API response. Values must not be modified unless
+    copy is set.
+
+    :copy: Deep copy values like material_parser
+    :sort: Sort keys like material_parser
+    :read_only: Return read-only mapping proxies
+    """
+    return _view_parser(_parse_material, copy, sort, read_only)
+
+
+def batch_parser(parser):
+    """
+    Returns parser of an iterable of API responses, e.g. the result of
+    attributes_list. Records are parsed one by one while they are iterated,
+    async iterables give async generators.
+
+    :parser: Parser of a single response, e.g. style_view_parser()
+    """
+
+    async def _parse_async(records):
+        async for record in records:
+            yield parser(record)
+
+    @composable
+    def _parser(records):
+        if hasattr(records, "__aiter__"):
+            return _parse_async(records)
+        return (parser(record) for record in records)
+
+    return _parser
 
 
 @composable
@@ -144,6 +230,27 @@ def app_list_parser(app_list):
     return result
 
 
+def resolve_field_names(field_ids):
+    """
+    Returns parser replacing field names with field IDs in dictionary keys.
+    Keys which are not known names are kept, so field IDs can be mixed in.
+
+    :field_ids: Dictionary of lower-cased field names to field IDs,
+                e.g. client.resolver.field_ids('Style', folder_id)
+    """
+
+    @composable
+    def _parser(fields):
+        if not fields:
+            return fields
+        return {
+            (field_ids.get(key.lower(), key) if isinstance(key, str) else key): value
+            for key, value in fields.items()
+        }
+
+    return _parser
+
+
 @composable
 def dict_to_eq_filter_parser(filters):
     """
@@ -8,7 +8,10 @@ Description: BeProduct Public API SDK Wrapper
 
 import time
 from typing import Dict
-from .auth import OAuth2Client
+from .auth import OAuth2Client, AsyncOAuth2Client
+from ._retry import RetryPolicy
+from ._json import JsonCodec, DEFAULT_CODEC, stdlib_codec  # noqa: F401
+from ._cache import ResponseCache, MemoryCache, DiskCache, AppListCache  # noqa: F401
 
 
 class BeProduct:
@@ -16,6 +19,8 @@ class BeProduct:
     BeProduct Public API Client
     """
 
+    oauth2_client_class = OAuth2Client
+
     def __init__(
         self,
         client_id: str = None,
@@ -27,6 +32,16 @@ class BeProduct:
         automation_api_url="https://automation.beproduct.com",
         access_token: str = None,
         additional_headers: Dict = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 0,
+        rate_limit: float = None,
+        rate_burst: int = None,
+        retry_policy: RetryPolicy = None,
+        response_cache: ResponseCache = None,
+        app_list_ttl: float = 300,
+        resolver_ttl: float = None,
+        json_codec: JsonCodec = None,
     ):
         """BeProduct Public API Client
 
@@ -37,6 +52,22 @@ class BeProduct:
         :token_endpoint: token endpoint
         :public_api_url: BeProduct public api URL
         :automation_api_url: BeProduct Automation URL
+        :pool_connections: Number of HTTP connection pools to keep
+        :pool_maxsize: Maximum number of kept-alive connections per host
+        :max_retries: Number of retries on failed connections
+        :rate_limit: Maximum requests per second to each API. By default
+                     requests are limited only after the API responds with 429
+        :rate_burst: Number of requests allowed at once
+        :retry_policy: Policy of retrying throttled and failed calls.
+                       Defaults to RetryPolicy()
+        :response_cache: Cache of folders, schemas and other metadata,
+                         e.g. ResponseCache(ttl=300). None disables caching
+        :app_list_ttl: Seconds app lists requested with a folder_id are kept.
+                       0 disables caching
+        :resolver_ttl: Seconds client.resolver keeps name indexes.
+                       Defaults to the TTL of the response cache
+        :json_codec: JSON encoder and decoder of request and response bodies.
+                     Defaults to orjson, msgspec or ujson if installed
         :returns: Public API client instance
 
         """
@@ -48,7 +79,7 @@ class BeProduct:
                 "access_token or client_id, client_secret and refresh_token are required"
             )
 
-        self.oauth2_client = OAuth2Client(
+        self.oauth2_client = self.oauth2_client_class(
             token_endpoint=token_endpoint,
             client_id=client_id,
             client_secret=client_secret,
@@ -68,9 +99,34 @@ class BeProduct:
         # ### Constructing API handlers ###
         # importing here to prevent cyclic dependency
 
+        from ._rate_limit import RateLimiter
         from ._raw_api import RawApi
 
-        self.raw_api = RawApi(self, additional_headers=additional_headers)
+        # shared by all threads and coroutines using this client
+        self.rate_limiter = RateLimiter(rate=rate_limit, burst=rate_burst)
+        self.json_codec = json_codec or DEFAULT_CODEC
+        self.cache = (
+            response_cache
+            if response_cache is not None
+            else ResponseCache(ttl=0, codec=self.json_codec)
+        )
+        # apps of a folder, shared by all master folder handlers
+        self.app_list_cache = AppListCache(ttl=app_list_ttl)
+
+        from ._resolver import Resolver
+
+        self.resolver = Resolver(
+            self, ttl=self.cache.ttl if resolver_ttl is None else resolver_ttl
+        )
+
+        self.raw_api = RawApi(
+            self,
+            additional_headers=additional_headers,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            retry_policy=retry_policy,
+        )
 
         from ._style import Style
         from ._image import Image
@@ -82,7 +138,7 @@ class BeProduct:
         from ._tracking import Tracking
         from ._automation import Automation
         from ._schema import Schema
-        from ._helpers import beproduct_paging_iterator_sync
+        from ._helpers import beproduct_paging_iterator_sync, beproduct_bulk_map_sync
 
         self.style = Style(self)
         self.image = Image(self)
@@ -96,6 +152,26 @@ class BeProduct:
         self.schema = Schema(self)
 
         self.beproduct_paging_iterator = beproduct_paging_iterator_sync
+        self.beproduct_bulk_map = beproduct_bulk_map_sync
+
+    def json_loads(self, data):
+        """Decodes JSON bytes or str with the client's codec"""
+        return self.json_codec.loads(data)
+
+    def json_dumps(self, obj) -> bytes:
+        """Encodes an object to JSON bytes with the client's codec"""
+        return self.json_codec.dumps(obj)
+
+    def close(self):
+        """Releases pooled HTTP connections"""
+        # the session is shared by raw_api and automation handlers
+        self.raw_api.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 
 class BeProductAsync(BeProduct):
@@ -103,9 +179,23 @@ class BeProductAsync(BeProduct):
     BeProduct Public API Client Async
     """
 
-    def __init__(self, *args, additional_headers: Dict = None, **kwargs):
+    oauth2_client_class = AsyncOAuth2Client
+
+    def __init__(
+        self,
+        *args,
+        additional_headers: Dict = None,
+        connector_limit: int = 100,
+        connector_limit_per_host: int = 0,
+        ttl_dns_cache: int = 10,
+        **kwargs,
+    ):
         """BeProduct Public API Client Async
 
+        :connector_limit: Total number of simultaneous connections
+        :connector_limit_per_host: Simultaneous connections to the same host.
+                                   0 means no limit
+        :ttl_dns_cache: Seconds to cache resolved DNS entries
         :returns: Public API client instance
         """
         super().__init__(*args, **kwargs)
@@ -113,7 +203,35 @@ class BeProductAsync(BeProduct):
         # ### Constructing Async API handlers ###
 
         from ._raw_api_async import RawApiAsync
-        from ._helpers import beproduct_paging_iterator_async
-
-        self.raw_api = RawApiAsync(self, additional_headers=additional_headers)
+        from ._helpers import beproduct_paging_iterator_async, beproduct_bulk_map_async
+
+        # the sync handler keeps the session of the automation handlers
+        self._raw_api_sync = self.raw_api
+        self.raw_api = RawApiAsync(
+            self,
+            additional_headers=additional_headers,
+            connector_limit=connector_limit,
+            connector_limit_per_host=connector_limit_per_host,
+            ttl_dns_cache=ttl_dns_cache,
+            retry_policy=self.raw_api.retry_policy,
+        )
         self.beproduct_paging_iterator = beproduct_paging_iterator_async
+
+        # tokens are refreshed through the shared aiohttp session
+        self.oauth2_client.session_provider = lambda: self.raw_api.session
+        self.beproduct_bulk_map = beproduct_bulk_map_async
+
+    def close(self):
+        """Releases pooled HTTP connections of the automation handlers"""
+        self._raw_api_sync.close()
+
+    async def aclose(self):
+        """Releases the shared aiohttp session and pooled HTTP connections"""
+        await self.raw_api.aclose()
+        self._raw_api_sync.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,161 @@
+"""
+File: _cache_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import tempfile
+import time
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct._cache import MemoryCache, DiskCache, ResponseCache, AppListCache
+from beproduct.sdk import BeProduct
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_ttl(self):
+        """Expired values are not returned"""
+        cache = MemoryCache()
+        cache.set("a", b"1", ttl=0.05)
+        self.assertEqual(cache.get("a"), b"1")
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a"))
+
+    def test_lru(self):
+        """Least recently used values are evicted first"""
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", b"1", ttl=60)
+        cache.set("b", b"2", ttl=60)
+        cache.get("a")
+        cache.set("c", b"3", ttl=60)
+        self.assertEqual(sorted(cache.keys()), ["a", "c"])
+
+    def test_max_bytes(self):
+        """Total size stays within max_bytes"""
+        cache = MemoryCache(max_bytes=10)
+        cache.set("a", b"12345", ttl=60)
+        cache.set("b", b"12345", ttl=60)
+        cache.set("c", b"12345", ttl=60)
+        cache.set("d", b"x" * 11, ttl=60)
+        self.assertEqual(sorted(cache.keys()), ["b", "c"])
+
+
+class TestDiskCache(unittest.TestCase):
+    def test_persistence(self):
+        """Values are shared by caches using the same directory"""
+        with tempfile.TemporaryDirectory() as directory:
+            DiskCache(directory).set("a", b'{"x": 1}', ttl=60)
+            cache = DiskCache(directory)
+            self.assertEqual(cache.get("a"), b'{"x": 1}')
+            self.assertEqual(cache.keys(), ["a"])
+
+            cache.set("b", b"[]", ttl=-1)
+            self.assertIsNone(cache.get("b"))
+
+            cache.clear()
+            self.assertIsNone(cache.get("a"))
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_read_through(self):
+        """Response is fetched once and every hit returns a copy"""
+        cache = ResponseCache()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return [{"id": "folder"}]
+
+        first = cache.get_or_fetch("https://api/Style/Folders", fetch)
+        first[0]["id"] = "changed"
+        second = cache.get_or_fetch("https://api/Style/Folders", fetch)
+
+        self.assertEqual(second, [{"id": "folder"}])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "entries": 1})
+
+    def test_async(self):
+        """Awaitable fetch is cached too"""
+        cache = ResponseCache()
+
+        async def fetch():
+            return {"a": 1}
+
+        async def run():
+            await cache.get_or_fetch_async("key", fetch)
+            return await cache.get_or_fetch_async("key", fetch)
+
+        self.assertEqual(asyncio.run(run()), {"a": 1})
+        self.assertEqual(cache.hits, 1)
+
+    def test_invalidate(self):
+        """Responses are removed by URL part"""
+        cache = ResponseCache()
+        cache.get_or_fetch("https://api/Style/FolderSchema?folderId=1", lambda: [])
+        cache.get_or_fetch("https://api/Style/Folders", lambda: [])
+
+        cache.invalidate("FolderSchema")
+        self.assertEqual(cache.backend.keys(), ["https://api/Style/Folders"])
+        cache.invalidate()
+        self.assertEqual(cache.backend.keys(), [])
+
+    def test_disabled(self):
+        """ttl=0 always fetches"""
+        cache = ResponseCache(ttl=0)
+        cache.get_or_fetch("key", lambda: 1)
+        cache.get_or_fetch("key", lambda: 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_client_opt_in(self):
+        """Clients cache responses only when given a ResponseCache"""
+        client = BeProduct(access_token="token", company_domain="company")
+        self.assertEqual(client.cache.ttl, 0)
+
+        cache = ResponseCache(ttl=60)
+        client = BeProduct(
+            access_token="token",
+            company_domain="company",
+            response_cache=cache,
+            app_list_ttl=0,
+        )
+        self.assertIs(client.cache, cache)
+        client.app_list_cache.set("Style", "folder", [])
+        self.assertIsNone(client.app_list_cache.get("Style", "folder"))
+
+
+class TestAppListCache(unittest.TestCase):
+    def test_title_index(self):
+        """App IDs are found by lower-cased title"""
+        cache = AppListCache()
+        self.assertIs(cache.app_id("Style", "folder", "BOM"), False)
+
+        cache.set("Style", "folder", [{"id": "1", "title": "BOM"}])
+        self.assertEqual(cache.app_id("Style", "folder", "bom"), "1")
+        self.assertIsNone(cache.app_id("Style", "folder", "Missing"))
+        self.assertIs(cache.app_id("Material", "folder", "bom"), False)
+
+    def test_limits(self):
+        """Lists expire and the oldest folders are evicted"""
+        cache = AppListCache(ttl=0.05, max_entries=1)
+        cache.set("Style", "a", [])
+        cache.set("Style", "b", [])
+        self.assertIsNone(cache.get("Style", "a"))
+        self.assertEqual(cache.get("Style", "b"), [])
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("Style", "b"))
+
+    def test_invalidate(self):
+        """Lists are removed by master folder and folder"""
+        cache = AppListCache()
+        cache.set("Style", "a", [])
+        cache.set("Material", "a", [])
+        cache.invalidate("Style")
+        self.assertIsNone(cache.get("Style", "a"))
+        self.assertEqual(cache.get("Material", "a"), [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
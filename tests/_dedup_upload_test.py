@@ -0,0 +1,148 @@
+"""
+File: _dedup_upload_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import os
+import socket
+import tempfile
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+from test_helpers import StubHandler, StubServer
+
+from beproduct._rate_limit import RateLimiter
+from beproduct._dedup_upload import DedupUpload, file_checksum
+from beproduct._sync import SyncState
+from beproduct.sdk import BeProduct, BeProductAsync
+
+
+class _Handler(StubHandler):
+    """Drops the first `server.drops` uploads halfway, answers the others"""
+
+    def do_POST(self):
+        if self.server.drops:
+            self.server.drops -= 1
+            self.rfile.read(int(self.headers["Content-Length"]) // 2)
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.close_connection = True
+            return
+
+        self.server.bodies.append(self.read_body())
+        self.reply({"imageId": f"upload-{len(self.server.bodies)}"})
+
+
+class TestDedupUpload(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer(_Handler, bodies=[], drops=0).start()
+        self.addCleanup(self.server.stop)
+        self.url = self.server.url
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "model.zip")
+        self.state_path = os.path.join(self.directory.name, "uploads.json")
+        with open(self.path, "wb") as f:
+            f.write(os.urandom(2_500_000))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def client(self):
+        client = BeProduct(
+            access_token="token", company_domain="company", public_api_url=self.url
+        )
+        client.rate_limiter = RateLimiter(min_rate=1000)
+        return client
+
+    def dedup(self, client, **kwargs):
+        return DedupUpload(client, self.state_path, retry_delay=0.01, **kwargs)
+
+    def test_dropped_connection(self):
+        """A dropped upload sends the whole file again"""
+        self.server.drops = 1
+        reported = []
+        with self.client() as client:
+            upload_id = self.dedup(client).upload(
+                self.path, "Style/Upload", progress=lambda *p: reported.append(p)
+            )
+
+        self.assertEqual(upload_id, "upload-1")
+        with open(self.path, "rb") as f:
+            self.assertIn(f.read(), self.server.bodies[0])
+        self.assertEqual(reported[-1], (2_500_000, 2_500_000))
+
+        entry = next(iter(SyncState(self.state_path)._state.values()))
+        self.assertEqual(entry["upload_id"], "upload-1")
+        self.assertEqual(entry["sha256"], file_checksum(self.path))
+
+    def test_attempts_exhausted(self):
+        """Connection errors are raised after the last attempt"""
+        self.server.drops = 2
+        with self.client() as client:
+            with self.assertRaises(Exception):
+                self.dedup(client, attempts=2).upload(self.path, "Style/Upload")
+            self.assertEqual(
+                self.dedup(client).upload(self.path, "Style/Upload"), "upload-1"
+            )
+
+    def test_restart(self):
+        """Uploaded content is not sent again after restart unless changed"""
+        url = "Style/h1/Page3DStyle/a1/Version/v1/WorkingFile/Upload"
+        with self.client() as client:
+            ids = [
+                client.style.app_3D_style_working_file_upload(
+                    "h1", "a1", "v1", self.path, dedup=self.state_path
+                )
+            ]
+
+        # touched, same content
+        os.utime(self.path, ns=(1, 1))
+        with self.client() as client:
+            ids.append(self.dedup(client).upload(self.path, url))
+            with open(self.path, "r+b") as f:
+                f.write(b"changed")
+            ids.append(self.dedup(client).upload(self.path, url))
+            ids.append(self.dedup(client).upload(self.path, "Style/Other"))
+            self.dedup(client).forget(self.path, url)
+            ids.append(self.dedup(client).upload(self.path, url))
+
+        self.assertEqual(
+            ids, ["upload-1", "upload-1", "upload-2", "upload-3", "upload-4"]
+        )
+
+    def test_checksum_once(self):
+        """An unchanged file is not read again"""
+        with self.client() as client:
+            dedup = self.dedup(client)
+            entry = dedup.entry(self.path, "Style/Upload")
+            entry.update(sha256="saved", upload_id="upload-0")
+            dedup.state.set(dedup._key(self.path, "Style/Upload"), entry)
+            self.assertEqual(dedup.upload(self.path, "Style/Upload"), "upload-0")
+        self.assertEqual(self.server.bodies, [])
+
+    def test_async(self):
+        """Async upload stores and returns the upload ID as the sync one"""
+        reported = []
+
+        async def run():
+            async with BeProductAsync(
+                access_token="token", company_domain="company", public_api_url=self.url
+            ) as client:
+                client.rate_limiter = RateLimiter(min_rate=1000)
+                dedup = self.dedup(client)
+                first = await dedup.upload(
+                    self.path, "Style/Upload", progress=lambda *p: reported.append(p)
+                )
+                return first, await dedup.upload(self.path, "Style/Upload")
+
+        self.assertEqual(asyncio.run(run()), ("upload-1", "upload-1"))
+        self.assertEqual(len(self.server.bodies), 1)
+        self.assertEqual(reported[-1], (2_500_000, 2_500_000))
+        entry = next(iter(SyncState(self.state_path)._state.values()))
+        self.assertEqual(entry["upload_id"], "upload-1")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
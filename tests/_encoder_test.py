@@ -0,0 +1,148 @@
+"""
+File: _encoder_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+import requests
+import test_helpers  # noqa: F401 adds src to the path
+from test_helpers import StubHandler, StubServer
+
+from beproduct._encoder import FileFromURLWrapper, MultipartEncoder
+from beproduct._rate_limit import RateLimiter
+from beproduct.sdk import BeProduct, BeProductAsync, RetryPolicy
+
+CONTENT = os.urandom(200_000)
+
+
+class _Handler(StubHandler):
+    """
+    Serves CONTENT at /file.bin, with Range requests if `server.ranges`.
+    Answers 429 to the first upload and stores received bodies.
+    """
+
+    def _file_headers(self, status: int, length: int):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        if self.server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._file_headers(200, len(CONTENT))
+
+    def do_GET(self):
+        self.server.gets.append(self.headers["Range"])
+        start = 0
+        if self.headers["Range"] and self.server.ranges:
+            start = int(self.headers["Range"][6:-1])
+        self._file_headers(206 if start else 200, len(CONTENT) - start)
+        self.wfile.write(CONTENT[start:])
+
+    def do_POST(self):
+        self.server.bodies.append(self.read_body())
+        if len(self.server.bodies) == 1:
+            self.reply(status=429, headers={"Retry-After": "0"})
+            return
+        self.reply({"imageId": "upload-1"})
+
+
+class TestRewind(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer(_Handler, bodies=[], gets=[], ranges=True).start()
+        self.addCleanup(self.server.stop)
+        self.url = self.server.url
+
+    def test_local_file(self):
+        """Rewound encoder sends the same body, files are sought back"""
+        with tempfile.TemporaryFile() as f:
+            f.write(b"skipped" + CONTENT)
+            f.seek(7)
+            encoder = MultipartEncoder(
+                {"a": "1", "b": io.BytesIO(b"bytes"), "file": ("f.bin", f)},
+                boundary="b0",
+            )
+            first = encoder.read(1000) + encoder.read()
+            encoder.rewind()
+            self.assertEqual(encoder.to_string(), first)
+            self.assertEqual(len(first), encoder.len)
+            self.assertIn(CONTENT, first)
+
+    def url_reads(self, spool_size: int) -> bytes:
+        with requests.Session() as session:
+            source = FileFromURLWrapper(
+                f"{self.url}/file.bin", session=session, spool_size=spool_size
+            )
+            read = b"".join(source.read(10_000) for _ in range(15))
+            self.assertEqual(read, CONTENT[:150_000])
+            source.rewind()
+            self.assertEqual(source.len, len(CONTENT))
+            data = b""
+            while source.len:
+                data += source.read(65536)
+            source.close()
+            return data
+
+    def test_url_spool(self):
+        """URL sources replay spooled bytes and request the rest by range"""
+        self.assertEqual(self.url_reads(1_000_000), CONTENT)
+        self.assertEqual(self.server.gets, [None])
+
+        self.server.gets.clear()
+        self.assertEqual(self.url_reads(100_000), CONTENT)
+        self.assertEqual(self.server.gets[0], None)
+        self.assertEqual(self.server.gets[1:], ["bytes=100000-"])
+
+        # without ranges the whole file is requested again
+        self.server.ranges = False
+        self.server.gets.clear()
+        self.assertEqual(self.url_reads(100_000), CONTENT)
+        self.assertEqual(self.server.gets, [None, None])
+
+    def test_upload_from_url_retried(self):
+        """A throttled upload from URL sends the whole file again"""
+        with BeProduct(
+            access_token="token",
+            company_domain="company",
+            public_api_url=self.url,
+            retry_policy=RetryPolicy(base_delay=0.01),
+        ) as client:
+            client.rate_limiter = RateLimiter(min_rate=1000)
+            upload_id = client.raw_api.upload_from_url(
+                f"{self.url}/file.bin", "Style/Upload", body={"headerId": "h1"}
+            )
+
+        self.assertEqual(upload_id, "upload-1")
+        self.assertEqual(self.server.bodies[0], self.server.bodies[1])
+        self.assertIn(CONTENT, self.server.bodies[1])
+        self.assertEqual(self.server.gets, [None])
+
+    def test_upload_from_url_retried_async(self):
+        """Async upload from URL downloads the source once"""
+
+        async def run():
+            async with BeProductAsync(
+                access_token="token",
+                company_domain="company",
+                public_api_url=self.url,
+                retry_policy=RetryPolicy(base_delay=0.01),
+            ) as client:
+                client.rate_limiter = RateLimiter(min_rate=1000)
+                return await client.raw_api.upload_from_url(
+                    f"{self.url}/file.bin", "Style/Upload", body={"headerId": "h1"}
+                )
+
+        self.assertEqual(asyncio.run(run()), {"imageId": "upload-1"})
+        self.assertIn(CONTENT, self.server.bodies[1])
+        self.assertEqual(len(self.server.bodies[0]), len(self.server.bodies[1]))
+        self.assertEqual(self.server.gets, [None])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,225 @@
+"""
+File: _helpers_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+import time
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct._helpers import (
+    beproduct_paging_iterator_sync,
+    beproduct_paging_iterator_async,
+    beproduct_bulk_map_sync,
+    beproduct_bulk_map_async,
+)
+from beproduct._json_stream import AsyncJsonItemStream, JsonItemStream
+
+
+def _fake_pages(total):
+    calls = []
+    lock = threading.Lock()
+
+    def page_func(page_size, page_number):
+        with lock:
+            calls.append(page_number)
+        start = page_size * page_number
+        return {
+            "total": total,
+            "result": list(range(start, min(start + page_size, total))),
+        }
+
+    return page_func, calls
+
+
+def _streamed_pages(total, stream_class=JsonItemStream):
+    """Pages as streams recording which of them were released"""
+    page_func, calls = _fake_pages(total)
+    closed = []
+
+    async def _chunks(body):
+        yield body
+
+    def streamed_page_func(page_size, page_number):
+        body = json.dumps(page_func(page_size, page_number)).encode("utf-8")
+        chunks = [body] if stream_class is JsonItemStream else _chunks(body)
+        return stream_class(chunks, "result", lambda: closed.append(page_number))
+
+    return streamed_page_func, calls, closed
+
+
+class _KeptPage:
+    """
+    Streamed page whose record iterator stays referenced by the page,
+    so it is released only by an explicit close()
+    """
+
+    def __init__(self, page):
+        self.fields = page
+        self.records = iter(page["result"])
+        self.closed = False
+
+    def __iter__(self):
+        return self.records
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.records)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    def close(self):
+        self.closed = True
+
+
+class TestPagingIterator(unittest.TestCase):
+    def test_sequential(self):
+        """Sequential paging returns all records"""
+        page_func, calls = _fake_pages(95)
+        self.assertEqual(
+            list(beproduct_paging_iterator_sync(10, page_func)), list(range(95))
+        )
+        self.assertEqual(calls, list(range(10)))
+
+    def test_prefetch_keeps_order(self):
+        """Prefetching returns records in page order"""
+        page_func, _ = _fake_pages(95)
+
+        def slow_page_func(page_size, page_number):
+            # later pages answer first
+            time.sleep(0.01 * (10 - page_number))
+            return page_func(page_size, page_number)
+
+        self.assertEqual(
+            list(beproduct_paging_iterator_sync(10, slow_page_func, prefetch=4)),
+            list(range(95)),
+        )
+
+    def test_prefetch_empty(self):
+        """Prefetching an empty list makes a single call"""
+        page_func, calls = _fake_pages(0)
+        self.assertEqual(list(beproduct_paging_iterator_sync(10, page_func, 3)), [])
+        self.assertEqual(calls, [0])
+
+    def test_async(self):
+        """Async paging with and without prefetch"""
+        page_func, _ = _fake_pages(45)
+
+        async def async_page_func(page_size, page_number):
+            await asyncio.sleep(0.001 * (5 - page_number))
+            return page_func(page_size, page_number)
+
+        async def collect(prefetch):
+            return [
+                r
+                async for r in beproduct_paging_iterator_async(
+                    10, async_page_func, prefetch
+                )
+            ]
+
+        self.assertEqual(asyncio.run(collect(0)), list(range(45)))
+        self.assertEqual(asyncio.run(collect(3)), list(range(45)))
+
+    def test_sequential_closes_streams(self):
+        """A streamed page is released when sequential iteration stops"""
+        page_func, _ = _fake_pages(95)
+        pages = []
+
+        def streamed_page_func(page_size, page_number):
+            pages.append(_KeptPage(page_func(page_size, page_number)))
+            return pages[-1]
+
+        async def async_page_func(page_size, page_number):
+            return streamed_page_func(page_size, page_number)
+
+        for record in beproduct_paging_iterator_sync(10, streamed_page_func):
+            if record == 15:
+                break
+        self.assertEqual([page.closed for page in pages], [True, True])
+
+        async def run():
+            records = beproduct_paging_iterator_async(10, async_page_func)
+            async for record in records:
+                if record == 15:
+                    break
+            await records.aclose()
+
+        pages.clear()
+        asyncio.run(run())
+        self.assertEqual([page.closed for page in pages], [True, True])
+
+    def test_prefetch_closes_streams(self):
+        """Streamed pages fetched ahead are released when iteration stops"""
+        page_func, calls, closed = _streamed_pages(95)
+        records = beproduct_paging_iterator_sync(10, page_func, prefetch=3)
+        self.assertEqual(list(itertools.islice(records, 15)), list(range(15)))
+        records.close()
+        time.sleep(0.1)
+        self.assertEqual(sorted(closed), sorted(calls))
+
+    def test_prefetch_closes_streams_async(self):
+        """Async streamed pages fetched ahead are released when iteration stops"""
+        page_func, calls, closed = _streamed_pages(95, AsyncJsonItemStream)
+
+        async def async_page_func(page_size, page_number):
+            return page_func(page_size, page_number)
+
+        async def run():
+            records = beproduct_paging_iterator_async(10, async_page_func, 3)
+            first = [await anext(records) for _ in range(15)]
+            # let the prefetched requests finish
+            await asyncio.sleep(0.01)
+            await records.aclose()
+            return first
+
+        self.assertEqual(asyncio.run(run()), list(range(15)))
+        self.assertEqual(sorted(closed), sorted(calls))
+
+
+class TestBulkMap(unittest.TestCase):
+    def _get(self, header_id):
+        if header_id == "missing":
+            raise ValueError("Style not found")
+        return {"id": header_id}
+
+    def test_sync(self):
+        """Ordered, deduplicated results with per item failures"""
+        result = beproduct_bulk_map_sync(
+            self._get, ["b", "a", "missing", "b", "c"], concurrency=3
+        )
+        self.assertEqual(list(result), ["b", "a", "missing", "c"])
+        self.assertEqual(result["a"], {"id": "a"})
+        self.assertIsInstance(result["missing"], ValueError)
+
+    def test_async(self):
+        """Async variant keeps at most `concurrency` calls running"""
+        running = 0
+        max_running = 0
+
+        async def get(header_id):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return self._get(header_id)
+
+        result = asyncio.run(
+            beproduct_bulk_map_async(get, ["x", "missing", "y", "x", "z"], 2)
+        )
+        self.assertEqual(list(result), ["x", "missing", "y", "z"])
+        self.assertIsInstance(result["missing"], ValueError)
+        self.assertLessEqual(max_running, 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+"""
+File: _impersonation_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import unittest
+from urllib.parse import parse_qsl
+import test_helpers  # noqa: F401 adds src to the path
+from test_helpers import StubHandler, StubServer
+
+from beproduct.helpers.impersonation import impersonated
+from beproduct.sdk import BeProduct, BeProductAsync
+
+
+class _Handler(StubHandler):
+    """Token endpoint stand-in, stores the form of every token request"""
+
+    def do_POST(self):
+        form = dict(parse_qsl(self.read_body().decode("utf-8")))
+        self.server.requests.append(form)
+        if form["grant_type"] == "refresh_token":
+            self.reply(
+                {
+                    "access_token": "admin-token",
+                    "refresh_token": f"{form['refresh_token']}-next",
+                    "expires_in": 3600,
+                }
+            )
+        else:
+            self.reply({"access_token": f"{form['actas']}-token", "expires_in": 3600})
+
+
+class TestImpersonatedRefresh(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer(_Handler, requests=[]).start()
+        self.addCleanup(self.server.stop)
+        self.options = dict(
+            client_id="id",
+            client_secret="secret",
+            refresh_token="refresh",
+            company_domain="company",
+            token_endpoint=f"{self.server.url}/token",
+            public_api_url=self.server.url,
+        )
+
+    def assert_refreshed(self, client, token):
+        self.assertEqual(token, "user-1-token")
+        self.assertEqual(client.oauth2_client.refresh_token, "refresh-next")
+
+        admin, actas = self.server.requests
+        self.assertEqual(admin["grant_type"], "refresh_token")
+        self.assertEqual(admin["refresh_token"], "refresh")
+        self.assertEqual(actas["grant_type"], "actas")
+        self.assertEqual(actas["token"], "admin-token")
+        self.assertEqual(actas["actas"], "user-1")
+        self.assertEqual(actas["client_id"], "impersonation-id")
+
+    def test_refresh(self):
+        """Admin token is refreshed with the refresh token, then exchanged"""
+        with BeProduct(**self.options) as client, impersonated(
+            client,
+            user_id="user-1",
+            impersonation_client_id="impersonation-id",
+            impersonation_client_secret="impersonation-secret",
+        ) as user:
+            token = user.oauth2_client.get_access_token()
+            self.assert_refreshed(user, token)
+
+    def test_refresh_async(self):
+        """Async refresh sends the refresh token of the impersonated client"""
+
+        async def run():
+            async with BeProductAsync(**self.options) as client, impersonated(
+                client,
+                user_id="user-1",
+                impersonation_client_id="impersonation-id",
+                impersonation_client_secret="impersonation-secret",
+            ) as user:
+                return user, await user.oauth2_client.get_access_token_async()
+
+        self.assert_refreshed(*asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
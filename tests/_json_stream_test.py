@@ -0,0 +1,141 @@
+"""
+File: _json_stream_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import json
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+from test_helpers import StubHandler, StubServer
+
+from aiohttp import web
+from beproduct import _json_stream
+from beproduct._json_stream import JsonItemStream, _PurePythonParser
+from beproduct._helpers import beproduct_paging_iterator_sync
+from beproduct.sdk import BeProduct, BeProductAsync
+
+PAGE = {
+    "total": 3,
+    "result": [
+        {"id": "1", "name": 'quote " and ] bracket', "rows": [[1, 2], {"a": None}]},
+        {"id": "2", "name": "escape \\ and é"},
+        {"id": "3", "value": 1.5},
+    ],
+    "size": 3,
+}
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestJsonItemParser(unittest.TestCase):
+    def parsers(self):
+        parsers = [_PurePythonParser]
+        if _json_stream.ijson is not None:
+            parsers.append(_json_stream._IjsonParser)
+        return parsers
+
+    def test_items_and_fields(self):
+        """Items are decoded from any chunking, scalar fields are kept"""
+        raw = json.dumps(PAGE).encode("utf-8")
+        for parser in self.parsers():
+            for size in (1, 7, len(raw)):
+                stream = JsonItemStream(_chunks(raw, size), key="result")
+                stream._parser = parser("result")
+                self.assertEqual(list(stream), PAGE["result"], parser)
+                self.assertEqual(stream.fields, {"total": 3, "size": 3}, parser)
+
+    def test_plain_array(self):
+        """Array documents are streamed with and without key"""
+        raw = json.dumps([1, "two", {"three": [3]}]).encode("utf-8")
+        for parser in self.parsers():
+            for key in (None, "result"):
+                p = parser(key)
+                items = [i for chunk in _chunks(raw, 3) for i in p.feed(chunk)]
+                items += p.close()
+                self.assertEqual(items, [1, "two", {"three": [3]}])
+
+    def test_bounded_buffer(self):
+        """Only the unfinished item is buffered"""
+        parser = _PurePythonParser("result")
+        parser.feed(b'{"total": 2, "result": [{"a": "' + b"x" * 1000 + b'"}, {"a"')
+        self.assertLess(len(parser._buf), 10)
+
+    def test_incomplete(self):
+        """Truncated body raises"""
+        parser = _PurePythonParser("result")
+        parser.feed(b'{"result": [1, 2')
+        with self.assertRaises(ValueError):
+            parser.close()
+
+    def test_paging_iterator(self):
+        """Streamed pages are iterated, total is read after each page"""
+        pages = [
+            {"total": 3, "result": [{"id": 1}, {"id": 2}]},
+            {"result": [{"id": 3}], "total": 3},
+        ]
+
+        def page_func(page_size, page_number):
+            raw = json.dumps(pages[page_number]).encode("utf-8")
+            return JsonItemStream(_chunks(raw, 5), key="result")
+
+        for prefetch in (0, 2):
+            records = beproduct_paging_iterator_sync(2, page_func, prefetch)
+            self.assertEqual([r["id"] for r in records], [1, 2, 3])
+
+
+class _Handler(StubHandler):
+    def do_POST(self):
+        self.read_body()
+        self.reply(PAGE)
+
+
+class TestRawApiStream(unittest.TestCase):
+    def test_post_stream(self):
+        """Sync streaming through the public API handler"""
+        with StubServer(_Handler) as server, BeProduct(
+            access_token="token", company_domain="company", public_api_url=server.url
+        ) as client:
+            records = list(client.style.attributes_list(folder_id="f", stream=True))
+
+        self.assertEqual(records, PAGE["result"])
+
+    def test_post_stream_async(self):
+        """Async streaming through the public API handler"""
+
+        async def handler(request):
+            return web.json_response(PAGE)
+
+        async def run():
+            app = web.Application()
+            app.router.add_post("/{tail:.*}", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            try:
+                async with BeProductAsync(
+                    access_token="token",
+                    company_domain="company",
+                    public_api_url=f"http://127.0.0.1:{port}",
+                ) as client:
+                    return [
+                        r
+                        async for r in client.tracking.plan_list(
+                            folder_id="f", stream=True
+                        )
+                    ]
+            finally:
+                await runner.cleanup()
+
+        self.assertEqual(asyncio.run(run()), PAGE["result"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
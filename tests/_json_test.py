@@ -0,0 +1,53 @@
+"""
+File: _json_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct import _json
+from beproduct.sdk import BeProduct
+
+PAYLOAD = {"filters": [{"field": "name", "value": "Ä ■"}], "n": 1, "f": 1.5}
+
+
+class TestJsonCodec(unittest.TestCase):
+    def codecs(self):
+        codecs = [_json.stdlib_codec()]
+        for factory in (_json.orjson_codec, _json.msgspec_codec, _json.ujson_codec):
+            try:
+                codecs.append(factory())
+            except ImportError:
+                pass
+        return codecs
+
+    def test_round_trip(self):
+        """Every codec encodes to UTF-8 bytes and decodes bytes and str"""
+        for codec in self.codecs():
+            raw = codec.dumps(PAYLOAD)
+            self.assertIsInstance(raw, bytes, codec)
+            self.assertEqual(codec.loads(raw), PAYLOAD, codec)
+            self.assertEqual(codec.loads(raw.decode("utf-8")), PAYLOAD, codec)
+
+    def test_dumps_str(self):
+        """Error messages render bodies the codec cannot encode"""
+        codec = _json.stdlib_codec()
+        self.assertEqual(codec.dumps_str({"a": 1}), '{"a": 1}')
+        self.assertIn("object", codec.dumps_str({"a": object()}))
+
+    def test_client_codec(self):
+        """The client and its response cache use the configured codec"""
+        codec = _json.stdlib_codec()
+        client = BeProduct(
+            access_token="token", company_domain="company", json_codec=codec
+        )
+        self.assertIs(client.json_codec, codec)
+        self.assertIs(client.cache.codec, codec)
+        self.assertEqual(client.json_loads(client.json_dumps(PAYLOAD)), PAYLOAD)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
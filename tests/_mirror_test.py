@@ -0,0 +1,169 @@
+"""
+File: _mirror_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct.helpers.mirror import LocalMirror
+from beproduct.sdk import BeProduct, BeProductAsync
+
+
+def _style(header_id, modified_at, **fields):
+    return {
+        "id": header_id,
+        "folder": {"id": "f"},
+        "modifiedAt": modified_at,
+        "headerData": {"fields": [{"id": k, "value": v} for k, v in fields.items()]},
+    }
+
+
+STYLES = [
+    _style("a", "2024-01-01T10:00:00Z", season="Spring", tags=["cotton", "kids"]),
+    _style("b", "2024-01-02T10:00:00Z", season="Summer", tags=["linen"], price=10),
+    _style("c", "2024-01-03T10:00:00Z", season="Fall_50%", active=True),
+]
+
+
+class _Folder:
+    """Stand-in of client.style returning records newer than the filter"""
+
+    master_folder = "Style"
+
+    def __init__(self, client, records):
+        self.client = client
+        self.records = records
+
+    def _matching(self, filters):
+        since = next((f["value"] for f in filters if f["field"] == "ModifiedAt"), "")
+        return [r for r in self.records if r["modifiedAt"] > since.replace(" ", "T")]
+
+    def attributes_list(self, folder_id, filters=None, **kwargs):
+        if isinstance(self.client, BeProductAsync):
+            return self._list_async(filters)
+        return iter(self._matching(filters))
+
+    async def _list_async(self, filters):
+        for record in self._matching(filters):
+            yield record
+
+
+class TestLocalMirror(unittest.TestCase):
+    def setUp(self):
+        self.mirror = LocalMirror()
+        self.mirror.upsert("Style", STYLES)
+
+    def tearDown(self):
+        self.mirror.close()
+
+    def ids(self, filters, folder_id=None):
+        return [
+            r["id"] for r in self.mirror.attributes_list("Style", folder_id, filters)
+        ]
+
+    def test_filters(self):
+        """Eq and Contains filters are answered locally"""
+        eq = {"field": "season", "operator": "Eq", "value": "Summer"}
+        self.assertEqual(self.ids([eq]), ["b"])
+        self.assertEqual(self.ids({"season": ["Spring", "Fall_50%"]}), ["a", "c"])
+        self.assertEqual(self.ids({"tags": "linen"}), ["b"])
+        contains = {"field": "season", "operator": "Contains", "value": "all_5"}
+        self.assertEqual(self.ids([contains]), ["c"])
+        self.assertEqual(self.ids([{**contains, "value": "ll_%"}]), [])
+        self.assertEqual(self.ids({"tags": ["*ott*", "*ine*"]}), ["a", "b"])
+        self.assertEqual(self.ids({"price": "10", "tags": "linen"}), ["b"])
+        self.assertEqual(self.ids({"active": "true"}), ["c"])
+        self.assertEqual(self.ids({"price": 10}), ["b"])
+        self.assertEqual(self.ids([], folder_id="other"), [])
+        self.assertEqual(self.mirror.count("Style"), 3)
+        self.assertEqual(self.mirror.count("Material"), 0)
+
+    def test_bool_filters(self):
+        """Booleans are compared as stored"""
+        self.assertEqual(self.ids({"active": True}), ["c"])
+        self.assertEqual(self.ids([{"field": "active", "value": [True]}]), ["c"])
+        self.assertEqual(self.ids({"active": False}), [])
+
+    def test_case_insensitive(self):
+        """Eq ignores case like Contains"""
+        self.assertEqual(self.ids({"season": "SUMMER"}), ["b"])
+        self.assertEqual(self.ids({"season": ["spring", "fall_50%"]}), ["a", "c"])
+        self.assertEqual(self.ids({"tags": ["*LIN*"]}), ["b"])
+
+    def test_modified_at(self):
+        """ModifiedAt is compared as time"""
+        gt = {"field": "ModifiedAt", "operator": "Gt", "value": "2024-01-02 09:00:00Z"}
+        self.assertEqual(self.ids([gt]), ["b", "c"])
+        with self.assertRaises(ValueError):
+            self.ids([{**gt, "operator": "Contains"}])
+
+    def test_dotnet_timestamps(self):
+        """Timestamps with 7 fraction digits are stored, invalid ones logged"""
+        self.mirror.upsert("Style", [_style("d", "2024-01-04T10:00:00.1234567+00:00")])
+        with self.assertLogs(level="WARNING"):
+            self.mirror.upsert("Style", [_style("e", "not a date")])
+
+        gt = {"field": "ModifiedAt", "operator": "Gt", "value": "2024-01-04 10:00:00Z"}
+        self.assertEqual(self.ids([gt]), ["d"])
+        self.assertEqual(self.mirror.count("Style"), 5)
+        with self.assertRaises(ValueError):
+            self.ids([{**gt, "value": "not a date"}])
+
+    def test_upsert_and_delete(self):
+        """Records are replaced by ID, deleted records are removed"""
+        fall = _style("a", "2024-01-04T10:00:00Z", season="Fall")
+        self.mirror.upsert("Style", [fall])
+        self.assertEqual(self.ids({"season": "Fall"}), ["a"])
+        self.assertEqual(self.ids({"tags": "kids"}), [])
+
+        self.mirror.upsert("Style", [{"id": "b", "isDeleted": True}])
+        self.mirror.delete("c")
+        self.assertEqual(self.ids([]), ["a"])
+
+    def test_selected_fields(self):
+        """Only selected fields can be filtered"""
+        with LocalMirror(fields=["season"]) as mirror:
+            mirror.upsert("Style", STYLES)
+            self.assertEqual(mirror.count("Style", filters={"season": "Summer"}), 1)
+            with self.assertRaises(ValueError):
+                mirror.count("Style", filters={"tags": "linen"})
+
+
+class TestRefresh(unittest.TestCase):
+    def test_refresh(self):
+        """Refreshes fetch changes only and survive reopening"""
+        client = BeProduct(access_token="token", company_domain="company")
+        folder = _Folder(client, list(STYLES))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "mirror.db")
+            with LocalMirror(path) as mirror:
+                self.assertEqual(mirror.refresh(folder, "f"), 3)
+
+            folder.records[0] = _style("a", "2024-01-05T10:00:00Z", season="Winter")
+            with LocalMirror(path) as mirror:
+                self.assertEqual(mirror.refresh(folder, "f"), 1)
+                self.assertEqual(mirror.refresh(folder, "f"), 0)
+                self.assertEqual(mirror.count("Style", "f", {"season": "Winter"}), 1)
+                self.assertEqual(mirror.count("Style", "f"), 3)
+
+    def test_refresh_async(self):
+        """Async refresh has to be awaited"""
+
+        async def run():
+            client = BeProductAsync(access_token="token", company_domain="company")
+            with LocalMirror() as mirror:
+                count = await mirror.refresh(_Folder(client, STYLES), "f")
+                return count, mirror.count("Style", "f")
+
+        self.assertEqual(asyncio.run(run()), (3, 3))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
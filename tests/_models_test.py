@@ -0,0 +1,88 @@
+"""
+File: _models_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct.helpers.models import (
+    HeaderModel,
+    MaterialModel,
+    StyleModel,
+    style_model_parser,
+)
+from beproduct.helpers.parsers import (
+    header_parser,
+    material_parser,
+    style_parser,
+)
+
+
+def _header(**extra):
+    return {
+        "id": "h1",
+        "headerNumber": "S-1",
+        "folder": {"id": "f1", "name": "Folder"},
+        "headerData": {
+            "fields": [
+                {"id": "header_number", "value": "S-1"},
+                {"id": "season_year", "value": "2024"},
+                {"id": "tags_field", "value": ["a", "b"]},
+            ],
+            "frontImage": {"preview": None, "origin": None},
+        },
+        "colorways": [{"id": "c1", "colorNumber": "1", "colorName": "Red"}],
+        "sizeRange": [{"name": "M", "price": 9.5, "isSampleSize": True}],
+        **extra,
+    }
+
+
+class TestModels(unittest.TestCase):
+    def test_style_matches_parser(self):
+        """StyleModel has the keys and values of style_parser"""
+        raw = _header(
+            sizeClasses=[{"name": "Kids", "sizeRange": [{"name": "XS"}]}]
+        )
+        self.assertEqual(StyleModel(raw).to_dict(), style_parser(raw))
+
+    def test_material_matches_parser(self):
+        """MaterialModel has the keys and values of material_parser"""
+        raw = _header(suppliers=[{"Id": "s1", "name": "Mill"}])
+        self.assertEqual(MaterialModel(raw).to_dict(), material_parser(raw))
+
+    def test_header_matches_parser(self):
+        """HeaderModel has the values of header_parser plus colorways"""
+        raw = _header(tags=["x"])
+        parsed = HeaderModel(raw).to_dict()
+        expected = header_parser(raw)
+        self.assertEqual(set(parsed), set(expected))
+        for key in expected:
+            if key != "colorways":
+                self.assertEqual(parsed[key], expected[key], key)
+
+    def test_zero_copy(self):
+        """Values are shared with the response and parsed lazily"""
+        raw = _header()
+        style = raw | style_model_parser
+        self.assertIsNone(style._values)
+
+        self.assertEqual(style.season_year, "2024")
+        self.assertIs(style["tags_field"], raw["headerData"]["fields"][2]["value"])
+        self.assertIs(style.raw, raw)
+        self.assertIs(style.colorways["1"].raw, raw["colorways"][0])
+        self.assertEqual(style.colorways["1"].color_name, "Red")
+        self.assertTrue(style.size_range["M"].is_sample_size)
+        self.assertEqual(style.folder["id"], "f1")
+
+        with self.assertRaises(AttributeError):
+            style.missing_field
+        with self.assertRaises(AttributeError):
+            style.anything = 1
+        self.assertIsNone(None | style_model_parser)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
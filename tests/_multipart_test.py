@@ -0,0 +1,89 @@
+"""
+File: _multipart_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import os
+import tempfile
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+from test_helpers import StubHandler, StubServer
+
+from beproduct._encoder import MultipartEncoder
+from beproduct._multipart import MultipartFileBody
+from beproduct._rate_limit import RateLimiter
+from beproduct.sdk import BeProduct, RetryPolicy
+
+
+class _Handler(StubHandler):
+    """Answers 429 to the first upload and stores received bodies"""
+
+    def do_POST(self):
+        self.server.bodies.append(self.read_body())
+        if len(self.server.bodies) == 1:
+            self.reply(status=429, headers={"Retry-After": "0"})
+            return
+        self.reply({"imageId": "upload-1"})
+
+
+class TestMultipartFileBody(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "model.zip")
+        with open(self.path, "wb") as f:
+            f.write(os.urandom(300_000))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_same_body_as_encoder(self):
+        """Bytes match the streaming MultipartEncoder"""
+        fields = {"colorwayId": "c1", "side": "front"}
+        body = MultipartFileBody(self.path, fields, boundary="b0", chunk_size=65536)
+
+        with open(self.path, "rb") as f:
+            encoder = MultipartEncoder(
+                fields={
+                    **fields,
+                    "file": ("model.zip", f, "application/octet-stream"),
+                },
+                boundary="b0",
+            )
+            expected = encoder.to_string()
+
+        self.assertEqual(body.to_bytes(), expected)
+        self.assertEqual(len(body), len(expected))
+        self.assertEqual(body.content_type, encoder.content_type)
+        # every iteration sends the whole body again
+        self.assertEqual(body.to_bytes(), expected)
+
+    def test_empty_file(self):
+        """Empty files are not mapped"""
+        open(self.path, "wb").close()
+        body = MultipartFileBody(self.path, boundary="b0")
+        self.assertEqual(len(body.to_bytes()), len(body))
+
+    def test_upload_retried(self):
+        """A throttled upload is sent again with the whole file"""
+        with StubServer(_Handler, bodies=[]) as server, BeProduct(
+            access_token="token",
+            company_domain="company",
+            public_api_url=server.url,
+            retry_policy=RetryPolicy(base_delay=0.01),
+        ) as client:
+            client.rate_limiter = RateLimiter(min_rate=1000)
+            upload_id = client.raw_api.upload_local_file(
+                self.path, "Style/Upload", body={"headerId": "h1"}
+            )
+
+        self.assertEqual(upload_id, "upload-1")
+        self.assertEqual(len(server.bodies), 2)
+        self.assertEqual(server.bodies[0], server.bodies[1])
+        with open(self.path, "rb") as f:
+            self.assertIn(f.read(), server.bodies[1])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
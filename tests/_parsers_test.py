@@ -0,0 +1,95 @@
+"""
+File: _parsers_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct.helpers.parsers import (
+    batch_parser,
+    header_parser,
+    header_view_parser,
+    material_parser,
+    material_view_parser,
+    style_parser,
+    style_view_parser,
+)
+
+
+def _header(i=1, **extra):
+    return {
+        "id": f"h{i}",
+        "headerData": {
+            "fields": [
+                {"id": "header_number", "value": f"S-{i}"},
+                {"id": "sizes", "value": ["S", "M"]},
+            ],
+        },
+        "colorways": [{"id": "c1", "colorNumber": "1", "fields": {}}],
+        "sizeRange": [{"name": "M", "fields": {}}],
+        "sizeClasses": [{"name": "Kids", "sizeRange": [{"name": "XS"}]}],
+        "suppliers": [{"Id": "s1"}],
+        "tags": ["x"],
+        **extra,
+    }
+
+
+class TestViewParsers(unittest.TestCase):
+    def test_same_result(self):
+        """View parsers give the same dictionaries as the copying parsers"""
+        raw = _header()
+        pairs = (
+            (header_parser, header_view_parser),
+            (style_parser, style_view_parser),
+            (material_parser, material_view_parser),
+        )
+        for parser, view_parser in pairs:
+            self.assertEqual(view_parser()(raw), parser(raw))
+            self.assertEqual(
+                list(view_parser(copy=True, sort=True)(raw)), list(parser(raw))
+            )
+
+    def test_no_copy(self):
+        """Values are shared with the response unless copy is set"""
+        raw = _header()
+        sizes = raw["headerData"]["fields"][1]["value"]
+        parsed = raw | style_view_parser()
+        self.assertIs(parsed["sizes"], sizes)
+        self.assertIs(parsed["colorways"]["1"], raw["colorways"][0])
+        self.assertIsNot(style_view_parser(copy=True)(raw)["sizes"], sizes)
+        self.assertIsNot(style_parser(raw)["sizes"], sizes)
+
+    def test_read_only(self):
+        """Read-only views can't be modified"""
+        parsed = material_view_parser(read_only=True)(_header())
+        with self.assertRaises(TypeError):
+            parsed["id"] = "other"
+        with self.assertRaises(TypeError):
+            parsed["suppliers"]["s2"] = {}
+        self.assertIsNone(material_view_parser(read_only=True)(None))
+
+    def test_batch(self):
+        """Iterables are parsed lazily, async iterables too"""
+        parser = batch_parser(header_view_parser())
+        records = [_header(i) for i in range(3)]
+
+        parsed = records | parser
+        self.assertFalse(isinstance(parsed, list))
+        self.assertEqual([p["header_number"] for p in parsed], ["S-0", "S-1", "S-2"])
+
+        async def source():
+            for record in records:
+                yield record
+
+        async def run():
+            return [p["id"] async for p in source() | parser]
+
+        self.assertEqual(asyncio.run(run()), ["h0", "h1", "h2"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
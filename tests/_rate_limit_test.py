@@ -0,0 +1,100 @@
+"""
+File: _rate_limit_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import time
+import unittest
+from email.utils import formatdate
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct._rate_limit import RateLimiter, parse_retry_after
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_parse_retry_after(self):
+        """Retry-After as seconds or HTTP date"""
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertAlmostEqual(
+            parse_retry_after(formatdate(time.time() + 10, usegmt=True)), 10, delta=2
+        )
+
+    def test_token_bucket(self):
+        """Requests above the burst wait for tokens"""
+        limiter = RateLimiter(rate=10, burst=2)
+        bucket = limiter.bucket("https://api")
+        waits = [bucket.reserve() for _ in range(4)]
+
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1, delta=0.02)
+        self.assertAlmostEqual(waits[3], 0.2, delta=0.02)
+
+    def test_buckets_per_base_url(self):
+        """Every base url has its own bucket"""
+        limiter = RateLimiter(rate=1, burst=1)
+        self.assertEqual(limiter.bucket("https://a").reserve(), 0.0)
+        self.assertEqual(limiter.bucket("https://b").reserve(), 0.0)
+
+    def test_aimd(self):
+        """Rate halves on 429 and grows back on success"""
+        limiter = RateLimiter(rate=10, increase=2)
+        bucket = limiter.bucket("https://api")
+
+        limiter.feedback("https://api", 429)
+        limiter.feedback("https://api", 429)  # same window counts once
+        self.assertEqual(bucket.rate, 5)
+
+        bucket.decreased_at -= 1
+        limiter.feedback("https://api", 200)
+        self.assertEqual(bucket.rate, 7)
+
+        bucket.increased_at -= 1
+        limiter.feedback("https://api", 200)
+        bucket.increased_at -= 1
+        limiter.feedback("https://api", 200)
+        self.assertEqual(bucket.rate, 10)  # never above configured rate
+
+    def test_retry_after_pauses_everyone(self):
+        """Retry-After delays all following requests"""
+        limiter = RateLimiter()
+        limiter.feedback("https://api", 429, "2")
+        self.assertAlmostEqual(limiter.bucket("https://api").reserve(), 2, delta=0.1)
+        self.assertEqual(limiter.bucket("https://other").reserve(), 0.0)
+
+    def test_unlimited_starts_limiting_on_429(self):
+        """Unlimited bucket gets a rate after the first 429"""
+        limiter = RateLimiter()
+        bucket = limiter.bucket("https://api")
+        for _ in range(8):
+            bucket.reserve()
+        limiter.feedback("https://api", 429)
+        self.assertEqual(bucket.rate, 4)
+
+    def test_unlimited_recovers(self):
+        """Unlimited bucket is unlimited again at the rate before the 429"""
+        limiter = RateLimiter(increase=1)
+        bucket = limiter.bucket("https://api")
+        for _ in range(8):
+            bucket.reserve()
+        limiter.feedback("https://api", 429)
+
+        rates = []
+        for _ in range(5):
+            bucket.decreased_at -= 1
+            bucket.increased_at -= 1
+            limiter.feedback("https://api", 200)
+            rates.append(bucket.rate)
+        self.assertEqual(rates, [5, 6, 7, None, None])
+        self.assertEqual(bucket.reserve(), 0.0)
+
+        # a later 429 limits again from the current request rate
+        limiter.feedback("https://api", 429)
+        self.assertIsNotNone(bucket.rate)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
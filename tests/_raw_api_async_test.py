@@ -0,0 +1,280 @@
+"""
+File: _raw_api_async_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import time
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+
+from aiohttp import web
+from beproduct.sdk import BeProductAsync, RetryPolicy
+from beproduct._rate_limit import RateLimiter
+from beproduct._exception import BeProductException
+from beproduct._upload_status import UploadStatusPoller
+
+
+class _FixedBackoffPolicy(RetryPolicy):
+    """Retry policy without jitter"""
+
+    def backoff(self, retry_number):
+        return self.base_delay
+
+
+class TestRawApiAsyncThrottling(unittest.TestCase):
+    def run_against(self, handler, policy, coro_factory):
+        """Runs coro_factory(client) against a local API stand-in"""
+
+        async def run():
+            app = web.Application()
+            app.router.add_route("*", "/{tail:.*}", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            try:
+                async with BeProductAsync(
+                    access_token="token",
+                    company_domain="company",
+                    public_api_url=f"http://127.0.0.1:{port}",
+                    retry_policy=policy,
+                ) as client:
+                    # only the pause is under test, not the rate decrease
+                    client.rate_limiter = RateLimiter(min_rate=1000)
+                    return await coro_factory(client)
+            finally:
+                await runner.cleanup()
+
+        return asyncio.run(run())
+
+    def test_retry_after(self):
+        """429 is retried after the Retry-After interval"""
+        calls = []
+
+        async def handler(request):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                return web.Response(status=429, headers={"Retry-After": "0.3"})
+            return web.json_response({"id": "1"})
+
+        policy = RetryPolicy(base_delay=0.01)
+        result = self.run_against(
+            handler, policy, lambda client: client.raw_api.get("Style/Header/1")
+        )
+
+        self.assertEqual(result, {"id": "1"})
+        self.assertEqual(len(calls), 2)
+        self.assertGreaterEqual(calls[1] - calls[0], 0.3)
+        self.assertEqual(policy.metrics["429"], 1)
+
+    def test_throttled_post(self):
+        """Not idempotent POST is retried on 429 as it was not processed"""
+        calls = []
+
+        async def handler(request):
+            calls.append(await request.json())
+            if len(calls) == 1:
+                return web.Response(status=429, headers={"Retry-After": "0"})
+            return web.json_response({"id": "new"})
+
+        result = self.run_against(
+            handler,
+            RetryPolicy(base_delay=0.01),
+            lambda client: client.raw_api.post("Style/Header/Create", {"a": 1}),
+        )
+
+        self.assertEqual(result, {"id": "new"})
+        self.assertEqual(calls, [{"a": 1}, {"a": 1}])
+
+    def test_client_backs_off_together(self):
+        """A 429 received by one task holds back the other tasks"""
+        calls = []
+
+        async def handler(request):
+            calls.append((request.path, time.monotonic()))
+            if request.path.endswith("/first") and len(calls) == 1:
+                return web.Response(status=429)
+            return web.json_response({})
+
+        async def run(client):
+            first = asyncio.ensure_future(client.raw_api.get("first"))
+            while not calls:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            await asyncio.gather(*[client.raw_api.get("other") for _ in range(5)])
+            await first
+
+        self.run_against(handler, _FixedBackoffPolicy(base_delay=0.5), run)
+
+        throttled_at = calls[0][1]
+        others = [at for path, at in calls if path.endswith("/other")]
+        self.assertEqual(len(others), 5)
+        self.assertGreaterEqual(min(others) - throttled_at, 0.45)
+
+    def test_gives_up(self):
+        """Throttled call fails after max_retries"""
+        calls = []
+
+        async def handler(request):
+            calls.append(1)
+            return web.Response(status=429, headers={"Retry-After": "0"}, text="slow")
+
+        with self.assertRaises(BeProductException) as ctx:
+            self.run_against(
+                handler,
+                RetryPolicy(max_retries=2, base_delay=0.01),
+                lambda client: client.raw_api.get("Style/Header/1"),
+            )
+
+        self.assertIn("429", str(ctx.exception))
+        self.assertEqual(len(calls), 3)
+
+
+class TestSessionLifecycle(unittest.TestCase):
+    def test_shared_session(self):
+        """The session is created lazily, shared by calls and refreshes, closed"""
+        peers, tokens = [], []
+
+        async def api(request):
+            peers.append(request.transport.get_extra_info("peername"))
+            return web.json_response([])
+
+        async def token(request):
+            peers.append(request.transport.get_extra_info("peername"))
+            tokens.append(dict(await request.post()))
+            return web.json_response(
+                {"access_token": f"token-{len(tokens)}", "expires_in": 3600}
+            )
+
+        async def run():
+            app = web.Application()
+            app.router.add_post("/token", token)
+            app.router.add_route("*", "/{tail:.*}", api)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+            try:
+                async with BeProductAsync(
+                    client_id="id",
+                    client_secret="secret",
+                    refresh_token="refresh",
+                    company_domain="company",
+                    token_endpoint=f"{url}/token",
+                    public_api_url=url,
+                ) as client:
+                    self.assertIsNone(client.raw_api._session)
+                    await client.raw_api.get("Style/Folders")
+                    session = client.raw_api.session
+                    for _ in range(3):
+                        await client.raw_api.get("Style/Folders")
+                    # an expired token is refreshed through the same session
+                    client.oauth2_client.token_expires = 0
+                    await client.raw_api.get("Style/Folders")
+                    self.assertIs(client.raw_api.session, session)
+
+                self.assertTrue(session.closed)
+                self.assertIsNone(client.raw_api._session)
+
+                # a closed client opens a new session on the next call
+                client.oauth2_client.set_expires_in(3600)
+                await client.raw_api.get("Style/Folders")
+                self.assertIsNot(client.raw_api.session, session)
+                await client.aclose()
+            finally:
+                await runner.cleanup()
+
+        asyncio.run(run())
+        self.assertEqual(len(tokens), 2)
+        # the first 7 requests share one pooled connection
+        self.assertEqual(len(set(peers[:7])), 1)
+        self.assertNotEqual(peers[7], peers[0])
+
+
+class TestWaitForUploads(unittest.TestCase):
+    run_against = TestRawApiAsyncThrottling.run_against
+
+    def status_handler(self, polls: dict, in_flight: list):
+        """Upload "u<n>" is processed after n % 3 + 1 polls, "never" is not"""
+
+        async def handler(request):
+            upload_id = request.path.rsplit("/", 1)[1]
+            polls[upload_id] = polls.get(upload_id, 0) + 1
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+
+            needed = 1 + int(upload_id[1:]) % 3 if upload_id != "never" else None
+            finished = needed is not None and polls[upload_id] >= needed
+            return web.json_response(
+                {
+                    "finished": finished,
+                    "errorOccured": upload_id == "u7",
+                    "message": "Broken" if upload_id == "u7" else "",
+                }
+            )
+
+        return handler
+
+    def poller(self, client):
+        client.raw_api.upload_poller = UploadStatusPoller(
+            client.raw_api.upload_status,
+            interval=0.01,
+            max_interval=0.04,
+            concurrency=4,
+        )
+
+    def test_wait_for_uploads(self):
+        """Uploads are polled by one loop until processed"""
+        polls, in_flight = {}, [0, 0]
+        ids = [f"u{i}" for i in range(30)]
+
+        async def run(client):
+            self.poller(client)
+            futures = await client.raw_api.wait_for_uploads(ids, timeout=5)
+            # waiting again for the same upload shares the future
+            again = await client.raw_api.wait_for_uploads(["u1"])
+            self.assertIs(again["u1"], futures["u1"])
+            return {k: await f for k, f in futures.items()}
+
+        results = self.run_against(
+            self.status_handler(polls, in_flight), RetryPolicy(), run
+        )
+
+        self.assertEqual(results["u0"], (True, False, ""))
+        self.assertEqual(results["u7"], (True, True, "Broken"))
+        self.assertEqual(polls, {i: int(i[1:]) % 3 + 1 for i in ids})
+        self.assertLessEqual(in_flight[1], 4)
+
+    def test_timeout_and_cancel(self):
+        """Unprocessed uploads time out, cancelled ones are not polled"""
+        polls, in_flight = {}, [0, 0]
+
+        async def run(client):
+            self.poller(client)
+            futures = await client.raw_api.wait_for_uploads(["never"], timeout=0.1)
+            cancelled = await client.raw_api.wait_for_uploads(["u2"])
+            cancelled["u2"].cancel()
+            with self.assertRaises(asyncio.TimeoutError):
+                await futures["never"]
+            return len(client.raw_api.upload_poller)
+
+        waited = self.run_against(
+            self.status_handler(polls, in_flight), RetryPolicy(), run
+        )
+
+        self.assertEqual(waited, 0)
+        self.assertNotIn("u2", polls)
+        self.assertGreaterEqual(polls["never"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
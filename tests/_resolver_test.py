@@ -0,0 +1,124 @@
+"""
+File: _resolver_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct.sdk import BeProduct, BeProductAsync, ResponseCache
+from beproduct.helpers.parsers import resolve_field_names, dict_to_eq_filter_parser
+
+RESPONSES = {
+    "Style/Folders": [{"id": "f1", "name": "Dresses"}],
+    "Style/FolderSchema?folderId=f1": [
+        {"fieldId": "season", "fieldName": "Season"},
+        {"fieldId": "year", "fieldName": "Year"},
+    ],
+    "Style/Header/h1": {"id": "h1", "colorways": [{"id": "c1", "colorNumber": "PB1"}]},
+    "Style/Pages?headerId=h1": [{"id": "a1", "title": "BOM"}],
+}
+
+
+class _RawApiStandIn:
+    """Serves RESPONSES and records calls"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        return RESPONSES[url]
+
+    get_cached = get
+
+
+class _RawApiAsyncStandIn(_RawApiStandIn):
+    async def get(self, url, **kwargs):
+        self.calls.append(url)
+        return RESPONSES[url]
+
+    get_cached = get
+
+
+class TestResolver(unittest.TestCase):
+    def test_resolve(self):
+        """Names are resolved case insensitive with one call per index"""
+        client = BeProduct(
+            access_token="token", company_domain="company", resolver_ttl=300
+        )
+        client.raw_api = _RawApiStandIn()
+        resolver = client.resolver
+
+        for _ in range(3):
+            self.assertEqual(resolver.folder_id("Style", "dresses"), "f1")
+            self.assertEqual(resolver.field_id("Style", "f1", "SEASON"), "season")
+            self.assertEqual(resolver.colorway_id("Style", "h1", "pb1"), "c1")
+            self.assertEqual(resolver.app_id("Style", "h1", "bom", "f1"), "a1")
+        self.assertIsNone(resolver.field_id("Style", "f1", "Missing"))
+        # colorways are read from the header every time
+        self.assertEqual(client.raw_api.calls.count("Style/Header/h1"), 3)
+        self.assertEqual(len(client.raw_api.calls), 6)
+
+    def test_ttl_follows_response_cache(self):
+        """Without a response cache names are resolved from fresh data"""
+        client = BeProduct(access_token="token", company_domain="company")
+        client.raw_api = _RawApiStandIn()
+        for _ in range(2):
+            self.assertEqual(client.resolver.folder_id("Style", "Dresses"), "f1")
+        self.assertEqual(len(client.raw_api.calls), 2)
+
+        cached = BeProduct(
+            access_token="token",
+            company_domain="company",
+            response_cache=ResponseCache(ttl=60),
+        )
+        self.assertEqual(cached.resolver.ttl, 60)
+
+    def test_eq_filters(self):
+        """Filters are keyed by field names or IDs"""
+        client = BeProduct(access_token="token", company_domain="company")
+        client.raw_api = _RawApiStandIn()
+
+        self.assertEqual(
+            client.resolver.eq_filters("Style", "f1", {"Season": "Spring", "year": 1}),
+            [
+                {"field": "season", "operator": "Eq", "value": "Spring"},
+                {"field": "year", "operator": "Eq", "value": 1},
+            ],
+        )
+
+    def test_async(self):
+        """Resolver methods are awaitable for async clients"""
+        client = BeProductAsync(
+            access_token="token", company_domain="company", resolver_ttl=300
+        )
+        client.raw_api = _RawApiAsyncStandIn()
+
+        async def run():
+            return (
+                await client.resolver.folder_id("Style", "Dresses"),
+                await client.resolver.app_id("Style", "h1", "Bom", "f1"),
+                await client.resolver.app_id("Style", "h1", "Bom", "f1"),
+            )
+
+        self.assertEqual(asyncio.run(run()), ("f1", "a1", "a1"))
+        self.assertEqual(len(client.raw_api.calls), 2)
+
+    def test_resolve_field_names_parser(self):
+        """Unknown keys are kept"""
+        parser = resolve_field_names({"season": "season_id"})
+        self.assertEqual(
+            {"Season": "Spring", "other_id": 1} | parser | dict_to_eq_filter_parser,
+            [
+                {"field": "season_id", "operator": "Eq", "value": "Spring"},
+                {"field": "other_id", "operator": "Eq", "value": 1},
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,90 @@
+"""
+File: _retry_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct._retry import RetryPolicy
+
+URL = "https://developers.beproduct.com/api/company"
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_idempotency(self):
+        """POST is retried only for known idempotent endpoints"""
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_idempotent("GET", f"{URL}/Style/Header/1"))
+        self.assertTrue(policy.is_idempotent("DELETE", f"{URL}/Style/Header/1"))
+        self.assertTrue(
+            policy.is_idempotent("POST", f"{URL}/Style/Header/1/Update?a=1")
+        )
+        self.assertFalse(policy.is_idempotent("POST", f"{URL}/Style/Header/Create"))
+        self.assertTrue(policy.is_idempotent("POST", f"{URL}/Style/PageForm?pageId=a"))
+        self.assertTrue(
+            RetryPolicy(retry_post=True).is_idempotent("POST", f"{URL}/Create")
+        )
+
+    def test_next_delay(self):
+        """Retries are limited and backoff is capped"""
+        policy = RetryPolicy(max_retries=3, base_delay=1, max_delay=2)
+        retry = policy.start("GET", URL)
+
+        delays = [retry.next_delay(status=503) for _ in range(4)]
+        self.assertTrue(all(0 <= d <= 2 for d in delays[:3]))
+        self.assertIsNone(delays[3])
+        self.assertIsNone(policy.start("GET", URL).next_delay(status=404))
+
+    def test_non_idempotent_post(self):
+        """Not idempotent POST is retried on 429 only"""
+        policy = RetryPolicy(base_delay=0)
+        self.assertIsNone(
+            policy.start("POST", f"{URL}/Create").next_delay(status=503)
+        )
+        self.assertIsNone(
+            policy.start("POST", f"{URL}/Create").next_delay(error=ConnectionError())
+        )
+        self.assertIsNotNone(
+            policy.start("POST", f"{URL}/Create").next_delay(status=429)
+        )
+
+    def test_grid_and_list_updates(self):
+        """Grid and list updates may create rows, they are retried on opt-in"""
+        grid = f"{URL}/Style/PageGrid?headerId=h&pageId=a"
+        items = f"{URL}/Style/PageList?headerId=h&pageId=a"
+        policy = RetryPolicy(base_delay=0)
+        self.assertIsNone(policy.start("POST", grid).next_delay(status=503))
+        self.assertIsNone(
+            policy.start("POST", items).next_delay(error=ConnectionError())
+        )
+        self.assertIsNotNone(policy.start("POST", grid).next_delay(status=429))
+
+        policy = RetryPolicy(
+            base_delay=0,
+            idempotent_post_patterns=RetryPolicy.IDEMPOTENT_POST_PATTERNS
+            + (r"/PageGrid\?",),
+        )
+        self.assertIsNotNone(policy.start("POST", grid).next_delay(status=503))
+
+    def test_total_timeout(self):
+        """No retries after the time budget is spent"""
+        policy = RetryPolicy(base_delay=100, max_delay=100, total_timeout=0)
+        self.assertIsNone(policy.start("GET", URL).next_delay(status=503))
+
+    def test_metrics(self):
+        """Retries are counted by reason"""
+        policy = RetryPolicy(base_delay=0)
+        policy.start("GET", URL).next_delay(status=429)
+        policy.start("GET", URL).next_delay(status=503)
+        policy.start("GET", URL).next_delay(error=ConnectionError())
+        self.assertEqual(policy.metrics["429"], 1)
+        self.assertEqual(policy.metrics["503"], 1)
+        self.assertEqual(policy.metrics["ConnectionError"], 1)
+        self.assertEqual(policy.metrics["total"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,137 @@
+"""
+File: _schema_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import unittest
+from datetime import datetime, timezone
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct._schema import FolderCoercer, Schema, value_coercer
+from beproduct.sdk import BeProduct, BeProductAsync
+
+FOLDER_SCHEMA = [
+    {"fieldId": "price", "fieldType": "Decimal"},
+    {"fieldId": "launch", "fieldType": "DateTime"},
+    {
+        "fieldId": "colors",
+        "fieldType": "MultiSelect",
+        "properties": {
+            "Choices": [
+                {"id": "1", "code": "RD", "value": "Red"},
+                {"id": "2", "code": "BL", "value": "Blue"},
+            ]
+        },
+    },
+    {
+        "fieldId": "vendor",
+        "fieldType": "PartnerDropDown",
+        "properties": {"Choices": [{"code": "V1", "value": "Vendor One"}]},
+    },
+]
+
+
+class _RawApiStandIn:
+    def __init__(self, is_async=False):
+        self.calls = 0
+        self.is_async = is_async
+
+    def get_cached(self, url):
+        self.calls += 1
+        if self.is_async:
+            return self._get_async()
+        return FOLDER_SCHEMA
+
+    async def _get_async(self):
+        return FOLDER_SCHEMA
+
+
+class TestFolderCoercer(unittest.TestCase):
+    def test_header(self):
+        """A whole header is converted with the dispatch table"""
+        client = BeProduct(access_token="token", company_domain="company")
+        schema = client.schema._process_schema(FOLDER_SCHEMA, "Style", "f")
+        coercer = FolderCoercer(schema)
+
+        record = {
+            "headerData": {
+                "fields": [
+                    {"id": "price", "value": "1.25"},
+                    {"id": "launch", "value": "bad date"},
+                    {"id": "colors", "value": ["1", "BL", "Green"]},
+                    {"id": "vendor", "value": "V1"},
+                    {"id": "other", "value": "kept"},
+                ]
+            }
+        }
+        expected = {
+            "price": 1.25,
+            "launch": None,
+            "colors": ["Red", "Blue", "Green"],
+            "vendor": "Vendor One",
+            "other": "kept",
+        }
+        self.assertEqual(coercer.header(record), expected)
+        self.assertEqual(coercer.page([record, record]), [expected, expected])
+        self.assertEqual(coercer.coerce("price", 2), 2.0)
+
+    def test_datetime(self):
+        """.NET timestamps with 7 or fewer fraction digits are parsed"""
+        to_datetime = value_coercer(datetime)
+        self.assertEqual(
+            to_datetime("2023-05-01T12:34:56.1234567+00:00"),
+            datetime(2023, 5, 1, 12, 34, 56, 123456, tzinfo=timezone.utc),
+        )
+        self.assertEqual(
+            to_datetime("2023-05-01T12:34:56.12Z"),
+            datetime(2023, 5, 1, 12, 34, 56, 120000, tzinfo=timezone.utc),
+        )
+        self.assertEqual(to_datetime("2023-05-01"), datetime(2023, 5, 1))
+        self.assertIsNone(to_datetime("2023-05-01T12:34:56.x"))
+
+    def test_cached_per_folder(self):
+        """Coercers are compiled once per folder without a response cache"""
+        client = BeProduct(access_token="token", company_domain="company")
+        client.raw_api = _RawApiStandIn()
+
+        coercer = client.schema.get_folder_coercer("Style", "f")
+        self.assertIs(client.schema.get_folder_coercer("Style", "f"), coercer)
+        self.assertIsNot(client.schema.get_folder_coercer("Material", "f"), coercer)
+        self.assertEqual(client.raw_api.calls, 2)
+
+        client.schema.invalidate()
+        client.schema.get_folder_coercer("Style", "f")
+        self.assertEqual(client.raw_api.calls, 3)
+
+    def test_coercer_limit(self):
+        """The least recently used folder coercer is dropped"""
+        client = BeProduct(access_token="token", company_domain="company")
+        client.raw_api = _RawApiStandIn()
+        client.schema = Schema(client, max_coercers=2)
+
+        style = client.schema.get_folder_coercer("Style", "f")
+        client.schema.get_folder_coercer("Material", "f")
+        client.schema.get_folder_coercer("Style", "f")
+        client.schema.get_folder_coercer("Color", "f")
+        self.assertIs(client.schema.get_folder_coercer("Style", "f"), style)
+        client.schema.get_folder_coercer("Material", "f")
+        self.assertEqual(client.raw_api.calls, 4)
+
+    def test_async(self):
+        """Async clients await the coercer"""
+
+        async def run():
+            client = BeProductAsync(access_token="token", company_domain="company")
+            client.raw_api = _RawApiStandIn(is_async=True)
+            coercer = await client.schema.get_folder_coercer("Style", "f")
+            self.assertIs(await client.schema.get_folder_coercer("Style", "f"), coercer)
+            return coercer.coerce("colors", "2")
+
+        self.assertEqual(asyncio.run(run()), "Blue")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
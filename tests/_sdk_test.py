@@ -0,0 +1,83 @@
+"""
+File: _sdk_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import time
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+from test_helpers import StubHandler, StubServer
+
+from beproduct.sdk import BeProduct, BeProductAsync
+
+
+class _Handler(StubHandler):
+    """Keeps connections alive and counts the open ones"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.open += 1
+
+    def finish(self):
+        super().finish()
+        with self.server.lock:
+            self.server.open -= 1
+
+    def do_GET(self):
+        self.reply([])
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer(_Handler, connections=0, open=0).start()
+        self.addCleanup(self.server.stop)
+        self.options = dict(
+            access_token="token",
+            company_domain="company",
+            public_api_url=self.server.url,
+            automation_api_url=self.server.url,
+        )
+
+    def assert_released(self):
+        deadline = time.monotonic() + 2
+        while self.server.open and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.server.open, 0)
+
+    def test_close(self):
+        """Calls reuse one connection, close() releases it"""
+        client = BeProduct(**self.options)
+        self.assertIs(client.automation.session, client.raw_api.session)
+        for _ in range(3):
+            self.assertEqual(client.raw_api.get("Style/Folders"), [])
+        client.automation.get("Subscriptions")
+
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.open, 1)
+        client.close()
+        self.assert_released()
+
+    def test_aclose(self):
+        """aclose() releases the aiohttp session and the automation session"""
+
+        async def run():
+            async with BeProductAsync(**self.options) as client:
+                for _ in range(3):
+                    await client.raw_api.get("Style/Folders")
+                for _ in range(3):
+                    client.automation.get("Subscriptions")
+                self.assertEqual(self.server.connections, 2)
+
+        asyncio.run(run())
+        self.assert_released()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,154 @@
+"""
+File: _sync_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct._sync import SyncState
+from beproduct.sdk import BeProduct, BeProductAsync
+
+
+class _Folder:
+    """Stand-in of client.style listing records newer than the filter"""
+
+    def __init__(self, client, records):
+        self.client = client
+        self.master_folder = "Style"
+        self.records = records
+        self.filters = []
+
+    def _matching(self, filters):
+        self.filters.append(filters)
+        since = next((f["value"] for f in filters if f["field"] == "ModifiedAt"), "")
+        since = since.replace(" ", "T")
+        return [r for r in self.records if r["modifiedAt"] > since]
+
+    def attributes_list(self, folder_id, filters=None, **kwargs):
+        if isinstance(self.client, BeProductAsync):
+            return self._list_async(filters)
+        return iter(self._matching(filters))
+
+    async def _list_async(self, filters):
+        for record in self._matching(filters):
+            yield record
+
+
+def _record(header_id, modified_at):
+    return {"id": header_id, "modifiedAt": modified_at}
+
+
+class TestIncrementalSync(unittest.TestCase):
+    def setUp(self):
+        self.client = BeProduct(access_token="token", company_domain="company")
+
+    def test_changes(self):
+        """Only changed headers are emitted, the overlap is re-read"""
+        folder = _Folder(
+            self.client,
+            [
+                _record("a", "2024-01-01T10:00:00.000Z"),
+                _record("b", "2024-01-01T12:00:00.000Z"),
+            ],
+        )
+        sync = self.client.style.incremental_sync("f", overlap=600)
+        sync.attributes = folder
+
+        self.assertEqual([r["id"] for r in sync.changes()], ["a", "b"])
+        self.assertEqual(folder.filters[-1], [])
+        self.assertEqual(sync.mark, datetime(2024, 1, 1, 12, tzinfo=timezone.utc))
+
+        # b is re-read in the overlap window but was not modified
+        folder.records.append(_record("c", "2024-01-01T11:55:00.000Z"))
+        self.assertEqual([r["id"] for r in sync.changes()], ["c"])
+        self.assertEqual(folder.filters[-1][0]["value"], "2024-01-01 11:50:00Z")
+
+        folder.records[1] = _record("b", "2024-01-01T12:30:00.000Z")
+        self.assertEqual(sync.run(lambda r: None), 1)
+        self.assertEqual(sync.mark.hour, 12)
+        self.assertEqual(sync.mark.minute, 30)
+
+        sync.reset()
+        self.assertIsNone(sync.mark)
+
+    def test_dotnet_timestamps(self):
+        """The mark follows API timestamps, invalid ones are logged"""
+        folder = _Folder(
+            self.client,
+            [
+                _record("a", "2024-01-01T10:00:00.1234567+00:00"),
+                _record("b", "2024-01-01T12:00:00.7654321+00:00"),
+                _record("c", "not a date"),
+            ],
+        )
+        sync = self.client.style.incremental_sync("f", overlap=600)
+        sync.attributes = folder
+
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertEqual(sync.run(lambda r: None), 3)
+        self.assertIn("'not a date'", logs.output[0])
+        self.assertEqual(
+            sync.mark, datetime(2024, 1, 1, 12, 0, 0, 765432, tzinfo=timezone.utc)
+        )
+
+        # a and b are skipped, c has no time to compare with the mark
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual([r["id"] for r in sync.changes()], ["c"])
+        self.assertEqual(folder.filters[-1][0]["value"], "2024-01-01 11:50:00Z")
+
+    def test_interrupted(self):
+        """The mark is saved only when all changes were consumed"""
+        folder = _Folder(self.client, [_record("a", "2024-01-01T10:00:00Z")])
+        sync = self.client.style.incremental_sync("f")
+        sync.attributes = folder
+
+        next(sync.changes())
+        self.assertIsNone(sync.mark)
+
+    def test_state_file(self):
+        """Marks of many folders are kept in one file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sync.json")
+            for folder_id in ("f1", "f2"):
+                sync = self.client.style.incremental_sync(folder_id, state=path)
+                sync.attributes = _Folder(
+                    self.client, [_record(folder_id, "2024-01-01T10:00:00Z")]
+                )
+                sync.run(lambda r: None)
+
+            state = SyncState(path)
+            self.assertEqual(set(state._state), {"Style/f1", "Style/f2"})
+            self.assertEqual(
+                state.get("Style/f2")["recent"], {"f2": "2024-01-01T10:00:00Z"}
+            )
+
+    def test_async(self):
+        """Async clients get async generators and awaitable runs"""
+
+        async def run():
+            client = BeProductAsync(access_token="token", company_domain="company")
+            folder = _Folder(client, [_record("a", "2024-01-01T10:00:00Z")])
+            sync = client.style.incremental_sync("f")
+            sync.attributes = folder
+
+            upserted = []
+
+            async def upsert(record):
+                upserted.append(record["id"])
+
+            count = await sync.run(upsert)
+            again = [r async for r in sync.changes()]
+            return count, upserted, again
+
+        self.assertEqual(asyncio.run(run()), (1, ["a"], []))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,106 @@
+"""
+File: _table_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import unittest
+from datetime import datetime, timezone
+import test_helpers  # noqa: F401 adds src to the path
+from test_helpers import StubHandler, StubServer
+
+from beproduct._schema import FolderCoercer
+from beproduct._table import ColumnTable
+from beproduct.sdk import BeProduct
+
+FOLDER_SCHEMA = [
+    {"fieldId": "header_number", "fieldType": "Text"},
+    {"fieldId": "active", "fieldType": "TrueFalse"},
+    {"fieldId": "price", "fieldType": "Currency"},
+    {"fieldId": "version", "fieldType": "Number"},
+    {"fieldId": "launch", "fieldType": "Date"},
+    {
+        "fieldId": "season",
+        "fieldType": "DropDown",
+        "properties": {"Choices": [{"id": "c1", "code": "SS", "value": "Spring"}]},
+    },
+]
+
+
+def _record(i, **fields):
+    return {
+        "id": f"h{i}",
+        "modifiedAt": "2021-07-08T08:52:24.139Z",
+        "headerData": {
+            "fields": [{"id": k, "value": v} for k, v in fields.items()],
+        },
+    }
+
+
+RECORDS = [
+    _record(
+        0, header_number="S-0", active="Yes", price="9.5", version="40", season="c1"
+    ),
+    _record(1, header_number="S-1", active="No", price="", launch="2024-01-02"),
+    _record(2, header_number="S-2", version="n/a", unknown="x"),
+]
+
+
+class TestColumnTable(unittest.TestCase):
+    def test_columns(self):
+        """Values are coerced by schema data type, gaps are None"""
+        client = BeProduct(access_token="token", company_domain="company")
+        schema = client.schema._process_schema(FOLDER_SCHEMA, "Style", "f")
+        table = ColumnTable(coercer=FolderCoercer(schema), output="dict")
+        data = table.extend(RECORDS).build()
+
+        self.assertEqual(data["id"], ["h0", "h1", "h2"])
+        self.assertEqual(data["header_number"], ["S-0", "S-1", "S-2"])
+        self.assertEqual(data["active"], [True, False, None])
+        self.assertEqual(data["price"], [9.5, None, None])
+        self.assertEqual(data["version"], [40, None, None])
+        self.assertEqual(data["launch"], [None, datetime(2024, 1, 2), None])
+        self.assertEqual(data["season"], ["Spring", None, None])
+        self.assertEqual(
+            data["ModifiedAt"][0],
+            datetime(2021, 7, 8, 8, 52, 24, 139000, tzinfo=timezone.utc),
+        )
+        self.assertNotIn("unknown", data)
+
+    def test_selected_columns(self):
+        """Only requested columns are collected"""
+        data = ColumnTable(["header_number", "id"], output="dict").extend(RECORDS)
+        self.assertEqual(list(data.build()), ["header_number", "id"])
+
+    def test_output(self):
+        """Unknown output is rejected before fetching"""
+        with self.assertRaises(ValueError):
+            ColumnTable(["id"], output="csv")
+
+
+class _Handler(StubHandler):
+    def do_GET(self):
+        self.reply(FOLDER_SCHEMA)
+
+    def do_POST(self):
+        self.read_body()
+        page = int(self.path.split("pageNumber=")[1].split("&")[0])
+        self.reply({"total": 3, "result": RECORDS[page * 2 : page * 2 + 2]})
+
+
+class TestAttributesListTable(unittest.TestCase):
+    def test_attributes_list_table(self):
+        """Pages are collected into columns"""
+        with StubServer(_Handler) as server, BeProduct(
+            access_token="token", company_domain="company", public_api_url=server.url
+        ) as client:
+            data = client.style.attributes_list_table(
+                folder_id="f", columns=["id", "price"], page_size=2, output="dict"
+            )
+
+        self.assertEqual(data, {"id": ["h0", "h1", "h2"], "price": [9.5, None, None]})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
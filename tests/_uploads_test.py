@@ -0,0 +1,131 @@
+"""
+File: _uploads_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import os
+import time
+import unittest
+from collections import Counter
+import test_helpers  # noqa: F401 adds src to the path
+from test_helpers import StubHandler, StubServer
+
+from beproduct._rate_limit import RateLimiter
+from beproduct._uploads import UploadEvent, UploadManager
+from beproduct.sdk import BeProduct, BeProductAsync
+
+IMAGE = os.path.join(os.path.dirname(os.path.realpath(__file__)), "assets", "1kb.jpg")
+
+
+class _Handler(StubHandler):
+    """
+    Accepts uploads of any header but "missing", upload IDs are the header
+    IDs. Processing takes two status requests and fails for "broken".
+    """
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.uploading += 1
+            server.max_uploading = max(server.max_uploading, server.uploading)
+        self.read_body()
+        time.sleep(0.02)
+        with server.lock:
+            server.uploading -= 1
+
+        header_id = self.path.split("/Header/")[1].split("/")[0]
+        if header_id == "missing":
+            self.reply({"message": "Not found"}, 404)
+        else:
+            self.reply({"imageId": header_id})
+
+    def do_GET(self):
+        upload_id = self.path.rsplit("/", 1)[1]
+        with self.server.lock:
+            self.server.polls[upload_id] += 1
+            finished = self.server.polls[upload_id] >= 2
+        self.reply(
+            {
+                "finished": finished,
+                "errorOccured": finished and upload_id == "broken",
+                "message": "Broken image" if upload_id == "broken" else "",
+            }
+        )
+
+
+class TestUploadManager(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer(
+            _Handler, uploading=0, max_uploading=0, polls=Counter()
+        ).start()
+        self.addCleanup(self.server.stop)
+        self.url = self.server.url
+
+    def manager(self, client, **kwargs):
+        client.rate_limiter = RateLimiter(min_rate=1000)
+        return UploadManager(
+            client, poll_interval=0.01, max_poll_interval=0.05, **kwargs
+        )
+
+    def assert_events(self, events):
+        by_header = {e.job.header_id: e for e in events}
+        self.assertEqual(len(events), 12)
+        self.assertTrue(all(by_header[f"s{i}"].ok for i in range(10)))
+        self.assertEqual(by_header["s3"].upload_id, "s3")
+        self.assertEqual(by_header["broken"].status, UploadEvent.FAILED)
+        self.assertEqual(by_header["broken"].message, "Broken image")
+        self.assertEqual(by_header["missing"].status, UploadEvent.FAILED)
+        self.assertIsNotNone(by_header["missing"].error)
+        self.assertIsNone(by_header["missing"].upload_id)
+
+        # polling stops once an upload is processed
+        self.assertEqual(self.server.polls["s0"], 2)
+        self.assertNotIn("missing", self.server.polls)
+        self.assertLessEqual(self.server.max_uploading, 3)
+
+    def jobs(self, client):
+        headers = [f"s{i}" for i in range(10)] + ["broken", "missing"]
+        return [(client.style.attributes_upload, h, IMAGE) for h in headers]
+
+    def test_run(self):
+        """Uploads run N at a time, processing is polled until finished"""
+        with BeProduct(
+            access_token="token", company_domain="company", public_api_url=self.url
+        ) as client:
+            manager = self.manager(client, concurrency=3)
+            job = manager.submit(client.style.attributes_upload, "s0", IMAGE)
+            events = list(manager.run(self.jobs(client)[1:]))
+
+        self.assertIn(job, [e.job for e in events])
+        self.assert_events(events)
+
+    def test_run_async(self):
+        """Async run is an async generator"""
+
+        async def run():
+            async with BeProductAsync(
+                access_token="token", company_domain="company", public_api_url=self.url
+            ) as client:
+                manager = self.manager(client, concurrency=3)
+                return [e async for e in manager.run(self.jobs(client))]
+
+        self.assert_events(asyncio.run(run()))
+
+    def test_timeout(self):
+        """Uploads processed for too long fail"""
+        with BeProduct(
+            access_token="token", company_domain="company", public_api_url=self.url
+        ) as client:
+            manager = self.manager(client, timeout=0)
+            (event,) = manager.run([(client.style.attributes_upload, "s1", IMAGE)])
+
+        self.assertEqual(event.status, UploadEvent.FAILED)
+        self.assertEqual(event.message, "Processing timed out")
+        self.assertEqual(self.server.polls["s1"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
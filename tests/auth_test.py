@@ -0,0 +1,151 @@
+"""
+File: auth_test.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+import test_helpers  # noqa: F401 adds src to the path
+
+from aiohttp import web
+from beproduct.auth import OAuth2Client, AsyncOAuth2Client
+from beproduct._exception import BeProductException
+
+
+class _CountingClient(OAuth2Client):
+    """Token endpoint stand-in counting refreshes"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.refresh_token = "refresh"
+        self.refresh_count = 0
+
+    def request_token(self, parser=None, redirect_uri=None, **kwargs):
+        time.sleep(0.05)
+        self.refresh_count += 1
+        self.access_token = f"token-{self.refresh_count}"
+        self.set_expires_in(3600)
+
+
+class TestOAuth2Client(unittest.TestCase):
+    def test_single_flight_threads(self):
+        """Concurrent threads share one refresh"""
+        client = _CountingClient()
+        threads = [threading.Thread(target=client.get_access_token) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(client.refresh_count, 1)
+        self.assertEqual(client.get_access_token(), "token-1")
+
+    def test_single_flight_async(self):
+        """Concurrent coroutines share one refresh"""
+        client = _CountingClient()
+
+        async def get_tokens():
+            return await asyncio.gather(
+                *[client.get_access_token_async() for _ in range(50)]
+            )
+
+        self.assertEqual(set(asyncio.run(get_tokens())), {"token-1"})
+        self.assertEqual(client.refresh_count, 1)
+
+    def test_proactive_refresh(self):
+        """Token close to expiry is still returned while refreshed in background"""
+        client = _CountingClient(proactive_refresh=60)
+        client.access_token = "old-token"
+        client.token_expires = time.time() + 30
+
+        self.assertEqual(client.get_access_token(), "old-token")
+        time.sleep(0.2)
+        self.assertEqual(client.get_access_token(), "token-1")
+
+    def test_token_expires(self):
+        """token_expires stays a unix timestamp"""
+        client = _CountingClient()
+        expires = time.time() + 100
+        client.token_expires = expires
+        self.assertAlmostEqual(client.token_expires, expires, delta=1)
+
+
+class TestAsyncOAuth2Client(unittest.TestCase):
+    def run_against(self, token, coro_factory):
+        """Runs coro_factory(client) against a local token endpoint"""
+
+        async def run():
+            app = web.Application()
+            app.router.add_post("/token", token)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            try:
+                client = AsyncOAuth2Client(
+                    token_endpoint=f"http://127.0.0.1:{port}/token",
+                    client_id="id",
+                    client_secret="secret",
+                )
+                client.refresh_token = "refresh"
+                return await coro_factory(client)
+            finally:
+                await runner.cleanup()
+
+        return asyncio.run(run())
+
+    def test_refresh_error(self):
+        """A rejected refresh raises and is not shared with later callers"""
+        requests = []
+
+        async def token(request):
+            requests.append(dict(await request.post()))
+            if len(requests) == 1:
+                await asyncio.sleep(0.05)
+                return web.json_response({"error": "invalid_grant"}, status=400)
+            return web.json_response({"access_token": "token", "expires_in": 3600})
+
+        async def run(client):
+            failed = await asyncio.gather(
+                *[client.get_access_token_async() for _ in range(5)],
+                return_exceptions=True,
+            )
+            return failed, client.access_token, await client.get_access_token_async()
+
+        failed, token_after_error, token = self.run_against(token, run)
+        self.assertTrue(all(isinstance(e, BeProductException) for e in failed))
+        self.assertIn("invalid_grant", str(failed[0]))
+        self.assertIsNone(token_after_error)
+        self.assertEqual(token, "token")
+        self.assertEqual(len(requests), 2)
+
+    def test_refresh_through_aiohttp(self):
+        """Concurrent coroutines share one refresh against the token endpoint"""
+        requests = []
+
+        async def token(request):
+            requests.append(dict(await request.post()))
+            await asyncio.sleep(0.05)
+            return web.json_response(
+                {"access_token": f"token-{len(requests)}", "expires_in": 3600}
+            )
+
+        async def run(client):
+            return await asyncio.gather(
+                *[client.get_access_token_async() for _ in range(20)]
+            )
+
+        self.assertEqual(set(self.run_against(token, run)), {"token-1"})
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0]["grant_type"], "refresh_token")
+        self.assertEqual(requests[0]["refresh_token"], "refresh")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,101 @@
+"""
+File: json_codec_benchmark.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+
+Compares installed JSON codecs on payloads shaped like BeProduct requests
+and responses. Run: python tests/json_codec_benchmark.py
+"""
+
+import timeit
+import uuid
+import test_helpers  # noqa: F401 adds src to the path
+
+from beproduct import _json
+
+
+def _field(i):
+    return {"id": f"field_{i}", "value": f"Value {i} ÄÖÜ", "type": "Text"}
+
+
+def headers_page(size=200):
+    """Response of attributes_list page"""
+    return {
+        "total": 10000,
+        "result": [
+            {
+                "id": str(uuid.uuid4()),
+                "headerData": {"fields": [_field(i) for i in range(60)]},
+                "colorways": [
+                    {"id": str(uuid.uuid4()), "colorNumber": f"C{c}", "hex": "FFFFFF"}
+                    for c in range(5)
+                ],
+                "sizeRange": [
+                    {"name": s, "price": 9.99} for s in ("XS", "S", "M", "L", "XL")
+                ],
+            }
+            for _ in range(size)
+        ],
+    }
+
+
+def bom_rows(size=2000):
+    """Body of app_bom_update / app_grid_update"""
+    return [
+        {
+            "rowId": str(uuid.uuid4()),
+            "rowFields": [_field(i) for i in range(15)],
+            "colorUpdate": [{"colorNumber": "1", "hex": "000000"}],
+        }
+        for _ in range(size)
+    ]
+
+
+def timelines(size=1000):
+    """Body of plan_style_timeline_update"""
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "milestones": [
+                {"id": str(uuid.uuid4()), "dueDate": "2024-01-01", "done": False}
+                for _ in range(10)
+            ],
+        }
+        for _ in range(size)
+    ]
+
+
+def main(number=5):
+    codecs = [_json.stdlib_codec()]
+    for factory in (_json.orjson_codec, _json.msgspec_codec, _json.ujson_codec):
+        try:
+            codecs.append(factory())
+        except ImportError:
+            pass
+
+    payloads = {
+        "headers page": headers_page(),
+        "bom rows": bom_rows(),
+        "timelines": timelines(),
+    }
+
+    print(f"{'payload':<14}{'codec':<9}{'dumps ms':>10}{'loads ms':>10}{'speedup':>9}")
+    for name, payload in payloads.items():
+        baseline = None
+        for codec in codecs:
+            raw = codec.dumps(payload)
+            assert codec.loads(raw) == payload
+            dumps = timeit.timeit(lambda: codec.dumps(payload), number=number)
+            loads = timeit.timeit(lambda: codec.loads(raw), number=number)
+            total = dumps + loads
+            baseline = baseline or total
+            print(
+                f"{name:<14}{codec.name:<9}"
+                f"{dumps / number * 1000:>10.2f}{loads / number * 1000:>10.2f}"
+                f"{baseline / total:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+File: parsers_benchmark.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+
+Compares copying parsers, view parsers and lazy models on a page of styles.
+Run: python tests/parsers_benchmark.py
+"""
+
+import timeit
+import test_helpers  # noqa: F401 adds src to the path
+
+from json_codec_benchmark import headers_page
+from beproduct.helpers.models import StyleModel
+from beproduct.helpers.parsers import (
+    header_parser,
+    header_view_parser,
+    style_parser,
+    style_view_parser,
+)
+
+
+def _styles(size):
+    styles = headers_page(size)["result"]
+    for style in styles:
+        style["sizeClasses"] = [{"name": "Kids", "sizeRange": style["sizeRange"]}]
+    return styles
+
+
+def main(size=1000, number=5):
+    styles = _styles(size)
+    groups = [
+        {
+            "header_parser": header_parser,
+            "header_view_parser()": header_view_parser(),
+        },
+        {
+            "style_parser": style_parser,
+            "style_view_parser()": style_view_parser(),
+            "style_view_parser(sort)": style_view_parser(sort=True),
+            "style_view_parser(ro)": style_view_parser(read_only=True),
+            "StyleModel, one field": lambda s: StyleModel(s)["field_5"],
+            "StyleModel.to_dict()": lambda s: StyleModel(s).to_dict(),
+        },
+    ]
+
+    print(f"{'parser':<26}{'ms / page':>10}{'speedup':>9}")
+    for candidates in groups:
+        baseline = None  # the first parser of the group
+        for name, parser in candidates.items():
+            seconds = timeit.timeit(lambda: [parser(s) for s in styles], number=number)
+            baseline = baseline or seconds
+            print(
+                f"{name:<26}{seconds / number * 1000:>10.2f}"
+                f"{baseline / seconds:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ Github: https: // github.com/BeProduct
 """
 import os
 import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from time import sleep
 
 if True:
@@ -167,3 +169,70 @@ def is_subset_or_equals(expected, actual):
                     res,
                     f"Actual value {actual} is not equals to expected {expected}",
                 )
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Base request handler of local API stand-ins"""
+
+    def read_body(self) -> bytes:
+        """Request body sent with Content-Length or chunked (aiohttp streams)"""
+        if self.headers["Content-Length"]:
+            return self.rfile.read(int(self.headers["Content-Length"]))
+        body = bytearray()
+        while size := int(self.rfile.readline().split(b";")[0], 16):
+            body += self.rfile.read(size)
+            self.rfile.readline()
+        self.rfile.readline()
+        return bytes(body)
+
+    def reply(self, payload=None, status: int = 200, headers=None):
+        """Sends payload as JSON, None sends an empty body"""
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Local API stand-in on a free port. Keyword arguments become attributes
+    of the server shared by its handlers, e.g. StubServer(Handler, bodies=[])
+
+        with StubServer(Handler) as server:
+            BeProduct(..., public_api_url=server.url)
+
+    or in setUp: self.server = StubServer(Handler).start() and
+    self.addCleanup(self.server.stop)
+    """
+
+    def __init__(self, handler, **attributes):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.lock = threading.Lock()
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,87 @@
+"""
+File: upload_benchmark.py
+Author: Yuri Golub
+Email: yuri.golub@beproduct.com
+Github: https://github.com/BeProduct
+
+Compares the streaming MultipartEncoder with the memory-mapped
+MultipartFileBody uploading a local file to a local HTTP stand-in.
+Run: python tests/upload_benchmark.py [size in MB]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import requests
+import test_helpers  # noqa: F401 adds src to the path
+from test_helpers import StubHandler, StubServer
+
+from beproduct._encoder import MultipartEncoder
+from beproduct._multipart import MultipartFileBody
+
+
+class _Handler(StubHandler):
+    def do_POST(self):
+        left = int(self.headers["Content-Length"])
+        while left:
+            left -= len(self.rfile.read(min(left, 1024 * 1024)))
+        self.reply()
+
+
+def _encoder(path):
+    f = open(path, "rb")
+    encoder = MultipartEncoder(
+        fields={"file": ("file.bin", f, "application/octet-stream")}
+    )
+    return encoder, f.close
+
+
+def _mapped(path):
+    return MultipartFileBody(path), lambda: None
+
+
+def _upload(session, url, make_body, path):
+    body, close = make_body(path)
+    try:
+        response = session.post(
+            url, data=body, headers={"Content-Type": body.content_type}
+        )
+        response.raise_for_status()
+    finally:
+        close()
+
+
+def main(size_mb=256):
+    with StubServer(_Handler) as server, tempfile.TemporaryDirectory() as directory:
+        url = f"{server.url}/upload"
+        path = os.path.join(directory, "file.bin")
+        with open(path, "wb") as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1024 * 1024))
+
+        print(f"{'body':<20}{'seconds':>9}{'MB/s':>9}{'peak MB':>9}")
+        with requests.Session() as session:
+            for name, make_body in (
+                ("MultipartEncoder", _encoder),
+                ("MultipartFileBody", _mapped),
+            ):
+                started = time.perf_counter()
+                _upload(session, url, make_body, path)
+                seconds = time.perf_counter() - started
+
+                # allocations are traced separately, tracing slows the upload
+                tracemalloc.start()
+                _upload(session, url, make_body, path)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                print(
+                    f"{name:<20}{seconds:>9.2f}{size_mb / seconds:>9.0f}"
+                    f"{peak / 1024 / 1024:>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))